@@ -0,0 +1,202 @@
+"""
+电脑对手的自适应策略：频率统计、n-gram 模式预测、混合策略纳什均衡
+展示：面向对象编程（继承）、组合数据类型、lambda函数
+
+策略对象可直接作为引擎的策略回调 strategy(轮次, 球员名)。
+学习型策略通过 observe(对手方向) 在线更新：只保留最近 memory 次观察（定长环形缓冲区），
+每次更新和决策都是 O(1)，既能用于实时对局，也能用于大规模模拟。
+
+角色 role 为 "keeper" 时预测射门方向并扑向该方向；
+为 "shooter" 时预测守门员的扑救方向并射向最不可能被扑到的方向。
+"""
+import random
+from functools import lru_cache
+from itertools import combinations
+from typing import List, Optional, Sequence, Tuple
+
+from engine import DIRECTIONS
+
+ROLES = ("keeper", "shooter")
+
+
+class RingBuffer:
+    """定长环形缓冲区：写满后新元素覆盖最旧的元素"""
+    __slots__ = ("items", "index", "full")
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError("缓冲区大小必须为正数")
+        self.items: List[Optional[int]] = [None] * size
+        self.index = 0
+        self.full = False
+
+    def push(self, item: int) -> Optional[int]:
+        """写入一个元素，返回被挤出的旧元素（没有则为None）"""
+        evicted = self.items[self.index] if self.full else None
+        self.items[self.index] = item
+        self.index += 1
+        if self.index == len(self.items):
+            self.index = 0
+            self.full = True
+        return evicted
+
+
+class AdaptiveStrategy:
+    """学习型策略基类：子类提供 scores() 给出对手各方向的可能性"""
+
+    def __init__(self, role: str = "keeper", memory: int = 20,
+                 rng: Optional[random.Random] = None, explore: float = 0.1):
+        if role not in ROLES:
+            raise ValueError(f"无效角色: {role}，必须是 keeper 或 shooter")
+        self.role = role
+        self.rng = rng or random.Random()
+        # 以一定概率随机选择，避免被对手反向利用
+        self.explore = explore
+        self.memory = memory
+        self.counts = [0, 0, 0]
+        self.history = RingBuffer(memory)
+
+    def scores(self) -> Sequence[int]:
+        """对手选择各方向的可能性（未归一化）"""
+        return self.counts
+
+    def observe(self, direction: str):
+        """观察对手这一次的方向，O(1) 更新计数"""
+        code = DIRECTIONS.index(direction)
+        self.counts[code] += 1
+        evicted = self.history.push(code)
+        if evicted is not None:
+            self.counts[evicted] -= 1
+
+    def __call__(self, round_num: int, shooter: str) -> str:
+        scores = self.scores()
+        if not any(scores) or self.rng.random() < self.explore:
+            return self.rng.choice(DIRECTIONS)
+        # 守门员扑向最可能的方向；射门球员射向最不可能被扑的方向（平局随机）
+        target = max(scores) if self.role == "keeper" else min(scores)
+        return self.rng.choice([d for d, score in zip(DIRECTIONS, scores) if score == target])
+
+
+class FrequencyStrategy(AdaptiveStrategy):
+    """频率统计：按对手最近 memory 次方向的出现次数做决策"""
+
+
+class NGramStrategy(AdaptiveStrategy):
+    """
+    n-gram 模式预测：根据对手最近 n-1 次方向预测下一次方向
+    例如 n=2 时学习 "上次射左之后下次射哪里"
+    """
+
+    def __init__(self, role: str = "keeper", n: int = 2, memory: int = 30,
+                 rng: Optional[random.Random] = None, explore: float = 0.1):
+        super().__init__(role, memory, rng, explore)
+        if n < 2:
+            raise ValueError("n 必须至少为 2")
+        self.n = n
+        self.contexts = 3 ** (n - 1)
+        # 每个 (上下文, 下一方向) 组合的出现次数，下标为 上下文 * 3 + 方向
+        self.transitions = [0] * (self.contexts * 3)
+        self.events = RingBuffer(memory)
+        self.context = 0
+        self.seen = 0
+
+    def observe(self, direction: str):
+        code = DIRECTIONS.index(direction)
+        if self.seen >= self.n - 1:
+            key = self.context * 3 + code
+            self.transitions[key] += 1
+            evicted = self.events.push(key)
+            if evicted is not None:
+                self.transitions[evicted] -= 1
+        # 同时维护频率计数，上下文没有数据时退回频率统计
+        super().observe(direction)
+        self.context = (self.context * 3 + code) % self.contexts
+        self.seen += 1
+
+    def scores(self) -> Sequence[int]:
+        if self.seen >= self.n - 1:
+            start = self.context * 3
+            row = self.transitions[start:start + 3]
+            if any(row):
+                return row
+        return self.counts
+
+
+def _solve(matrix: List[List[float]]) -> Optional[List[float]]:
+    """高斯消元解线性方程组（增广矩阵），奇异时返回None"""
+    size = len(matrix)
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(matrix[r][col]))
+        if abs(matrix[pivot][col]) < 1e-12:
+            return None
+        matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+        for row in range(size):
+            if row != col:
+                factor = matrix[row][col] / matrix[col][col]
+                matrix[row] = [a - factor * b for a, b in zip(matrix[row], matrix[col])]
+    return [matrix[i][size] / matrix[i][i] for i in range(size)]
+
+
+def _equalizer(payoff, rows: Tuple[int, ...], cols: Tuple[int, ...]) -> Optional[Tuple[List[float], float]]:
+    """在支撑集 cols 上求混合策略，使 rows 中每个对手选择的期望收益相同"""
+    k = len(cols)
+    system = [[payoff(i, j) for j in cols] + [-1.0, 0.0] for i in rows]
+    system.append([1.0] * k + [0.0, 1.0])
+    solution = _solve(system)
+    if solution is None:
+        return None
+    return solution[:k], solution[k]
+
+
+@lru_cache(maxsize=256)
+def solve_zero_sum(goal_matrix: Tuple[Tuple[float, ...], ...]) -> Tuple[Tuple[float, ...], Tuple[float, ...], float]:
+    """
+    支撑集枚举求 3×3 零和博弈的混合纳什均衡
+    goal_matrix[射门方向][扑救方向] 为进球概率，射门方最大化、守门员最小化
+    返回 (射门方向分布, 扑救方向分布, 均衡进球率)，结果按矩阵缓存
+    """
+    eps = 1e-9
+    n = len(goal_matrix)
+    for k in range(1, n + 1):
+        for rows in combinations(range(n), k):
+            for cols in combinations(range(n), k):
+                keeper = _equalizer(lambda i, j: goal_matrix[i][j], rows, cols)
+                shooter = _equalizer(lambda j, i: goal_matrix[i][j], cols, rows)
+                if keeper is None or shooter is None:
+                    continue
+                (q_support, value), (p_support, _) = keeper, shooter
+                if min(q_support) < -eps or min(p_support) < -eps:
+                    continue
+                q = [0.0] * n
+                p = [0.0] * n
+                for j, weight in zip(cols, q_support):
+                    q[j] = max(0.0, weight)
+                for i, weight in zip(rows, p_support):
+                    p[i] = max(0.0, weight)
+                # 最优反应检查：任何一方单独偏离都不能更好
+                if all(sum(goal_matrix[i][j] * q[j] for j in range(n)) <= value + eps for i in range(n)) and \
+                        all(sum(p[i] * goal_matrix[i][j] for i in range(n)) >= value - eps for j in range(n)):
+                    return tuple(p), tuple(q), value
+    raise ValueError("未找到纳什均衡")
+
+
+# 基本规则（方向不同即进球）的进球矩阵
+BASIC_GOAL_MATRIX = tuple(tuple(float(d != g) for g in range(3)) for d in range(3))
+
+
+class NashStrategy:
+    """按混合策略纳什均衡随机选择方向；不学习，因此无法被对手利用"""
+
+    def __init__(self, role: str = "keeper", goal_matrix: Sequence[Sequence[float]] = BASIC_GOAL_MATRIX,
+                 rng: Optional[random.Random] = None):
+        if role not in ROLES:
+            raise ValueError(f"无效角色: {role}，必须是 keeper 或 shooter")
+        self.role = role
+        self.rng = rng or random.Random()
+        shooter_mix, keeper_mix, self.value = solve_zero_sum(tuple(tuple(row) for row in goal_matrix))
+        self.mix = keeper_mix if role == "keeper" else shooter_mix
+        # 预先算好累计权重，每次决策只需一次抽样
+        self._cum_weights = [sum(self.mix[:i + 1]) for i in range(len(self.mix))]
+
+    def __call__(self, round_num: int, shooter: str) -> str:
+        return self.rng.choices(DIRECTIONS, cum_weights=self._cum_weights)[0]
@@ -0,0 +1,3 @@
+"""
+性能基准测试包：在 game 目录下以 python -m benchmarks.<模块名> 运行
+"""
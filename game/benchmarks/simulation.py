@@ -0,0 +1,62 @@
+"""
+模拟基准：比较固定 5 轮、提前结束、完整规则（提前结束 + 突然死亡）三种规则下
+无界面引擎的每秒场数和平均每场射门次数，量化提前结束节省的模拟工作量
+
+用法（在 game 目录下）：python -m benchmarks.simulation [场数]
+"""
+import random
+import sys
+import time
+from typing import Dict, NamedTuple
+
+from engine import ShootoutEngine, random_strategy
+from players import ALL_PLAYERS
+
+# 规则名 -> (early_stop, sudden_death)
+RULES = {
+    "固定5轮": (False, False),
+    "提前结束": (True, False),
+    "完整规则": (True, True),
+}
+
+
+class RuleStats(NamedTuple):
+    """一种规则下的模拟统计"""
+    games: int
+    seconds: float
+    kicks: float  # 平均每场射门次数
+
+    @property
+    def rate(self) -> float:
+        return self.games / self.seconds
+
+
+def measure(games: int, early_stop: bool, sudden_death: bool, seed: int = 0) -> RuleStats:
+    """用均匀随机策略进行 games 场比赛，统计耗时和平均射门次数"""
+    rng = random.Random(seed)
+    engine = ShootoutEngine(ALL_PLAYERS[:5], rng=rng,
+                            early_stop=early_stop, sudden_death=sudden_death)
+    strategy = random_strategy(rng)
+    play = engine.play
+    kicks = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        play(strategy, strategy, strategy, strategy, record=False)
+        kicks += engine.kicks
+    return RuleStats(games, time.perf_counter() - start, kicks / games)
+
+
+def report(games: int = 200_000) -> Dict[str, RuleStats]:
+    """打印各规则的吞吐量和相对固定 5 轮节省的射门次数"""
+    results = {name: measure(games, *flags) for name, flags in RULES.items()}
+    baseline = results["固定5轮"].kicks
+    print(f"=== 引擎模拟 {games:,} 场 ===")
+    for name, stats in results.items():
+        saved = 1 - stats.kicks / baseline
+        print(f"{name:<6} {stats.rate:>10,.0f} 场/秒  平均射门 {stats.kicks:5.2f} 次  "
+              f"节省射门 {saved:+.1%}")
+    return results
+
+
+if __name__ == "__main__":
+    report(*(int(arg) for arg in sys.argv[1:2]))
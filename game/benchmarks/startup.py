@@ -0,0 +1,61 @@
+"""
+启动耗时基准：用 python -X importtime 统计导入各入口模块的耗时，
+并检查无界面入口没有提前导入 tkinter/turtle
+
+用法（在 game 目录下）：python -m benchmarks.startup [模块名 ...]
+"""
+import os
+import subprocess
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+# 无界面使用时不应被导入的图形模块
+GUI_MODULES = ("tkinter", "turtle", "game_gui", "game_graphics")
+
+# 默认测量的入口模块
+DEFAULT_TARGETS = ("engine", "main", "tournament", "game_graphics")
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module: str) -> Tuple[List[Tuple[str, int]], List[str]]:
+    """
+    在新进程中导入 module，返回 ([(模块名, 累计耗时微秒)], 已导入的图形模块)
+    """
+    code = (
+        f"import {module}, sys; "
+        f"print(','.join(m for m in {GUI_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=GAME_DIR, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # 格式: "import time:      self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 去掉分隔符后的一个空格，剩余的缩进表示导入层级
+        rows.append((name.rstrip()[1:], int(cumulative)))
+    gui_loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return rows, gui_loaded
+
+
+def report(targets: Sequence[str] = DEFAULT_TARGETS, top: int = 8) -> Dict[str, float]:
+    """打印每个入口模块的总导入耗时和最慢的子模块，返回 {模块名: 毫秒}"""
+    totals = {}
+    for module in targets:
+        rows, gui_loaded = import_profile(module)
+        # 目标模块所在行的累计耗时即其总导入耗时（不含解释器自身启动）
+        total_us = next(us for name, us in rows if name == module)
+        totals[module] = total_us / 1000
+        gui_note = f"图形模块: {', '.join(gui_loaded)}" if gui_loaded else "未导入图形模块"
+        print(f"=== import {module}: {total_us / 1000:.1f} ms ({gui_note}) ===")
+        for name, us in sorted(rows, key=lambda row: -row[1])[:top]:
+            print(f"  {us / 1000:8.2f} ms  {name.strip()}")
+    return totals
+
+
+if __name__ == "__main__":
+    report(sys.argv[1:] or DEFAULT_TARGETS)
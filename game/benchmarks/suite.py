@@ -0,0 +1,392 @@
+"""
+性能基准套件：游戏逻辑、无界面模拟、图形帧时间、结果持久化，
+与保存的基线比较，超过阈值的退化以非零退出码报告
+
+用法（在 game 目录下）：
+    python -m benchmarks.suite                 运行全部基准并与基线比较
+    python -m benchmarks.suite --only engine   只运行名字包含 engine 的基准
+    python -m benchmarks.suite --update        把本次结果写为新的基线
+    python -m benchmarks.suite --record        把本次结果（含当前提交）追加到历史文件
+    python -m benchmarks.suite --allow-missing 跳过的或没有基线的基准不算失败
+graphics.* 基准需要显示器：无显示器时用 xvfb-run 运行，基线也需这样用 --update 记录
+（xvfb-run python -m benchmarks.suite --only graphics --update）。被跳过或没有基线的基准
+没有受到检查，默认以非零退出码报告，而不是静默通过。
+raster.* 基准用离屏渲染器测量同样的三种帧，任何环境都能运行并与基线比较。
+--record 的历史文件默认写在 benchmarks/history.jsonl（已被 git 忽略），可用 --history 指定其他路径。
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baselines.json")
+HISTORY_PATH = os.path.join(BENCH_DIR, "history.jsonl")
+
+# 默认允许的退化比例：共享机器上单次测量的波动约为 ±20%，阈值需高于此才不会误报
+DEFAULT_THRESHOLD = 0.35
+
+
+class Skip(Exception):
+    """当前环境无法运行该基准（缺少显示器或可选依赖）"""
+
+
+class Benchmark(NamedTuple):
+    name: str
+    unit: str
+    run: Callable[[], float]
+    higher_is_better: bool = True
+    threshold: float = DEFAULT_THRESHOLD
+
+
+def best_rate(step: Callable[[], int], repeat: int = 5) -> float:
+    """重复 repeat 次，取最快一次的 每秒操作数（step 返回本次完成的操作数）"""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops = step()
+        best = max(best, ops / (time.perf_counter() - start))
+    return best
+
+
+def best_time_ms(step: Callable[[], None], calls: int = 50, repeat: int = 5) -> float:
+    """重复 repeat 轮、每轮调用 calls 次，取最快一轮的 平均每次毫秒数"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            step()
+        best = min(best, (time.perf_counter() - start) / calls * 1000)
+    return best
+
+
+# ---- 游戏逻辑 ----
+
+def bench_decisions(shots: int = 50_000) -> float:
+    """PenaltyGame 每次射门的决策开销：电脑策略 + 判定计分 + 记录 + 策略学习"""
+    from main import PenaltyGame
+    from players import ALL_PLAYERS
+
+    game = PenaltyGame(seed=0)
+    game.my_players = list(ALL_PLAYERS[:5])
+    game.my_goalkeeper = "诺伊尔"
+    human = random.Random(1)
+    directions = [human.choice("LCR") for _ in range(shots)]
+
+    def step():
+        game.reset()
+        keeper, shooter = game.opponent_keeper, game.opponent_shooter
+        for i, direction in enumerate(directions):
+            round_num = i // 2 % 5 + 1
+            if i % 10 == 0:
+                game.reset()
+            if i % 2 == 0:
+                name = game.shooter_for(round_num)
+                guess = keeper(round_num, name)
+                game.record_shot(round_num, "me", name, direction, guess)
+                game.observe(None, keeper, direction, guess)
+            else:
+                name = game.opponent_for(round_num)
+                shot = shooter(round_num, name)
+                game.record_shot(round_num, "opponent", name, shot, direction)
+                game.observe(shooter, None, shot, direction)
+        return shots
+
+    return best_rate(step)
+
+
+def bench_shootouts(games: int = 50_000) -> float:
+    """无界面引擎每秒完成的比赛数（完整规则，均匀随机策略）"""
+    from benchmarks.simulation import measure
+
+    return max(measure(games, True, True, seed).rate for seed in range(5))
+
+
+def bench_montecarlo(games: int = 1_000_000) -> float:
+    """NumPy 向量化模拟每秒完成的比赛数"""
+    try:
+        from montecarlo import simulate
+    except ImportError as e:
+        raise Skip(f"缺少可选依赖: {e.name}")
+    return best_rate(lambda: simulate(games, seed=0).games)
+
+
+# ---- 图形 ----
+
+def _graphics():
+    """创建一个游戏窗口；无显示器时跳过"""
+    try:
+        import tkinter as tk
+        from game_graphics import GameGraphics
+        root = tk.Tk()
+    except Exception as e:  # TclError（无显示器）或缺少 tkinter
+        raise Skip(f"无法创建窗口: {e}")
+    root.withdraw()
+    return GameGraphics(root)
+
+
+def _with_graphics(measure: Callable) -> Callable[[], float]:
+    def run():
+        graphics = _graphics()
+        try:
+            return measure(graphics)
+        finally:
+            graphics.close()
+    return run
+
+
+def frame_draw_field(graphics) -> float:
+    """重画整个静态球场并刷新一帧（清空按尺寸的缓存，测量的是重新计算图元的代价）"""
+    def step():
+        graphics.canvas.delete("static")
+        graphics._static_cache.clear()
+        graphics._static_drawn = False
+        graphics.draw_field()
+        graphics.screen.update()
+    return best_time_ms(step)
+
+
+def frame_draw_goalkeeper(graphics) -> float:
+    """切换守门员位置/姿势并重绘守门员图层"""
+    poses = [(550, 0, "right", "stand"), (550, 0, "right", "dive_up"),
+             (-550, 0, "left", "dive_down"), (-550, 0, "left", "stand")]
+    calls = iter(range(10 ** 9))
+
+    def step():
+        graphics.draw_goalkeeper(*poses[next(calls) % len(poses)])
+        graphics._flush()
+    return best_time_ms(step, calls=200)
+
+
+def frame_update_score(graphics) -> float:
+    """比分变化后重绘比分图层"""
+    def step():
+        graphics.my_score += 1
+        graphics.update_score()
+        graphics._flush()
+    return best_time_ms(step, calls=200)
+
+
+def frame_items(graphics, full: bool = False, games: int = 20) -> float:
+    """
+    瞬时回放 games 场模拟比赛，平均每次刷新创建的画布图元数；
+    full 为 True 时每次刷新前重画静态球场和全部动态图层（只重绘脏图层之前的做法），作为对照
+    """
+    from raster import simulated_replay
+
+    if full:
+        flush = graphics._flush
+
+        def repaint_all():
+            graphics._static_drawn = False
+            graphics.draw_field()
+            graphics._dirty_layers.update(graphics._layer_painters)
+            flush()
+        graphics._flush = repaint_all
+    before = dict(graphics.frame_stats)
+    for seed in range(games):
+        graphics.play_replay(simulated_replay(seed), float("inf"))
+    items = graphics.frame_stats["items"] - before["items"]
+    return items / (graphics.frame_stats["updates"] - before["updates"])
+
+
+def _raster():
+    """创建离屏渲染器；缺少 Pillow 时跳过"""
+    try:
+        from raster import RasterGraphics
+    except ImportError as e:
+        raise Skip(f"缺少可选依赖: {e.name}")
+    return RasterGraphics(sink=lambda frame: None)
+
+
+def _with_raster(measure: Callable) -> Callable[[], float]:
+    return lambda: measure(_raster())
+
+
+def raster_draw_field(graphics) -> float:
+    """离屏：重新生成球场图像并合成一帧（清空按尺寸的缓存）"""
+    from raster import field_image
+
+    def step():
+        field_image.cache_clear()
+        graphics._static = None
+        graphics.draw_field()
+        graphics.emit()
+    return best_time_ms(step)
+
+
+def raster_draw_goalkeeper(graphics) -> float:
+    """离屏：切换守门员位置/姿势并合成一帧"""
+    poses = [(550, 0, "right", "stand"), (550, 0, "right", "dive_up"),
+             (-550, 0, "left", "dive_down"), (-550, 0, "left", "stand")]
+    calls = iter(range(10 ** 9))
+
+    def step():
+        graphics.draw_goalkeeper(*poses[next(calls) % len(poses)])
+        graphics.emit()
+    return best_time_ms(step, calls=200)
+
+
+def raster_update_score(graphics) -> float:
+    """离屏：比分变化后合成一帧"""
+    def step():
+        graphics.my_score += 1
+        graphics.update_score()
+        graphics.emit()
+    return best_time_ms(step, calls=200)
+
+
+# ---- 持久化 ----
+
+def bench_save_game_result(games: int = 300) -> float:
+    """save_game_result 每秒保存的比赛数（每场含 10 次射门，逐场提交），写入临时结果库"""
+    from engine import ShotRecord
+    from main import save_game_result
+    from utils import results_store
+
+    players = ["梅西", "C罗", "哈兰德", "德布劳内", "莫德里奇"]
+    shots = [ShotRecord(r, side, "梅西", "L", "R", True) for r in range(1, 6) for side in ("me", "opponent")]
+    with tempfile.TemporaryDirectory() as tmp:
+        # 让默认路径的共享结果库指向临时文件，结束后还原
+        key = os.path.abspath(results_store.DEFAULT_PATH)
+        previous = results_store._stores.get(key)
+        store = results_store._stores[key] = results_store.ResultStore(os.path.join(tmp, "results.db"))
+        try:
+            def step():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for _ in range(games):
+                        save_game_result(5, 3, players, "诺伊尔", shots)
+                return games
+            return best_rate(step)
+        finally:
+            store.close()
+            if previous is None:
+                del results_store._stores[key]
+            else:
+                results_store._stores[key] = previous
+
+
+BENCHMARKS = [
+    Benchmark("logic.decisions", "射门/秒", bench_decisions),
+    Benchmark("engine.shootouts", "场/秒", bench_shootouts),
+    Benchmark("montecarlo.shootouts", "场/秒", bench_montecarlo),
+    Benchmark("graphics.draw_field", "毫秒", _with_graphics(frame_draw_field), higher_is_better=False),
+    Benchmark("graphics.draw_goalkeeper", "毫秒", _with_graphics(frame_draw_goalkeeper), higher_is_better=False),
+    Benchmark("graphics.update_score", "毫秒", _with_graphics(frame_update_score), higher_is_better=False),
+    # 图元数是确定的计数而非计时，不受机器波动影响，阈值收紧
+    Benchmark("graphics.frame_items", "图元/帧", _with_graphics(frame_items),
+              higher_is_better=False, threshold=0.1),
+    Benchmark("graphics.frame_items_full", "图元/帧", _with_graphics(lambda g: frame_items(g, full=True)),
+              higher_is_better=False, threshold=0.1),
+    Benchmark("raster.draw_field", "毫秒", _with_raster(raster_draw_field), higher_is_better=False),
+    Benchmark("raster.draw_goalkeeper", "毫秒", _with_raster(raster_draw_goalkeeper), higher_is_better=False),
+    Benchmark("raster.update_score", "毫秒", _with_raster(raster_update_score), higher_is_better=False),
+    # 磁盘同步耗时波动较大，放宽阈值
+    Benchmark("persist.save_game_result", "场/秒", bench_save_game_result, threshold=0.6),
+]
+
+
+def run(only: Optional[str] = None) -> Dict[str, Optional[float]]:
+    """运行基准，返回 {名字: 结果}，跳过的基准结果为 None"""
+    results = {}
+    for bench in BENCHMARKS:
+        if only and only not in bench.name:
+            continue
+        try:
+            results[bench.name] = bench.run()
+        except Skip as e:
+            print(f"{bench.name:<28} 跳过: {e}")
+            results[bench.name] = None
+    return results
+
+
+def load_baselines(path: str = BASELINE_PATH) -> Dict[str, float]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def relative(bench: Benchmark, value: float, baseline: float) -> float:
+    """统一为 "越大越好" 的比值：小于 1 - 阈值即为退化（计数类基准的基线或结果可能为 0）"""
+    better, worse = (value, baseline) if bench.higher_is_better else (baseline, value)
+    if worse == 0:
+        return 1.0 if better == 0 else float("inf")
+    return better / worse
+
+
+def compare(results: Dict[str, Optional[float]], baselines: Dict[str, float]) -> List[str]:
+    """打印与基线的比较，返回超过阈值的退化项"""
+    regressions = []
+    for bench in BENCHMARKS:
+        value = results.get(bench.name)
+        if value is None:
+            continue
+        baseline = baselines.get(bench.name)
+        line = f"{bench.name:<28} {value:>14,.3f} {bench.unit}"
+        if baseline is not None:
+            ratio = relative(bench, value, baseline)
+            status = "退化!" if ratio < 1 - bench.threshold else "正常"
+            line += f"  基线 {baseline:,.3f}  {ratio - 1:+.1%}  {status}"
+            if ratio < 1 - bench.threshold:
+                regressions.append(bench.name)
+        else:
+            line += "  (无基线)"
+        print(line)
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="点球大战性能基准")
+    parser.add_argument("--only", help="只运行名字包含该字符串的基准")
+    parser.add_argument("--update", action="store_true", help="把本次结果写为新的基线")
+    parser.add_argument("--record", action="store_true", help="把本次结果追加到历史文件")
+    parser.add_argument("--history", default=HISTORY_PATH, help=f"历史文件路径（默认 {HISTORY_PATH}）")
+    parser.add_argument("--allow-missing", action="store_true", help="跳过的或没有基线的基准不算失败")
+    args = parser.parse_args(argv)
+
+    results = run(args.only)
+    baselines = load_baselines()
+    regressions = compare(results, baselines)
+
+    measured = {name: value for name, value in results.items() if value is not None}
+    if args.record:
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": time.strftime("%Y-%m-%d %H:%M:%S"), "commit": git_revision(),
+                                "results": measured}, ensure_ascii=False) + "\n")
+    if args.update:
+        baselines.update((name, round(value, 3)) for name, value in measured.items())
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"基线已更新: {BASELINE_PATH}")
+        return 0
+
+    # 跳过的或没有基线的基准没有受到检查：默认视为失败，避免渲染等退化被静默放过
+    unchecked = [name for name, value in results.items() if value is None or name not in baselines]
+    if regressions:
+        print(f"\n{len(regressions)} 项性能退化: {', '.join(regressions)}")
+    if unchecked and not args.allow_missing:
+        print(f"\n{len(unchecked)} 项基准被跳过或没有基线（未受检查）: {', '.join(unchecked)}\n"
+              "图形基准请在有显示器或 xvfb-run 下运行并用 --update 记录基线；确需忽略时加 --allow-missing")
+    return 1 if regressions or (unchecked and not args.allow_missing) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+联网点球大战客户端：命令行对战，以及模拟大量玩家的压力测试
+展示：异常处理、lambda函数、组合数据类型、模块与包
+
+用法（在 game 目录下）：
+    python client.py [--host 127.0.0.1] [--port 8765] [--name 名字]   命令行对战
+    python client.py --bots 2000 [--host ... --port ...]              压力测试
+压力测试未指定 --port 时在本进程内启动一个服务器（系统分配端口）。
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+from engine import DIRECTIONS
+from server import DEFAULT_HOST, DEFAULT_PORT, GameServer
+
+# 出招回调：接收 turn 消息，返回 "L"/"C"/"R"；需要等待输入的回调可以是协程函数
+Chooser = Callable[[Dict], Union[str, Awaitable[str]]]
+
+
+async def play(host: str, port: int, name: str, choose: Chooser,
+               on_message: Optional[Callable[[Dict], None]] = None,
+               latencies: Optional[List[float]] = None) -> Dict:
+    """
+    连接服务器进行一场比赛，返回 end 消息
+    latencies 不为 None 时记录每次出招到收到本脚结果的耗时（秒）
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    send = lambda **message: writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+    try:
+        send(op="join", name=name)
+        sent_at = None
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("服务器关闭了连接")
+            message = json.loads(line)
+            if on_message:
+                on_message(message)
+            op = message["op"]
+            if op == "turn":
+                direction = choose(message)
+                if inspect.isawaitable(direction):
+                    direction = await direction
+                sent_at = time.perf_counter()
+                send(op="move", kick=message["kick"], direction=direction)
+                await writer.drain()
+            elif op == "result" and sent_at is not None:
+                if latencies is not None:
+                    latencies.append(time.perf_counter() - sent_at)
+                sent_at = None
+            elif op == "end":
+                return message
+    finally:
+        writer.close()
+
+
+async def console_chooser(message: Dict) -> str:
+    """命令行出招：反复提示直到输入有效方向（input 在线程池中阻塞，事件循环照常收发消息）"""
+    action = "射门" if message["role"] == "shoot" else f"扑救（{message['shooter']} 射门）"
+    prompt = f"第 {message['round']} 轮 请选择{action}方向 (L/C/R): "
+    loop = asyncio.get_running_loop()
+    while True:
+        direction = (await loop.run_in_executor(None, input, prompt)).strip().upper()
+        if direction in DIRECTIONS:
+            return direction
+        print("无效方向，必须是 L、C 或 R")
+
+
+def show(message: Dict):
+    """命令行显示服务器消息"""
+    op = message["op"]
+    if op == "waiting":
+        print("等待对手加入...")
+    elif op == "start":
+        print(f"比赛开始！对手: {message['opponent']}（你是{'主' if message['side'] == 'home' else '客'}队）")
+    elif op == "result":
+        outcome = "进球！" if message["goal"] else "被扑出！"
+        print(f"  {message['shooter']} 射向 {message['direction']}，守门员扑向 {message['guess']}: "
+              f"{outcome} 比分 {message['score'][0]} - {message['score'][1]}")
+    elif op == "end":
+        print(f"比赛结束 {message['score'][0]} - {message['score'][1]}"
+              + ("（对手掉线）" if message["forfeit"] else ""))
+    elif op == "error":
+        print(f"错误: {message['message']}")
+
+
+async def load_test(bots: int, host: str = DEFAULT_HOST, port: Optional[int] = None,
+                    seed: int = 0) -> Dict[str, float]:
+    """
+    模拟 bots 个玩家同时连接、两两配对比赛（随机出招），返回吞吐量和出招延迟统计
+    port 为 None 时在本进程内启动服务器；bots 必须为偶数，否则落单的玩家会一直等待对手
+    """
+    if bots <= 0 or bots % 2:
+        raise ValueError(f"压力测试的玩家数必须是正偶数: {bots}")
+    listener = None
+    if port is None:
+        listener = await GameServer(rng=random.Random(seed)).start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+    rng = random.Random(seed)
+    bot = lambda message: rng.choice(DIRECTIONS)
+    latencies: List[float] = []
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(
+            *(play(host, port, f"bot{i}", bot, latencies=latencies) for i in range(bots)),
+            return_exceptions=True)
+    finally:
+        if listener is not None:
+            listener.close()
+            await listener.wait_closed()
+    elapsed = time.perf_counter() - start
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    latencies.sort()
+    percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+    return {
+        "bots": bots,
+        "errors": len(errors),
+        "seconds": elapsed,
+        "matches_per_sec": (bots - len(errors)) / 2 / elapsed,
+        "moves_per_sec": len(latencies) / elapsed,
+        "latency_ms_median": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "latency_ms_p99": percentile(0.99),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="联网点球大战客户端")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=None, help=f"服务器端口（默认 {DEFAULT_PORT}）")
+    parser.add_argument("--name", default="玩家")
+    parser.add_argument("--bots", type=int, default=0, help="压力测试：模拟的玩家数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.bots < 0 or args.bots % 2:
+        parser.error("--bots 必须是偶数（玩家两两配对）")
+
+    try:
+        if args.bots:
+            report = asyncio.run(load_test(args.bots, args.host, args.port, args.seed))
+            print(f"=== 压力测试: {report['bots']} 个玩家，{report['errors']} 个出错 ===")
+            print(f"用时 {report['seconds']:.2f} 秒，{report['matches_per_sec']:,.0f} 场/秒，"
+                  f"{report['moves_per_sec']:,.0f} 次出招/秒")
+            print(f"出招延迟: 中位数 {report['latency_ms_median']:.2f} 毫秒，"
+                  f"P99 {report['latency_ms_p99']:.2f} 毫秒")
+        else:
+            asyncio.run(play(args.host, args.port or DEFAULT_PORT, args.name, console_chooser, show))
+    except (ConnectionError, OSError) as e:
+        print(f"连接服务器失败: {e}")
+        return 1
+    except (KeyboardInterrupt, EOFError):
+        print("\n已退出")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+点球大战无界面引擎：纯逻辑实现，不依赖 tkinter/turtle，循环中没有任何 sleep
+展示：面向对象编程、lambda函数、组合数据类型、异常处理
+
+射门与扑救方向由可插拔的策略回调给出，图形界面只是引擎之上的一个前端，
+批量模拟和 CI 可以直接使用 ShootoutEngine。
+"""
+import random
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from players import DIRECTION_CODES, REGISTRY, SIDE_CODES, Goalkeeper, ShotLog
+
+# 方向元组 - 展示组合数据类型（元组）
+DIRECTIONS: Tuple[str, str, str] = ("L", "C", "R")
+
+# 编码 -> 名称的反查表
+SIDES: Tuple[str, str] = ("me", "opponent")
+
+# 突然死亡阶段的默认轮次上限（含常规轮次），防止双方永远同进同失时无限循环
+MAX_ROUNDS = 100
+
+# 策略回调：接收 (轮次, 射门球员名)，返回 "L"、"C" 或 "R"
+# 学习型策略（见 ai.py）另有 observe(对手方向) 方法，每次射门后由引擎调用
+Strategy = Callable[[int, str], str]
+
+
+class ShotRecord(NamedTuple):
+    """单次射门记录 - 展示组合数据类型（命名元组）"""
+    round_num: int
+    side: str  # "me" 表示我方射门，"opponent" 表示对方射门
+    shooter: str
+    direction: str
+    keeper_guess: str
+    is_goal: bool
+
+
+def random_strategy(rng: Optional[random.Random] = None) -> Strategy:
+    """均匀随机选择方向的策略"""
+    choice = (rng or random).choice
+    return lambda round_num, shooter: choice(DIRECTIONS)
+
+
+def fixed_strategy(direction: str) -> Strategy:
+    """始终选择同一方向的策略"""
+    return lambda round_num, shooter: direction
+
+
+def sequence_strategy(directions: Sequence[str]) -> Strategy:
+    """按轮次循环使用给定方向序列的策略"""
+    directions = tuple(directions)
+    return lambda round_num, shooter: directions[(round_num - 1) % len(directions)]
+
+
+def round_row(round_num: int, rows: int, cycle: int = 1) -> int:
+    """
+    按轮次给出 rows 行数据时第 round_num 轮使用的行（从 0 开始）：超出给定行数后循环使用最后 cycle 行。
+    cycle 取出场人数时与 play 中按名单轮换射门（(轮次 - 1) % 人数）一致
+    """
+    if round_num <= rows:
+        return round_num - 1
+    cycle = min(cycle, rows)
+    return rows - cycle + (round_num - rows - 1) % cycle
+
+
+class ShootoutEngine:
+    """点球大战规则引擎 - 展示面向对象编程"""
+
+    def __init__(self, my_players: Optional[Iterable[str]] = None,
+                 my_goalkeeper: Optional[str] = None, rounds: int = 5,
+                 opponent_name: str = "对方球员",
+                 opponent_players: Optional[Iterable[str]] = None,
+                 rng: Optional[random.Random] = None,
+                 opponent_goalkeeper: Optional[str] = None,
+                 shot_log: Optional[ShotLog] = None,
+                 outcome_model=None,
+                 early_stop: bool = True, sudden_death: bool = True,
+                 max_rounds: int = MAX_ROUNDS, seed: Optional[int] = None):
+        # 使用组合数据类型（列表）存储游戏数据
+        self.my_players: List[str] = list(my_players or [])
+        self.my_goalkeeper = my_goalkeeper
+        self.opponent_goalkeeper = opponent_goalkeeper
+        self.opponent_name = opponent_name
+        # 对方出场名单，为空时所有对方射门都记在 opponent_name 名下
+        self.opponent_players: List[str] = list(opponent_players or [opponent_name])
+        self.my_score = 0
+        self.opponent_score = 0
+        self.rounds = rounds
+
+        # 点球大战规则：一方已不可能追上时提前结束；常规轮次战平后进入突然死亡，
+        # 按出场名单循环射门，直到某轮分出胜负或达到 max_rounds 轮（仍战平则记为平局）
+        if max_rounds < rounds:
+            raise ValueError(f"轮次上限 {max_rounds} 不能小于常规轮次 {rounds}")
+        self.early_stop = early_stop
+        self.sudden_death = sudden_death
+        self.max_rounds = max_rounds
+        # 上一场比赛实际进行的射门次数
+        self.kicks = 0
+
+        # 使用元组存储射门方向映射 - 展示组合数据类型（元组）
+        self.direction_map: Tuple[str, str, str] = DIRECTIONS
+
+        # 逐次射门记录，按列紧凑存储；传入的日志在多场比赛间共享、不会被清空
+        self.shot_log = shot_log if shot_log is not None else ShotLog()
+        self._shared_log = shot_log is not None
+        self.game_index = 0
+        self._first_shot = 0
+
+        # 进球判定模型（如 skill_model.SkillModel）；为 None 时使用方向不同即进球的规则
+        self.outcome_model = outcome_model
+
+        # 引擎自己的随机数生成器，传入带种子的实例即可复现结果；
+        # 未传入时按 seed（省略则随机选取）创建，seed 会写入回放文件以便重现整场比赛
+        if rng is None:
+            seed = seed if seed is not None else random.randrange(2 ** 63)
+            rng = random.Random(seed)
+        self.seed = seed
+        self.rng = rng
+
+    def reset(self, clear_log: bool = True):
+        """重置比分，开始新一场比赛的射门记录（clear_log 为 False 时保留自有日志中的旧记录，本场从其末尾开始）"""
+        self.my_score = 0
+        self.opponent_score = 0
+        self.kicks = 0
+        if clear_log and not self._shared_log:
+            self.shot_log.clear()
+        self.game_index += 1
+        self._first_shot = len(self.shot_log)
+
+    @property
+    def shots(self) -> List[ShotRecord]:
+        """本场比赛的射门记录（从紧凑日志解码为命名元组）"""
+        log = self.shot_log
+        return [
+            ShotRecord(log.round[i], SIDES[log.side[i]], REGISTRY[log.shooter[i]].name,
+                       DIRECTIONS[log.direction[i]], DIRECTIONS[log.guess[i]], bool(log.goal[i]))
+            for i in range(self._first_shot, len(log))
+        ]
+
+    def _keeper_id(self, name: Optional[str]) -> int:
+        """守门员编号，未指定守门员时为 -1"""
+        return REGISTRY.id_of(name, Goalkeeper) if name else -1
+
+    def validate_direction(self, direction: str) -> str:
+        """验证射门方向 - 展示lambda函数和异常处理"""
+        try:
+            direction = direction.strip().upper() if direction else ""
+
+            # 使用lambda函数验证方向 - 展示lambda函数
+            is_valid = lambda d: d in self.direction_map
+            if not is_valid(direction):
+                raise ValueError(f"无效方向: {direction}，必须是 L、C 或 R")
+
+            return direction
+        except (AttributeError, TypeError) as e:
+            raise ValueError(f"方向验证失败: {e}")
+
+    @staticmethod
+    def is_goal(direction: str, keeper_guess: str) -> bool:
+        """判断是否进球：射门方向与扑救方向不同即为进球"""
+        return direction != keeper_guess
+
+    def judge(self, round_num: int, side: str, shooter: str,
+              direction: str, keeper_guess: str) -> bool:
+        """判定一次射门：未设置 outcome_model 时按基本规则，否则按概率表查表抽样"""
+        if self.outcome_model is None:
+            return direction != keeper_guess
+        keeper = self.opponent_goalkeeper if side == "me" else self.my_goalkeeper
+        probability = self.outcome_model.lookup(
+            REGISTRY.id_of(shooter), self._keeper_id(keeper),
+            DIRECTION_CODES[direction], DIRECTION_CODES[keeper_guess], round_num)
+        return self.rng.random() < probability
+
+    def shooter_for(self, round_num: int) -> str:
+        """返回第 round_num 轮我方出场的球员"""
+        if not self.my_players:
+            raise ValueError("尚未选择球员")
+        return self.my_players[(round_num - 1) % len(self.my_players)]
+
+    def opponent_for(self, round_num: int) -> str:
+        """返回第 round_num 轮对方出场的球员"""
+        return self.opponent_players[(round_num - 1) % len(self.opponent_players)]
+
+    @staticmethod
+    def observe(shooter: Strategy, keeper: Strategy, direction: str, keeper_guess: str):
+        """把一次射门的结果告诉学习型策略：守门员看到射门方向，射门方看到扑救方向"""
+        learn = getattr(keeper, "observe", None)
+        if learn is not None:
+            learn(direction)
+        learn = getattr(shooter, "observe", None)
+        if learn is not None:
+            learn(keeper_guess)
+
+    @property
+    def round_limit(self) -> int:
+        """最多进行的轮次"""
+        return self.max_rounds if self.sudden_death else self.rounds
+
+    def decided(self, round_num: int, opponent_kicked: bool = True) -> bool:
+        """
+        第 round_num 轮我方射门后（opponent_kicked 为 False）或双方都射门后，比赛是否已经结束
+        - 常规轮次：开启 early_stop 时，一方剩余射门全进也追不上即结束
+        - 常规轮次结束后：比分不同即结束；战平时进入突然死亡，直到某轮分出胜负
+        """
+        lead = self.my_score - self.opponent_score
+        remaining = max(0, self.rounds - round_num)
+        if not opponent_kicked:
+            return self.early_stop and (lead > remaining + 1 or -lead > remaining)
+        if round_num >= self.round_limit:
+            return True
+        if lead == 0:
+            return False
+        return round_num >= self.rounds or (self.early_stop and abs(lead) > remaining)
+
+    def record_shot(self, round_num: int, side: str, shooter: str,
+                    direction: str, keeper_guess: str, record: bool = True) -> bool:
+        """结算一次射门并更新比分，返回是否进球"""
+        is_goal = self.judge(round_num, side, shooter, direction, keeper_guess)
+        self.kicks += 1
+        if is_goal:
+            if side == "me":
+                self.my_score += 1
+            else:
+                self.opponent_score += 1
+        if record:
+            keeper = self.opponent_goalkeeper if side == "me" else self.my_goalkeeper
+            self.shot_log.append(self.game_index, round_num, SIDE_CODES[side], REGISTRY.id_of(shooter),
+                                 self._keeper_id(keeper), DIRECTION_CODES[direction],
+                                 DIRECTION_CODES[keeper_guess], is_goal)
+        return is_goal
+
+    def play(self, my_shooter: Strategy, opponent_keeper: Strategy,
+             opponent_shooter: Strategy, my_keeper: Strategy,
+             record: bool = True, validate: bool = False) -> Tuple[int, int]:
+        """
+        不经过任何界面完整进行一场点球大战
+
+        my_shooter/opponent_keeper 决定我方射门，opponent_shooter/my_keeper 决定对方射门。
+        validate 为 True 时会校验策略返回的方向（用于人工输入等不可信来源）。
+        带 observe 方法的学习型策略在每次射门后会看到对手的选择。
+        比赛按 early_stop/sudden_death 规则结束，实际射门次数记在 self.kicks。
+        """
+        # 不记录射门时无需清空日志（每场重建 8 个数组是批量模拟中可观的固定开销）
+        self.reset(clear_log=record)
+        if not self.my_players:
+            raise ValueError("尚未选择球员")
+        players = self.my_players
+        opponents = self.opponent_players
+        player_count, opponent_count = len(players), len(opponents)
+        check = self.validate_direction if validate else None
+        my_score = opponent_score = 0
+
+        # 记录射门和查概率表都只用整数编码：提前算好球员/守门员编号
+        log = self.shot_log if record else None
+        model = self.outcome_model
+        codes = DIRECTION_CODES
+        my_tables = opponent_tables = None
+        if log is not None or model is not None:
+            game = self.game_index
+            my_ids = [REGISTRY.id_of(name) for name in players]
+            opponent_ids = [REGISTRY.id_of(name) for name in opponents]
+            my_keeper_id = self._keeper_id(self.my_goalkeeper)
+            opponent_keeper_id = self._keeper_id(self.opponent_goalkeeper)
+        if model is not None:
+            # 每套名单的概率表只取一次（模型内部缓存），热循环中只做查表
+            my_tables = model.lineup_tables(my_ids, opponent_keeper_id)
+            opponent_tables = model.lineup_tables(opponent_ids, my_keeper_id)
+            horizon, rand = model.horizon, self.rng.random
+        # 只有存在学习型策略时才在每次射门后回调 observe
+        learn = any(hasattr(strategy, "observe")
+                    for strategy in (my_shooter, opponent_keeper, opponent_shooter, my_keeper))
+        observe = self.observe
+
+        # 规则判断同 decided()，在热循环中内联为整数比较
+        rounds, limit, early = self.rounds, self.round_limit, self.early_stop
+        kicks = 0
+
+        # 热循环：局部变量 + 内联计分，避免每次射门的方法调用开销
+        for round_num in range(1, limit + 1):
+            remaining = rounds - round_num if round_num < rounds else 0
+            slot = (round_num - 1) % player_count
+            shooter = players[slot]
+            direction = my_shooter(round_num, shooter)
+            guess = opponent_keeper(round_num, shooter)
+            if check:
+                direction, guess = check(direction), check(guess)
+            if my_tables is None:
+                scored = direction != guess
+            else:
+                scored = rand() < my_tables[slot][min(round_num, horizon) - 1][codes[direction] * 3 + codes[guess]]
+            my_score += scored
+            if learn:
+                observe(my_shooter, opponent_keeper, direction, guess)
+            if log is not None:
+                log.append(game, round_num, 0, my_ids[slot],
+                           opponent_keeper_id, codes[direction], codes[guess], scored)
+            kicks += 1
+            lead = my_score - opponent_score
+            if early and (lead > remaining + 1 or -lead > remaining):
+                break
+
+            slot = (round_num - 1) % opponent_count
+            opponent = opponents[slot]
+            direction = opponent_shooter(round_num, opponent)
+            guess = my_keeper(round_num, opponent)
+            if check:
+                direction, guess = check(direction), check(guess)
+            if opponent_tables is None:
+                scored = direction != guess
+            else:
+                scored = rand() < opponent_tables[slot][min(round_num, horizon) - 1][codes[direction] * 3 + codes[guess]]
+            opponent_score += scored
+            if learn:
+                observe(opponent_shooter, my_keeper, direction, guess)
+            if log is not None:
+                log.append(game, round_num, 1, opponent_ids[slot],
+                           my_keeper_id, codes[direction], codes[guess], scored)
+            kicks += 1
+            lead = my_score - opponent_score
+            if lead and (round_num >= rounds or early and abs(lead) > remaining):
+                break
+
+        self.my_score, self.opponent_score, self.kicks = my_score, opponent_score, kicks
+        return my_score, opponent_score
+
+    def run_many(self, games: int, my_shooter: Strategy, opponent_keeper: Strategy,
+                 opponent_shooter: Strategy, my_keeper: Strategy) -> Dict[Tuple[int, int], int]:
+        """批量进行 games 场比赛，返回 {(我方得分, 对方得分): 场数} 的比分分布"""
+        scores: Counter = Counter()
+        play = self.play
+        for _ in range(games):
+            scores[play(my_shooter, opponent_keeper, opponent_shooter, my_keeper, record=False)] += 1
+        return dict(scores)
+
+
+def summarize(scores: Dict[Tuple[int, int], int]) -> Dict[str, int]:
+    """把比分分布汇总为胜/平/负场数 - 展示字典和lambda函数"""
+    outcome = lambda mine, theirs: "win" if mine > theirs else ("loss" if mine < theirs else "draw")
+    summary = {"win": 0, "draw": 0, "loss": 0}
+    for (mine, theirs), count in scores.items():
+        summary[outcome(mine, theirs)] += count
+    return summary
@@ -0,0 +1,270 @@
+"""
+点球大战精确解：对 (轮次, 我方得分, 对方得分) 状态做动态规划，
+得到完整的最终比分分布和胜/平/负概率，可作为蒙特卡洛模拟的基准答案
+展示：组合数据类型（字典、元组）、lambda函数、模块与包
+
+每次射门只有 3×3 种方向组合，先把双方策略和进球矩阵折算成每轮的进球概率，
+再按与 engine.ShootoutEngine.decided 相同的规则（提前结束、突然死亡）逐脚推进状态分布。
+突然死亡阶段与引擎一样按出场名单轮换射门（见 engine.round_row），每轮的进球概率以名单周期重复。
+结果按策略参数缓存，相同参数再次求解只需一次字典查找。
+"""
+import math
+import sys
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from engine import MAX_ROUNDS, round_row
+
+if TYPE_CHECKING:
+    from montecarlo import SimulationResult, StrategyMix
+
+UNIFORM: Tuple[float, float, float] = (1 / 3, 1 / 3, 1 / 3)
+
+# 基本规则：方向不同即进球
+BASIC_GOAL_MATRIX = tuple(tuple(float(d != g) for g in range(3)) for d in range(3))
+
+Score = Tuple[int, int]
+
+# 突然死亡阶段剩余平局概率低于此值时停止推进（远小于结果的浮点舍入误差）
+EPSILON = 1e-18
+
+
+class ExactResult(NamedTuple):
+    """精确求解结果 - 展示组合数据类型（命名元组）"""
+    # ((我方得分, 对方得分), 概率)，按比分排序；用元组保存以便安全地缓存共享
+    scores: Tuple[Tuple[Score, float], ...]
+    win: float
+    draw: float
+    loss: float
+    # 平均每场实际射门次数
+    kicks: float
+
+    def score_distribution(self) -> Dict[Score, float]:
+        """返回 {(我方得分, 对方得分): 概率}，与 SimulationResult.score_distribution 对应"""
+        return dict(self.scores)
+
+
+def _depth(values) -> int:
+    """嵌套层数：方向分布为 1，矩阵为 2，每轮一组时再加 1"""
+    depth = 0
+    while hasattr(values, "__len__"):
+        values = values[0]
+        depth += 1
+    return depth
+
+
+def _per_round(values, rounds: int, depth: int) -> Tuple:
+    """把单个分布/矩阵或每轮一个的序列规整为每轮一个的元组（可哈希，单个时只有一项）"""
+    if values is None:
+        return (None,)
+    freeze = (lambda v: tuple(map(tuple, v))) if depth == 2 else tuple
+    if _depth(values) == depth:
+        return (freeze(values),)
+    if len(values) < rounds:
+        raise ValueError(f"需要 1 个或至少 {rounds} 个轮次的数据，实际为 {len(values)}")
+    return tuple(map(freeze, values))
+
+
+def _goal_probability(shot: Sequence[float], dive: Sequence[float],
+                      matrix: Optional[Sequence[Sequence[float]]]) -> float:
+    """一次射门的进球概率：对 3×3 种方向组合加权求和"""
+    if any(p < 0 for p in shot) or any(p < 0 for p in dive) or \
+            abs(sum(shot) - 1) > 1e-9 or abs(sum(dive) - 1) > 1e-9:
+        raise ValueError("方向分布必须非负且概率之和为 1")
+    matrix = matrix or BASIC_GOAL_MATRIX
+    return sum(shot[d] * dive[g] * matrix[d][g] for d in range(3) for g in range(3))
+
+
+def _advance(states: Dict[Score, float], p: float, side: int) -> Dict[Score, float]:
+    """一方射门一次：每个状态以概率 p 进球、1-p 不进"""
+    nxt: Dict[Score, float] = {}
+    for (mine, theirs), prob in states.items():
+        scored = (mine + 1, theirs) if side == 0 else (mine, theirs + 1)
+        nxt[scored] = nxt.get(scored, 0.0) + prob * p
+        nxt[(mine, theirs)] = nxt.get((mine, theirs), 0.0) + prob * (1 - p)
+    return nxt
+
+
+def _sudden_death(tied: Dict[int, float], final: Dict[Score, float],
+                  cycle: Sequence[Tuple[float, float]], played: int) -> float:
+    """
+    突然死亡的闭式解（不计轮次上限），返回新增的期望射门次数
+
+    cycle 为一整轮名单周期中每轮双方的进球概率 (p, q)，此后按周期重复；played 为此前已进行的轮数。
+    先从 (s, s) 出发推进一个周期：第 t 轮前有 j 轮双方都进、本轮由我方胜出的概率记为 win[j]
+    （对方胜出为 loss[j]），整个周期后仍战平且有 j 轮双方都进的概率记为 cont[j]。
+    最终比分 (s+n+1, s+n) 的概率是级数 win(x) / (1 - cont(x)) 中 x^n 的系数，按递推
+    a[n] = (win[n] + Σ cont[i]·a[n-i]) / (1 - cont[0]) 求出；对方胜出同理。
+    周期数服从几何分布，期望射门次数同样是闭式。
+    仅在达到轮次上限的概率低于 EPSILON 时使用，与逐轮推进的结果在浮点精度内一致。
+    """
+    size = len(cycle)
+    win: List[float] = [0.0] * size
+    loss: List[float] = [0.0] * size
+    decisive: List[float] = []
+    states = [1.0]
+    for p, q in cycle:
+        decisive.append(sum(states) * (p * (1 - q) + (1 - p) * q))
+        for j, prob in enumerate(states):
+            win[j] += prob * p * (1 - q)
+            loss[j] += prob * (1 - p) * q
+        nxt = [prob * (1 - p) * (1 - q) for prob in states] + [0.0]
+        for j, prob in enumerate(states):
+            nxt[j + 1] += prob * p * q
+        states = nxt
+    cont, carry = states, sum(states)
+
+    # 级数系数：最近 size 项都低于 EPSILON 后，之后各项只会更小
+    series: Tuple[List[float], List[float]] = ([], [])
+    n = 0
+    while n < size or max(series[0][-size:] + series[1][-size:]) >= EPSILON:
+        for coefficients, first in zip(series, (win, loss)):
+            value = first[n] if n < size else 0.0
+            value += sum(cont[i] * coefficients[n - i] for i in range(1, min(n, size) + 1))
+            coefficients.append(value / (1 - cont[0]))
+        n += 1
+
+    # 在第 k 个周期的第 t 轮分出胜负的概率为 carry^k * decisive[t]
+    kicks_per_game = 2 * played + sum(
+        weight * (2 * (t + 1) / (1 - carry) + 2 * size * carry / (1 - carry) ** 2)
+        for t, weight in enumerate(decisive))
+    kicks = 0.0
+    for score, prob in tied.items():
+        for offset, (mine, theirs) in enumerate(zip(*series)):
+            final[(score + offset + 1, score + offset)] = \
+                final.get((score + offset + 1, score + offset), 0.0) + prob * mine
+            final[(score + offset, score + offset + 1)] = \
+                final.get((score + offset, score + offset + 1), 0.0) + prob * theirs
+        kicks += prob * kicks_per_game
+    return kicks
+
+
+@lru_cache(maxsize=1024)
+def _solve(my_goal: Tuple[float, ...], opp_goal: Tuple[float, ...], rounds: int,
+           early_stop: bool, sudden_death: bool, max_rounds: int, cycle: int = 1) -> ExactResult:
+    """
+    按每轮进球概率推进状态分布（结果缓存）；超出给定轮次后循环使用最后 cycle 轮的概率，
+    且最后 cycle 轮构成突然死亡的重复周期
+    """
+    limit = max_rounds if sudden_death else rounds
+    states: Dict[Score, float] = {(0, 0): 1.0}
+    final: Dict[Score, float] = {}
+    kicks = 0.0
+
+    def settle(decided, kick: int):
+        nonlocal kicks
+        for score in [score for score in states if decided(*score)]:
+            prob = states.pop(score)
+            final[score] = final.get(score, 0.0) + prob
+            kicks += prob * kick
+
+    for round_num in range(1, rounds + 1):
+        remaining = rounds - round_num
+        states = _advance(states, my_goal[round_num - 1], 0)
+        if early_stop:
+            settle(lambda a, b: a - b > remaining + 1 or b - a > remaining, 2 * round_num - 1)
+        states = _advance(states, opp_goal[round_num - 1], 1)
+        if round_num == rounds or early_stop:
+            settle(lambda a, b: a != b and abs(a - b) > remaining, 2 * round_num)
+
+    # 突然死亡：剩下的都是平局状态，只需按得分 s 跟踪 (s, s)；射门球员按名单轮换
+    tied = {mine: prob for (mine, _), prob in states.items()}
+    goals = lambda r: (my_goal[round_row(r, len(my_goal), cycle)], opp_goal[round_row(r, len(opp_goal), cycle)])
+    # 从 periodic 轮起每轮的进球概率以 cycle 为周期重复
+    periodic = max(rounds + 1, len(my_goal) - cycle + 1)
+    for round_num in range(rounds + 1, limit + 1):
+        if round_num == periodic:
+            period = [goals(r) for r in range(round_num, round_num + cycle)]
+            tie = math.prod(p * q + (1 - p) * (1 - q) for p, q in period)
+            if tie ** ((limit - round_num + 1) // cycle) < EPSILON:
+                kicks += _sudden_death(tied, final, period, round_num - 1)
+                tied = {}
+                break
+        p, q = goals(round_num)
+        both, neither = p * q, (1 - p) * (1 - q)
+        nxt: Dict[int, float] = {}
+        for score, prob in tied.items():
+            win, loss = prob * p * (1 - q), prob * (1 - p) * q
+            final[(score + 1, score)] = final.get((score + 1, score), 0.0) + win
+            final[(score, score + 1)] = final.get((score, score + 1), 0.0) + loss
+            kicks += (win + loss) * 2 * round_num
+            nxt[score + 1] = nxt.get(score + 1, 0.0) + prob * both
+            nxt[score] = nxt.get(score, 0.0) + prob * neither
+        tied = nxt
+    # 达到轮次上限仍战平的记为平局
+    for score, prob in tied.items():
+        final[(score, score)] = final.get((score, score), 0.0) + prob
+        kicks += prob * 2 * limit
+
+    scores = tuple(sorted(final.items()))
+    return ExactResult(
+        scores=scores,
+        win=sum(prob for (a, b), prob in scores if a > b),
+        draw=sum(prob for (a, b), prob in scores if a == b),
+        loss=sum(prob for (a, b), prob in scores if a < b),
+        kicks=kicks,
+    )
+
+
+def solve(me: Optional["StrategyMix"] = None, opponent: Optional["StrategyMix"] = None,
+          rounds: int = 5, my_goal_matrix=None, opponent_goal_matrix=None,
+          early_stop: bool = True, sudden_death: bool = True,
+          max_rounds: int = MAX_ROUNDS,
+          my_cycle: int = 1, opponent_cycle: int = 1) -> ExactResult:
+    """
+    精确求解一场点球大战的比分分布，参数含义与 montecarlo.simulate 相同
+
+    me/opponent 为带 shot/dive 方向分布的策略（如 montecarlo.StrategyMix），省略时均匀随机；
+    分布可以是 3 个概率或每轮一组，进球矩阵可以是 3×3 或 轮次×3×3（至少覆盖常规轮次）。
+    超出给定轮次后循环使用最后 my_cycle / opponent_cycle 轮，取双方出场人数即与引擎一致。
+    """
+    if rounds <= 0:
+        raise ValueError("轮次必须为正数")
+    if max_rounds < rounds:
+        raise ValueError(f"轮次上限 {max_rounds} 不能小于常规轮次 {rounds}")
+    if my_cycle <= 0 or opponent_cycle <= 0:
+        raise ValueError("轮换周期必须为正数")
+    my_shot = _per_round(me.shot if me else UNIFORM, rounds, 1)
+    my_dive = _per_round(me.dive if me else UNIFORM, rounds, 1)
+    opp_shot = _per_round(opponent.shot if opponent else UNIFORM, rounds, 1)
+    opp_dive = _per_round(opponent.dive if opponent else UNIFORM, rounds, 1)
+    my_matrix = _per_round(my_goal_matrix, rounds, 2)
+    opp_matrix = _per_round(opponent_goal_matrix, rounds, 2)
+
+    # 双方各按本方周期取每轮的数据，一直算到两边共同的周期（最小公倍数）完整出现一次为止
+    cycle = math.lcm(my_cycle, opponent_cycle)
+    length = max(rounds, *map(len, (my_shot, my_dive, opp_shot, opp_dive, my_matrix, opp_matrix))) + cycle
+    at = lambda values, round_num, period: values[round_row(round_num, len(values), period)]
+    my_goal = tuple(_goal_probability(at(my_shot, r, my_cycle), at(opp_dive, r, my_cycle),
+                                      at(my_matrix, r, my_cycle)) for r in range(1, length + 1))
+    opp_goal = tuple(_goal_probability(at(opp_shot, r, opponent_cycle), at(my_dive, r, opponent_cycle),
+                                       at(opp_matrix, r, opponent_cycle)) for r in range(1, length + 1))
+    return _solve(my_goal, opp_goal, rounds, early_stop, sudden_death, max_rounds, cycle)
+
+
+def max_deviation(simulation: "SimulationResult", exact: ExactResult) -> float:
+    """蒙特卡洛结果与精确解之间各比分概率的最大绝对误差"""
+    simulated = simulation.score_distribution()
+    expected = exact.score_distribution()
+    return max(abs(simulated.get(score, 0.0) - expected.get(score, 0.0))
+               for score in simulated.keys() | expected.keys())
+
+
+def main(games: int = 1_000_000, seed: int = 0):
+    """用精确解校验蒙特卡洛模拟：python exact.py [场数] [种子]"""
+    import time
+    from montecarlo import simulate
+
+    start = time.perf_counter()
+    exact = solve()
+    elapsed = time.perf_counter() - start
+    simulation = simulate(games, seed=seed)
+    print(f"精确解: 胜 {exact.win:.4%} 平 {exact.draw:.4%} 负 {exact.loss:.4%} "
+          f"平均射门 {exact.kicks:.3f} 次 (用时 {elapsed * 1000:.2f} 毫秒)")
+    print(f"模拟值: 胜 {simulation.win:.4%} 平 {simulation.draw:.4%} 负 {simulation.loss:.4%} "
+          f"平均射门 {simulation.kicks:.3f} 次 ({games:,} 场)")
+    print(f"比分概率最大误差: {max_deviation(simulation, exact):.5f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
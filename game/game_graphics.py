@@ -1,333 +1,524 @@
 """
 Turtle图形显示模块：显示球场、球门、守门员和比赛过程
 展示：面向对象编程
+
+所有动画和提示消息都由 screen.ontimer 驱动的固定帧率调度器推进，
+等待期间 Tk 事件循环持续运行，窗口不会因 sleep 而失去响应。
+场景几何来自 scene 模块的数据。静态球场只在创建窗口和改变大小时整体删除重建；
+守门员、足球和文字都是常驻的画布图元，每帧只把变化图层的 coords / itemconfigure 命令
+拼成一段 Tcl 脚本，一次调用提交到画布，而不是逐条 create_line / turtle 移动各走一次 Tcl 往返。
 """
-import turtle
+import math
+import re
 import time
+import tkinter as tk
+import turtle
+from collections import deque
+
+from pacing import DELAYS, pacing_speed
+from scene import (BALL_RADIUS, FIELD, FIELD_COLOR, FONT_SIZES, HEIGHT, KEEPER_POSES, MESSAGE_POS,
+                   RESULT_POS, ROUND_POS, SCORE_LINE_GAP, SCORE_POS, WIDTH, dive_pose, goal_lines,
+                   keeper_x, place, shot_path, shot_target)
+from utils.timing import NULL_TIMER
+
+# 每帧预算（毫秒），约 60 帧/秒
+FRAME_MS = 16
+# 窗口大小停止变化这么多毫秒后才重新布局，拖动窗口边缘时不逐个事件重画
+RESIZE_DEBOUNCE_MS = 120
+# 按画布尺寸缓存的静态图层数量
+STATIC_CACHE_SIZE = 8
+# 画布的最小尺寸
+MIN_CANVAS = (480, 280)
+# 字号按 96 DPI 下的像素换算后随视口缩放（用负数字号指定像素，不受系统 DPI 设置影响）
+POINT_PX = 96 / 72
+
+# Tcl 双引号字符串中需要转义的字符
+_TCL_SPECIAL = re.compile(r'([\\"\[\]$])')
+
+
+def _tcl_string(text):
+    """把任意文本转为 Tcl 双引号字符串（用于拼接批量提交的脚本）"""
+    return '"' + _TCL_SPECIAL.sub(r"\\\1", text).replace("\n", "\\n") + '"'
+
+
+def _coords(points, scale=1.0):
+    """世界坐标（y 轴向上）-> 画布坐标（原点在中心，y 轴向下，按视口缩放）的 Tcl 参数"""
+    return " ".join(f"{x * scale:.1f} {-y * scale:.1f}" for x, y in points)
+
+
+def initial_scale(screen_width, screen_height):
+    """
+    初始视口缩放：放不下 1200×700 的小屏幕按比例缩小，
+    能放下两倍以上的高分辨率屏幕按整数倍放大，其他情况保持原始大小
+    """
+    fit = min(0.9 * screen_width / WIDTH, 0.8 * screen_height / HEIGHT)
+    return fit if fit < 1 else float(math.floor(fit))
+
 
 class GameGraphics:
-    def __init__(self):
-        self.screen = turtle.Screen()
-        self.screen.setup(width=1200, height=700)
-        self.screen.bgcolor("#2d8659")  # 绿色草坪
-        self.screen.title("点球大战")
-        self.screen.tracer(0)  # 关闭自动刷新，手动控制
-        
-        # 创建画笔
-        self.pen = turtle.Turtle()
-        self.pen.hideturtle()
-        self.pen.speed(0)
+    def __init__(self, root=None, timer=None):
+        # 与球员选择界面共用同一个长期存在的 Tk 根窗口，画布和输入面板都放在其中
+        self.root = root if root is not None else tk.Tk()
+        self.root.title("点球大战")
+        self.root.geometry("")  # 按画布和输入面板的大小重新布局
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
-        # 创建文字显示画笔（用于临时消息）
-        self.text_pen = turtle.Turtle()
-        self.text_pen.hideturtle()
-        self.text_pen.speed(0)
+        # 输入面板在底部，画布占据其余空间；窗口可以自由调整大小
+        self._create_input_panel()
+        # 视口：世界坐标（1200×700）等比缩放 view_scale 倍后居中显示在画布上
+        self.view_scale = initial_scale(self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        self.view_size = (round(WIDTH * self.view_scale), round(HEIGHT * self.view_scale))
+        self.canvas = tk.Canvas(self.root, width=self.view_size[0], height=self.view_size[1],
+                                highlightthickness=0)
+        self.canvas.pack(side="top", fill="both", expand=True)
+        self.root.minsize(*MIN_CANVAS)
         
-        # 创建比分显示画笔（专门用于比分，不会与其他文字混淆）
-        self.score_pen = turtle.Turtle()
-        self.score_pen.hideturtle()
-        self.score_pen.speed(0)
+        self.screen = turtle.TurtleScreen(self.canvas)
+        self.screen.bgcolor(FIELD_COLOR)  # 绿色草坪
+        self.screen.tracer(0)  # 关闭自动刷新，手动控制
+        self._center_origin(*self.view_size)
         
-        # 创建守门员画笔
-        self.gk_pen = turtle.Turtle()
-        self.gk_pen.hideturtle()
-        self.gk_pen.speed(0)
+        # 静态球场直接画在画布上（带 "static" 标签，只在创建和改变窗口大小时重画）；
+        # 每种画布尺寸的图元参数缓存下来，窗口在几种尺寸间切换时不再重新计算
+        self._static_drawn = False
+        self._static_lines = list(FIELD)
+        self._static_cache = {}
+        self._resize_job = None
         
         # 比分
         self.my_score = 0
         self.opponent_score = 0
         self.current_round = 1
         
-        # 绘制初始画面
-        self.draw_field()
+        # 画面状态：守门员 (x, y, side, pose)、足球位置、提示消息和最终结果，为 None 时不显示
+        self.keeper_state = None
+        self.ball_position = None
+        self.message = None
+        self.result_text = None
         
-    def draw_field(self):
-        """绘制球场"""
-        self.pen.color("white")
-        self.pen.width(3)
+        # 动态图层：标记为脏的图层在下一帧重绘一次 - 展示组合数据类型（字典、集合）
+        # 图层名同时是其画布图元的标签
+        self._layer_painters = {
+            "score": self._paint_score,
+            "round": self._paint_round,
+            "keeper": self._paint_keeper,
+            "ball": self._paint_ball,
+            "message": self._paint_message,
+            "result": self._paint_result,
+        }
+        self._dirty_layers = set()
         
-        # 中间线
-        self.pen.up()
-        self.pen.goto(0, -350)
-        self.pen.down()
-        self.pen.goto(0, 350)
+        # 每帧画布工作量统计：帧数、实际刷新次数、图层重绘次数、批量提交（Tcl 调用）次数、创建的图元数
+        self.frame_stats = {"frames": 0, "updates": 0, "layer_paints": 0, "submits": 0, "items": 0}
         
-        # 绘制左侧球门
-        self.draw_goal(-550, 0, "left")
+        # 播放速度倍数：所有等待、动画和提示时长都除以它；为无穷大时瞬时完成（见 set_pacing）
+        self.speed = 1.0
         
-        # 绘制右侧球门
-        self.draw_goal(550, 0, "right")
+        # 可选的分阶段计时器（utils.timing.PhaseTimer）：记录等待输入、动画、提示等待和画布刷新的用时
+        self.timer = timer or NULL_TIMER
         
-        # 绘制初始比分和轮次
-        self.update_score()
-        self.update_round_display()
+        # 帧调度器状态：进行中的动画和等待显示的提示消息队列
+        self.frame_ms = FRAME_MS
+        self._animations = []
+        self._overlays = deque()
+        self._overlay_until = None
+        self._overlay_done = None
+        self._dirty = False
+        self._running = True
+        self._next_frame = time.perf_counter()
         
-        self.screen.update()
-    
-    def draw_goal(self, x, y, side):
-        """绘制球门"""
-        self.pen.color("white")
-        self.pen.width(4)
+        # 正在等待的标志变量，关闭窗口时统一唤醒
+        self._waiting = set()
         
-        # 球门尺寸
-        goal_width = 120
-        goal_height = 80
-        goal_depth = 40
+        # 在画布上绑定 L/C/R 按键，Esc 放弃本次输入
+        for direction in ("L", "C", "R"):
+            for key in (direction, direction.lower()):
+                self.screen.onkeypress(lambda d=direction: self._choose(d), key)
+        self.screen.onkeypress(lambda: self._choose("cancel"), "Escape")
+        self.screen.listen()
         
-        self.pen.up()
+        # 窗口大小变化时（去抖后）更新视口
+        self.canvas.bind("<Configure>", self._on_configure)
         
-        if side == "left":
-            # 左侧球门（从左侧看）
-            # 前门柱
-            self.pen.goto(x, y - goal_height/2)
-            self.pen.down()
-            self.pen.goto(x, y + goal_height/2)
-            
-            # 横梁
-            self.pen.goto(x + goal_depth, y + goal_height/2)
-            
-            # 后门柱
-            self.pen.goto(x + goal_depth, y - goal_height/2)
-            
-            # 底线
-            self.pen.goto(x, y - goal_height/2)
-            
-            # 球网线
-            self.pen.color("#cccccc")
-            self.pen.width(1)
-            for i in range(5):
-                self.pen.up()
-                self.pen.goto(x, y - goal_height/2 + (i+1) * goal_height/6)
-                self.pen.down()
-                self.pen.goto(x + goal_depth, y - goal_height/2 + (i+1) * goal_height/6)
-        else:
-            # 右侧球门（从右侧看）
-            # 前门柱
-            self.pen.goto(x, y - goal_height/2)
-            self.pen.down()
-            self.pen.goto(x, y + goal_height/2)
-            
-            # 横梁
-            self.pen.goto(x - goal_depth, y + goal_height/2)
-            
-            # 后门柱
-            self.pen.goto(x - goal_depth, y - goal_height/2)
-            
-            # 底线
-            self.pen.goto(x, y - goal_height/2)
-            
-            # 球网线
-            self.pen.color("#cccccc")
-            self.pen.width(1)
-            for i in range(5):
-                self.pen.up()
-                self.pen.goto(x, y - goal_height/2 + (i+1) * goal_height/6)
-                self.pen.down()
-                self.pen.goto(x - goal_depth, y - goal_height/2 + (i+1) * goal_height/6)
+        # 绘制初始画面
+        self._create_sprites()
+        self.draw_field()
+        self.screen.ontimer(self._tick, self.frame_ms)
+    
+    def _create_input_panel(self):
+        """底部的方向输入面板：提示文字 + L/C/R 按钮"""
+        panel = tk.Frame(self.root, bg="#1e5c3d")
+        panel.pack(side="bottom", fill="x")
+        
+        self.prompt_label = tk.Label(
+            panel, text="", font=("Arial", 14, "bold"),
+            bg="#1e5c3d", fg="white", anchor="w", justify="left"
+        )
+        self.prompt_label.pack(side="left", padx=20, pady=8, fill="x", expand=True)
+        
+        # 按钮 - 使用lambda函数绑定方向
+        self.direction_buttons = []
+        for direction, text in (("L", "L - 左侧"), ("C", "C - 中间"), ("R", "R - 右侧")):
+            button = tk.Button(
+                panel, text=text, width=10, state="disabled",
+                font=("Arial", 12, "bold"),
+                command=lambda d=direction: self._choose(d)
+            )
+            button.pack(side="left", padx=5, pady=8)
+            self.direction_buttons.append(button)
         
-        self.pen.up()
+        self._choice = tk.StringVar(master=self.root, value="")
+        self._awaiting_input = False
     
-    def draw_goalkeeper(self, x, y, side):
-        """绘制守门员小人"""
-        self.gk_pen.clear()
-        self.gk_pen.color("yellow")
-        self.gk_pen.width(3)
+    def _choose(self, direction):
+        """按钮或按键选择方向"""
+        if self._awaiting_input:
+            self._choice.set(direction)
+    
+    def ask_direction(self, prompt):
+        """在输入面板上等待玩家选择方向，返回 "L"/"C"/"R"；放弃或窗口关闭时返回None"""
+        if not self._running:
+            return None
+        self.prompt_label.config(text=prompt)
+        for button in self.direction_buttons:
+            button.config(state="normal")
+        self._choice.set("")
+        self._awaiting_input = True
+        self.screen.listen()
+        try:
+            with self.timer.phase("input"):
+                self._wait_for(self._choice)
+        finally:
+            self._awaiting_input = False
+            if self._running:
+                self.prompt_label.config(text="")
+                for button in self.direction_buttons:
+                    button.config(state="disabled")
         
-        if side == "left":
-            # 左侧守门员
-            self.gk_pen.up()
-            self.gk_pen.goto(x + 60, y)
-            
-            # 头部（圆形）
-            self.gk_pen.down()
-            self.gk_pen.circle(8)
-            
-            # 身体
-            self.gk_pen.up()
-            self.gk_pen.goto(x + 60, y - 8)
-            self.gk_pen.down()
-            self.gk_pen.goto(x + 60, y - 25)
-            
-            # 左臂
-            self.gk_pen.up()
-            self.gk_pen.goto(x + 60, y - 15)
-            self.gk_pen.down()
-            self.gk_pen.goto(x + 50, y - 20)
-            
-            # 右臂
-            self.gk_pen.up()
-            self.gk_pen.goto(x + 60, y - 15)
-            self.gk_pen.down()
-            self.gk_pen.goto(x + 70, y - 20)
-            
-            # 左腿
-            self.gk_pen.up()
-            self.gk_pen.goto(x + 60, y - 25)
-            self.gk_pen.down()
-            self.gk_pen.goto(x + 55, y - 35)
-            
-            # 右腿
-            self.gk_pen.up()
-            self.gk_pen.goto(x + 60, y - 25)
-            self.gk_pen.down()
-            self.gk_pen.goto(x + 65, y - 35)
-            
-        else:
-            # 右侧守门员
-            self.gk_pen.up()
-            self.gk_pen.goto(x - 60, y)
-            
-            # 头部（圆形）
-            self.gk_pen.down()
-            self.gk_pen.circle(8)
-            
-            # 身体
-            self.gk_pen.up()
-            self.gk_pen.goto(x - 60, y - 8)
-            self.gk_pen.down()
-            self.gk_pen.goto(x - 60, y - 25)
-            
-            # 左臂
-            self.gk_pen.up()
-            self.gk_pen.goto(x - 60, y - 15)
-            self.gk_pen.down()
-            self.gk_pen.goto(x - 70, y - 20)
+        direction = self._choice.get()
+        if not self._running or direction == "cancel":
+            return None
+        return direction
+    
+    def set_pacing(self, name):
+        """选择节奏档位（pacing.PACING 中的 normal/fast/instant）"""
+        self.speed = pacing_speed(name)
+    
+    @property
+    def is_open(self):
+        """窗口是否仍然打开"""
+        return self._running
+    
+    def _center_origin(self, width, height):
+        """让世界坐标原点始终位于画布中心"""
+        self.canvas.config(scrollregion=(-width / 2, -height / 2, width / 2, height / 2))
+    
+    def _on_configure(self, event):
+        """画布大小变化：取消尚未执行的重新布局，等大小稳定后再执行"""
+        if self._resize_job is not None:
+            self.root.after_cancel(self._resize_job)
+        self._resize_job = self.root.after(RESIZE_DEBOUNCE_MS, self._apply_resize, event.width, event.height)
+    
+    def _apply_resize(self, width, height):
+        self._resize_job = None
+        if self._running:
+            self.resize(width, height)
+    
+    def resize(self, width, height):
+        """按新的画布大小更新视口，重画静态图层（按尺寸缓存）并在下一帧重绘所有动态图层"""
+        if (width, height) == self.view_size:
+            return
+        self.view_size = (width, height)
+        self.view_scale = min(width / WIDTH, height / HEIGHT)
+        self._center_origin(width, height)
+        self._static_drawn = False
+        self._create_sprites()
+        self.draw_field()
+        for layer in self._layer_painters:
+            self.invalidate(layer)
+    
+    def _on_close(self):
+        """关闭窗口：停止帧循环，唤醒所有等待，再销毁根窗口"""
+        self._running = False
+        if self._resize_job is not None:
+            self.root.after_cancel(self._resize_job)
+        for flag in list(self._waiting):
+            flag.set(1)
+        self.root.destroy()
+    
+    def _eval(self, script):
+        """把一组画布命令（不含画布名，如 "coords ball ..."）拼成一段 Tcl 脚本一次提交"""
+        canvas = self.canvas._w
+        self.canvas.tk.eval("\n".join(f"{canvas} {command}" for command in script))
+        self.frame_stats["submits"] += 1
+    
+    def _submit(self, layer, commands, replace=True):
+        """
+        一次 Tcl 调用提交一个图层：replace 为 True 时先删除该图层的旧图元，
+        再创建 commands 中的全部图元（每条为 "line ..."、"text ..." 等 create 参数）
+        """
+        script = [f"delete {layer}"] if replace else []
+        script.extend(f"create {command} -tags {layer}" for command in commands)
+        self._eval(script)
+        self.frame_stats["items"] += len(commands)
+    
+    def _create_sprites(self):
+        """
+        精灵池：每个守门员姿势一组线段图元（标签 keeper、keeper_姿势、keeper_姿势_序号）、一个足球，
+        以及比分、轮次、提示消息和最终结果的文字图元。创建时隐藏或为空，之后每帧只更新坐标、
+        文字和显示状态，不再删除重建；线宽和字号随视口缩放，改变窗口大小时重建
+        """
+        x, y = SCORE_POS
+        texts = {
+            "score_me": ((x, y), FONT_SIZES["score"], "white", "sw"),
+            "score_opponent": ((x, y - SCORE_LINE_GAP), FONT_SIZES["score"], "white", "sw"),
+            "round": (ROUND_POS, FONT_SIZES["round"], "white", "s"),
+            "message": (MESSAGE_POS, FONT_SIZES["message"], "yellow", "s"),
+            "result": (RESULT_POS, FONT_SIZES["result"], "yellow", "s"),
+        }
+        script = ["delete sprite"]
+        for pose, polylines in KEEPER_POSES.items():
+            script.extend(f"create {line} -state hidden -tags {{sprite keeper keeper_{pose} keeper_{pose}_{index}}}"
+                          for index, line in enumerate(self._lines(polylines)))
+        script.append("create oval 0 0 0 0 -fill white -outline white -state hidden -tags {sprite ball}")
+        script.extend(f"create {self._text(position, '', size, color, anchor)} -tags {{sprite {tag}}}"
+                      for tag, (position, size, color, anchor) in texts.items())
+        self._eval(script)
+        self.frame_stats["items"] += len(script) - 1
+    
+    def _lines(self, polylines):
+        """折线 -> 按当前视口缩放的 create line 参数"""
+        scale = self.view_scale
+        return [
+            f"line {_coords(polyline.points, scale)} -fill {polyline.color} "
+            f"-width {max(1.0, polyline.width * scale):.1f} -capstyle round -joinstyle round"
+            for polyline in polylines
+        ]
+    
+    def _text(self, position, text, size, color="white", anchor="s"):
+        """文字 -> create text 参数；与 turtle.write 相同，文字底边对齐到 position，字号随视口缩放"""
+        x, y = position
+        scale = self.view_scale
+        pixels = max(6, round(size * POINT_PX * scale))
+        return (f"text {(x - 1) * scale:.1f} {-y * scale:.1f} -text {_tcl_string(text)} -fill {color} "
+                f"-anchor {anchor} -font {{Arial -{pixels} bold}}")
+    
+    def invalidate(self, layer):
+        """标记动态图层需要在下一帧重绘"""
+        self._dirty_layers.add(layer)
+    
+    def canvas_item_count(self):
+        """当前画布上的图元数量，用于观察长时间运行时的画布负担"""
+        return len(self.canvas.find_all())
+    
+    def _tick(self):
+        """每帧推进动画与提示消息，只在画面有变化时刷新，并按帧预算安排下一帧"""
+        if not self._running:
+            return
+        now = time.perf_counter()
+        self.frame_stats["frames"] += 1
+        try:
+            # 推进动画：step(进度 0~1)，完成后通知等待者
+            for animation in list(self._animations):
+                start, duration, step, done = animation
+                progress = 1.0 if duration <= 0 else min(1.0, (now - start) / duration)
+                step(progress)
+                self._dirty = True
+                if progress >= 1.0:
+                    self._animations.remove(animation)
+                    done.set(True)
             
-            # 右臂
-            self.gk_pen.up()
-            self.gk_pen.goto(x - 60, y - 15)
-            self.gk_pen.down()
-            self.gk_pen.goto(x - 50, y - 20)
+            # 当前消息到期后清除，并显示队列中的下一条
+            if self._overlay_until is not None and now >= self._overlay_until:
+                self.message = None
+                self.invalidate("message")
+                self._overlay_until = None
+                self._overlay_done.set(True)
+            if self._overlay_until is None and self._overlays:
+                message, duration, done = self._overlays.popleft()
+                self.message = message
+                self.invalidate("message")
+                self._overlay_until = now + duration
+                self._overlay_done = done
             
-            # 左腿
-            self.gk_pen.up()
-            self.gk_pen.goto(x - 60, y - 25)
-            self.gk_pen.down()
-            self.gk_pen.goto(x - 65, y - 35)
+            self._flush()
             
-            # 右腿
-            self.gk_pen.up()
-            self.gk_pen.goto(x - 60, y - 25)
-            self.gk_pen.down()
-            self.gk_pen.goto(x - 55, y - 35)
-        
-        self.screen.update()
+            # 固定帧预算：按计划时刻排下一帧，扣除本帧耗时；落后太多则重新对齐
+            self._next_frame += self.frame_ms / 1000
+            delay = self._next_frame - time.perf_counter()
+            if delay < 0:
+                self._next_frame = time.perf_counter()
+                delay = 0
+            self.screen.ontimer(self._tick, max(1, int(delay * 1000)))
+        except (tk.TclError, turtle.Terminator):
+            # 窗口已关闭
+            self._running = False
     
-    def update_score(self):
-        """更新比分显示 - 在左上角显示两行比分，每次射门后更新"""
-        # 清除之前的比分显示
-        self.score_pen.clear()
-        self.score_pen.color("white")
-        self.score_pen.up()
-        
-        # 设置左上角位置（屏幕宽度1200，高度700，左上角约在-550, 330）
-        score_x = -550
-        score_y = 330
-        
-        # 显示我方比分（第一行）
-        self.score_pen.goto(score_x, score_y)
-        self.score_pen.write(
-            f"我方: {self.my_score}", 
-            align="left", 
-            font=("Arial", 20, "bold")
-        )
+    def _flush(self):
+        """重绘发生变化的动态图层，画面有变化时刷新一次（窗口关闭后画布已销毁，不再绘制）"""
+        if not self._running or not (self._dirty_layers or self._dirty):
+            return
+        with self.timer.phase("canvas"):
+            if self._dirty_layers:
+                # 所有变化图层的命令合并为一段脚本，每帧只有一次 Tcl 调用
+                script = []
+                for layer in self._dirty_layers:
+                    script.extend(self._layer_painters[layer]())
+                self._eval(script)
+                self.frame_stats["layer_paints"] += len(self._dirty_layers)
+                self._dirty_layers.clear()
+            self.screen.update()
+            self.frame_stats["updates"] += 1
+            self._dirty = False
+    
+    def _wait_for(self, flag):
+        """运行 Tk 事件循环直到 flag 被置位（期间窗口保持响应）"""
+        if self._running and not flag.get():
+            self._waiting.add(flag)
+            try:
+                self.root.wait_variable(flag)
+            finally:
+                self._waiting.discard(flag)
+    
+    def wait(self, duration):
+        """非阻塞式等待：期间继续处理重绘和输入事件，替代 time.sleep"""
+        duration /= self.speed
+        if not self._running:
+            return
+        if duration <= 0:
+            # 瞬时档位下帧循环没有机会运行：直接刷新画面（同时处理窗口事件）
+            self._flush()
+            return
+        done = tk.BooleanVar(master=self.root, value=False)
+        self.root.after(int(duration * 1000), done.set, True)
+        with self.timer.phase("sleep"):
+            self._wait_for(done)
+    
+    def animate(self, duration, step, block=True):
+        """注册一个动画：每帧以进度(0~1)调用 step，block 为 True 时等待动画结束"""
+        duration /= self.speed
+        if not self._running or duration <= 0:
+            step(1.0)
+            self._dirty = True
+            return None
+        done = tk.BooleanVar(master=self.root, value=False)
+        self._animations.append((time.perf_counter(), duration, step, done))
+        if block:
+            with self.timer.phase("animation"):
+                self._wait_for(done)
+        return done
         
-        # 显示对方比分（第二行，向下偏移30像素）
-        self.score_pen.goto(score_x, score_y - 30)
-        self.score_pen.write(
-            f"对方: {self.opponent_score}", 
-            align="left", 
-            font=("Arial", 20, "bold")
-        )
+    def draw_field(self):
+        """绘制球场（静态图层只创建一次，中线和两个球门一次提交）"""
+        if not self._static_drawn:
+            commands = self._static_cache.pop(self.view_size, None) or self._lines(self._static_lines)
+            # 最近使用的尺寸放在最后，超出容量时丢弃最早的
+            self._static_cache[self.view_size] = commands
+            if len(self._static_cache) > STATIC_CACHE_SIZE:
+                del self._static_cache[next(iter(self._static_cache))]
+            self._submit("static", commands)
+            self.canvas.tag_lower("static")
+            self._static_drawn = True
         
-        self.screen.update()
+        # 绘制初始比分和轮次
+        self.update_score()
+        self.update_round_display()
+    
+    def draw_goal(self, x, y, side):
+        """在 (x, y) 处绘制位于 side 侧的球门（静态图层，一次提交；改变窗口大小后仍会保留）"""
+        lines = goal_lines(x, y, side)
+        self._static_lines.extend(lines)
+        self._static_cache.clear()
+        self._submit("static", self._lines(lines), replace=False)
+    
+    def draw_goalkeeper(self, x, y, side, pose="stand"):
+        """在 (x, y) 处的球门前以指定姿势显示守门员，下一帧重绘守门员图层"""
+        self.keeper_state = (x, y, side, pose)
+        self.invalidate("keeper")
+    
+    def _paint_keeper(self):
+        """移动当前姿势的守门员精灵并只显示它（池中的图元只更新坐标，不重新创建）；返回画布命令"""
+        script = ["itemconfigure keeper -state hidden"]
+        if self.keeper_state is not None:
+            x, y, side, pose = self.keeper_state
+            for index, polyline in enumerate(place(KEEPER_POSES[pose], keeper_x(x, side), y)):
+                script.append(f"coords keeper_{pose}_{index} {_coords(polyline.points, self.view_scale)}")
+            script.append(f"itemconfigure keeper_{pose} -state normal")
+        return script
+    
+    def _paint_ball(self):
+        """移动足球精灵；没有足球时隐藏"""
+        if self.ball_position is None:
+            return ["itemconfigure ball -state hidden"]
+        x, y = self.ball_position
+        r = BALL_RADIUS
+        corners = _coords(((x - r, y + r), (x + r, y - r)), self.view_scale)
+        return [f"coords ball {corners}", "itemconfigure ball -state normal"]
+    
+    def update_score(self):
+        """更新比分显示 - 每次射门后调用，下一帧重绘比分图层"""
+        self.invalidate("score")
+    
+    def _paint_score(self):
+        """在左上角显示两行比分"""
+        return [f"itemconfigure score_me -text {_tcl_string(f'我方: {self.my_score}')}",
+                f"itemconfigure score_opponent -text {_tcl_string(f'对方: {self.opponent_score}')}"]
     
     def update_round_display(self):
-        """更新轮次显示 - 在顶部中间显示当前轮次"""
-        # 清除之前的轮次显示
-        self.text_pen.color("white")
-        self.text_pen.up()
-        
-        # 在顶部中间显示轮次
-        self.text_pen.goto(0, 300)
-        # 用背景色覆盖旧内容
-        self.text_pen.color("#2d8659")
-        self.text_pen.write(" " * 30, align="center", font=("Arial", 20, "bold"))
-        self.text_pen.color("white")
-        self.text_pen.write(
-            f"第 {self.current_round} 轮", 
-            align="center", 
-            font=("Arial", 20, "bold")
-        )
+        """更新轮次显示 - 下一帧重绘轮次图层"""
+        self.invalidate("round")
+    
+    def _paint_round(self):
+        """在顶部中间显示当前轮次"""
+        return [f"itemconfigure round -text {_tcl_string(f'第 {self.current_round} 轮')}"]
+    
+    def _paint_message(self):
+        """在底部显示当前提示消息"""
+        return [f"itemconfigure message -text {_tcl_string(self.message or '')}"]
+    
+    def _paint_result(self):
+        """在中间显示最终结果"""
+        return [f"itemconfigure result -text {_tcl_string(self.result_text or '')}"]
+    
+    def show_message(self, message, duration=1.5, block=True):
+        """把消息加入提示队列，显示 duration 秒；block 为 True 时等待其显示完毕"""
+        duration /= self.speed
+        # 瞬时播放时不显示转瞬即逝的提示
+        if not self._running or duration <= 0:
+            return None
+        done = tk.BooleanVar(master=self.root, value=False)
+        self._overlays.append((message, duration, done))
+        if block:
+            with self.timer.phase("sleep"):
+                self._wait_for(done)
+        return done
+    
+    def animate_shot(self, side, direction, is_goal, keeper_guess=None):
+        """动画显示射门：足球沿插值轨迹逐帧飞向对面球门（两侧共用同一套几何数据）"""
+        start_x, goal_x, goal_side = shot_path(side)
+        target_y = shot_target(goal_side, direction)
         
-        self.screen.update()
-    
-    def show_message(self, message, duration=1.5):
-        """显示消息"""
-        self.text_pen.color("yellow")
-        self.text_pen.up()
-        self.text_pen.goto(0, -280)
-        self.text_pen.write(message, align="center", font=("Arial", 18, "bold"))
-        self.screen.update()
-        time.sleep(duration)
-        self.text_pen.clear()
-        self.screen.update()
-    
-    def animate_shot(self, side, direction, is_goal):
-        """动画显示射门"""
-        ball = turtle.Turtle()
-        ball.shape("circle")
-        ball.color("white")
-        ball.shapesize(0.5)
-        ball.speed(3)
+        # 守门员按扑救方向摆出扑救姿势
+        if keeper_guess is not None:
+            self.draw_goalkeeper(goal_x, 0, goal_side, dive_pose(goal_side, keeper_guess))
         
-        if side == "left":
-            # 从左向右射
-            start_x = -400
-            goal_x = 550
-            ball.up()
-            ball.goto(start_x, 0)
-            ball.showturtle()
-            
-            # 根据方向调整角度
-            if direction == "L":
-                target_y = -30
-            elif direction == "R":
-                target_y = 30
-            else:  # C
-                target_y = 0
-            
-            # 移动到球门
-            ball.goto(goal_x, target_y)
-            
-        else:
-            # 从右向左射
-            start_x = 400
-            goal_x = -550
-            ball.up()
-            ball.goto(start_x, 0)
-            ball.showturtle()
-            
-            # 根据方向调整角度
-            if direction == "L":
-                target_y = 30
-            elif direction == "R":
-                target_y = -30
-            else:  # C
-                target_y = 0
-            
-            # 移动到球门
-            ball.goto(goal_x, target_y)
+        def fly(progress):
+            # 缓出插值：先快后慢，更接近真实的射门轨迹
+            eased = 1 - (1 - progress) ** 2
+            self.ball_position = (start_x + (goal_x - start_x) * eased, target_y * eased)
+            self.invalidate("ball")
         
-        time.sleep(0.5)
-        ball.hideturtle()
-        ball.clear()
+        self.ball_position = (start_x, 0)
+        self.invalidate("ball")
+        self.animate(DELAYS["flight"], fly)
+        self.ball_position = None
+        self.invalidate("ball")
         
         # 显示结果
         if is_goal:
-            self.show_message("⚽ 进球！", 1.5)
+            self.show_message("⚽ 进球！", DELAYS["result"])
         else:
-            self.show_message("❌ 被扑出！", 1.5)
+            self.show_message("❌ 被扑出！", DELAYS["result"])
     
     def update_round(self, round_num):
         """更新轮次"""
@@ -336,10 +527,6 @@ class GameGraphics:
     
     def final_result(self, my_score, opponent_score):
         """显示最终结果"""
-        self.text_pen.color("yellow")
-        self.text_pen.up()
-        self.text_pen.goto(0, 0)
-        
         if my_score > opponent_score:
             result_text = f"🎉 恭喜获胜！\n最终比分: {my_score} - {opponent_score}"
         elif my_score < opponent_score:
@@ -347,12 +534,56 @@ class GameGraphics:
         else:
             result_text = f"🤝 平局！\n最终比分: {my_score} - {opponent_score}"
         
-        self.text_pen.write(result_text, align="center", font=("Arial", 24, "bold"))
-        self.screen.update()
+        self.result_text = result_text
+        self.invalidate("result")
+    
+    def clear_result(self):
+        """清除上一场的最终结果（同一窗口中连续进行多场比赛时）"""
+        self.result_text = None
+        self.invalidate("result")
+    
+    def play_replay(self, replay, speed=1.0):
+        """
+        按回放记录重现整场比赛（replay 为 replay.Replay），speed 为播放倍数，
+        无穷大时跳过所有动画和提示直接画出每次射门的结果；返回本次播放的帧统计。
+        播放结束后恢复原来的节奏（set_pacing 的设置）
+        """
+        previous_speed, self.speed = self.speed, speed
+        stats_before = dict(self.frame_stats)
+        try:
+            self.my_score = self.opponent_score = 0
+            self.update_score()
+            for shot in replay.shots:
+                if not self._running:
+                    break
+                self.update_round(shot.round_num)
+                if shot.side == "me":
+                    self.show_message(f"{shot.shooter} 射向: {shot.direction}\n"
+                                      f"对方守门员扑向: {shot.keeper_guess}", DELAYS["replay_info"])
+                    self.animate_shot("left", shot.direction, shot.is_goal, shot.keeper_guess)
+                    self.my_score += shot.is_goal
+                else:
+                    self.show_message(f"对方射向: {shot.direction}\n"
+                                      f"{replay.my_goalkeeper} 扑向: {shot.keeper_guess}", DELAYS["replay_info"])
+                    self.animate_shot("right", shot.direction, shot.is_goal, shot.keeper_guess)
+                    self.opponent_score += shot.is_goal
+                self.update_score()
+                # 动画期间关闭窗口时 animate 会直接返回，画布已销毁，不能再刷新
+                if self._running:
+                    self._flush()
+                self.wait(DELAYS["replay_gap"])
+            if self._running:
+                self.final_result(self.my_score, self.opponent_score)
+                # 瞬时播放时帧循环没有机会运行，直接刷新一次画面
+                self._flush()
+        finally:
+            self.speed = previous_speed
+        return {key: self.frame_stats[key] - stats_before[key] for key in self.frame_stats}
     
     def close(self):
         """关闭窗口"""
-        self.screen.bye()
+        if self._running:
+            self._on_close()
 
 
 
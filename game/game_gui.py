@@ -1,25 +1,131 @@
 """
 GUI界面模块：用于选择球员和门将
 展示：异常处理、lambda函数、组合数据类型（列表、字典、集合）
+
+名单可能有数百名球员：可用球员由 AvailabilityIndex 增量维护（选择变化时只增删变化的球员），
+下拉框只在展开前、且筛选条件变化或可见候选受选择变化影响时才重新设置选项；
+下拉框可以输入文字筛选（不区分大小写的子串匹配），按 ↓ 展开筛选结果，按回车选中唯一匹配。
 """
 import tkinter as tk
+from bisect import bisect_left, insort
 from tkinter import ttk, messagebox
+from typing import Iterable, List, Optional
+
+from players import ALL_PLAYERS, ALL_GOALKEEPERS
+
+# 出场球员人数
+SQUAD_SIZE = 5
+# 下拉框的占位文字
+PLAYER_PLACEHOLDER = "请选择球员"
+KEEPER_PLACEHOLDER = "请选择守门员"
+# 下拉框中最多列出的候选数（输入文字可进一步筛选）
+MAX_SUGGESTIONS = 200
+# 这些按键不改变输入内容，不触发筛选
+NAVIGATION_KEYS = {"Up", "Down", "Left", "Right", "Return", "KP_Enter", "Escape", "Tab",
+                   "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R"}
+
+
+class AvailabilityIndex:
+    """
+    名单的可用性索引 - 展示组合数据类型（列表、字典）
+    按名单顺序保存尚未被选择的球员下标（有序列表，二分查找增删），
+    每次变化递增 version 并记下变化的球员，下拉框据此判断自己的候选是否受影响
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = list(names)
+        self._position = {name: i for i, name in enumerate(self.names)}
+        self._keys = [name.casefold() for name in self.names]
+        self._available = list(range(len(self.names)))
+        self.version = 0
+        # 第 v 次变化的球员下标保存在 _changed[v - 1]
+        self._changed: List[int] = []
+
+    def __contains__(self, name) -> bool:
+        return name in self._position
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def is_available(self, name: str) -> bool:
+        i = self._position.get(name)
+        if i is None:
+            return False
+        j = bisect_left(self._available, i)
+        return j < len(self._available) and self._available[j] == i
+
+    def claim(self, name: str):
+        """标记为已选择"""
+        i = self._position[name]
+        j = bisect_left(self._available, i)
+        if j < len(self._available) and self._available[j] == i:
+            del self._available[j]
+            self._changed.append(i)
+            self.version += 1
+
+    def release(self, name: str):
+        """取消选择，重新变为可用"""
+        if not self.is_available(name):
+            i = self._position[name]
+            insort(self._available, i)
+            self._changed.append(i)
+            self.version += 1
+
+    def search(self, query: str = "", limit: Optional[int] = None, include: Optional[str] = None) -> List[str]:
+        """
+        按名单顺序列出可用且包含 query（不区分大小写）的球员，最多 limit 个；
+        include 为当前下拉框自己选中的球员，即使已被占用也列出
+        """
+        query = query.casefold()
+        indices = self._available
+        if include in self._position and not self.is_available(include):
+            indices = list(indices)
+            insort(indices, self._position[include])
+        matches = []
+        for i in indices:
+            if query in self._keys[i]:
+                matches.append(self.names[i])
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def touches(self, since: int, query: str, shown: List[str], limit: Optional[int] = None) -> bool:
+        """
+        自 since 版本以来的变化是否可能改变 search(query, limit) 给出的候选 shown：
+        变化的球员正在候选中，或与 query 匹配且位于候选范围内（候选被 limit 截断时在最后一名之前）
+        """
+        changed = self._changed[since:]
+        if not changed:
+            return False
+        query = query.casefold()
+        visible = {self._position[name] for name in shown}
+        last = self._position[shown[-1]] if limit is not None and len(shown) >= limit else None
+        return any(i in visible or (query in self._keys[i] and (last is None or i < last))
+                   for i in changed)
+
 
 class PlayerSelectionGUI:
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, root=None, roster=None):
+        # 与游戏画面共用同一个 Tk 根窗口；未传入时自行创建
+        self.owns_root = root is None
+        self.root = root if root is not None else tk.Tk()
         self.root.title("点球大战 - 球员选择")
         self.root.geometry("600x800")
         self.root.configure(bg='#f0f0f0')
         
-        # 球员列表 - 展示组合数据类型（列表）
-        self.all_players = [
-            "梅西", "C罗", "哈兰德",
-            "德布劳内", "莫德里奇", "姆巴佩", "莱万多夫斯基", "萨拉赫", "德容", "内马尔"
-        ]
+        # 选择界面放在独立的框架中，选择完成后只销毁该框架
+        self.frame = tk.Frame(self.root, bg='#f0f0f0')
+        self.frame.pack(fill="both", expand=True)
+        
+        # 选择完成（或关闭窗口）时置位
+        self.done = tk.BooleanVar(master=self.root, value=False)
+        self.root.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        # 球员列表 - 展示组合数据类型（列表）；传入 roster.Roster 时使用外部名单
+        self.all_players = roster.player_names() if roster is not None else list(ALL_PLAYERS)
         
         # 守门员列表
-        self.all_goalkeepers = ["诺伊尔", "库尔图瓦", "阿利森"]
+        self.all_goalkeepers = roster.goalkeeper_names() if roster is not None else list(ALL_GOALKEEPERS)
         
         # 选择的球员顺序 - 展示组合数据类型（列表）
         self.selected_players = []
@@ -29,13 +135,23 @@ class PlayerSelectionGUI:
         # 存储已选择的球员 - 展示组合数据类型（集合）
         self.used_players = set()
         
+        # 每个位置当前选中的球员（None 为未选择），以及可用性索引
+        self.selections: List[Optional[str]] = [None] * SQUAD_SIZE
+        self.player_index = AvailabilityIndex(self.all_players)
+        # 守门员只选一名，不需要占用，只用于筛选
+        self.keeper_index = AvailabilityIndex(self.all_goalkeepers)
+        # 每个下拉框上次设置选项时的 (索引版本, 筛选文字, 本位置的选择, 候选)，
+        # 之后的选择变化不影响这些候选时不必重建
+        self._combo_keys = [None] * SQUAD_SIZE
+        self._keeper_key = None
+        
         # 创建界面
         self.create_widgets()
         
     def create_widgets(self):
         # 标题
         title_label = tk.Label(
-            self.root, 
+            self.frame, 
             text="⚽ 点球大战球员选择", 
             font=("Arial", 20, "bold"),
             bg='#f0f0f0',
@@ -45,8 +161,8 @@ class PlayerSelectionGUI:
         
         # 球员选择区域
         player_frame = tk.LabelFrame(
-            self.root,
-            text="从10名球员中选择5名并排列出场顺序",
+            self.frame,
+            text=f"从{len(self.all_players)}名球员中选择{SQUAD_SIZE}名并排列出场顺序",
             font=("Arial", 12, "bold"),
             bg='#f0f0f0',
             fg='#34495e',
@@ -55,10 +171,10 @@ class PlayerSelectionGUI:
         )
         player_frame.pack(pady=10, padx=20, fill="both", expand=True)
         
-        # 创建10个下拉选择框
+        # 创建下拉选择框（可输入文字筛选）
         self.player_combos = []
         
-        for i in range(5):
+        for i in range(SQUAD_SIZE):
             row_frame = tk.Frame(player_frame, bg='#f0f0f0')
             row_frame.pack(pady=5, fill="x")
             
@@ -72,24 +188,27 @@ class PlayerSelectionGUI:
             )
             label.pack(side="left", padx=5)
             
+            # 选项在展开前才生成（postcommand）
             combo = ttk.Combobox(
                 row_frame,
-                values=["请选择球员"] + self.all_players,
-                state="readonly",
+                postcommand=lambda idx=i: self.refresh_combo(idx),
                 width=25,
                 font=("Arial", 10)
             )
-            combo.set("请选择球员")
+            combo.set(PLAYER_PLACEHOLDER)
             combo.pack(side="left", padx=5)
             
-            # 绑定选择事件 - 使用lambda函数
+            # 绑定选择和输入事件 - 使用lambda函数
             combo.bind("<<ComboboxSelected>>", lambda e, idx=i: self.on_player_selected(idx))
+            combo.bind("<KeyRelease>", lambda e, idx=i: self.on_player_typed(e, idx))
+            combo.bind("<Return>", lambda e, idx=i: self.commit_typed(idx))
+            combo.bind("<FocusOut>", lambda e, idx=i: self.commit_typed(idx))
             
             self.player_combos.append(combo)
         
         # 守门员选择区域
         keeper_frame = tk.LabelFrame(
-            self.root,
+            self.frame,
             text="选择1名守门员",
             font=("Arial", 12, "bold"),
             bg='#f0f0f0',
@@ -101,17 +220,19 @@ class PlayerSelectionGUI:
         
         self.keeper_combo = ttk.Combobox(
             keeper_frame,
-            values=["请选择守门员"] + self.all_goalkeepers,
-            state="readonly",
+            postcommand=self.refresh_keeper_combo,
             width=30,
             font=("Arial", 11)
         )
-        self.keeper_combo.set("请选择守门员")
+        self.keeper_combo.set(KEEPER_PLACEHOLDER)
         self.keeper_combo.pack(pady=10)
+        self.keeper_combo.bind("<KeyRelease>", lambda e: e.keysym in NAVIGATION_KEYS or self.refresh_keeper_combo())
+        self.keeper_combo.bind("<Return>", lambda e: self.commit_keeper())
+        self.keeper_combo.bind("<FocusOut>", lambda e: self.commit_keeper())
         
         # 开始游戏按钮
         start_button = tk.Button(
-            self.root,
+            self.frame,
             text="开始点球大战 ⚽",
             command=self.start_game,
             bg='#27ae60',
@@ -125,48 +246,109 @@ class PlayerSelectionGUI:
         start_button.pack(pady=20)
         
     def on_player_selected(self, index):
-        """当选择球员时更新其他下拉框的选项 - 使用lambda和组合数据类型"""
-        # 更新已使用的球员集合
-        self.update_used_players()
+        """
+        当某个位置的选择变化时，只在可用性索引中释放原来的球员、占用新球员 - 展示集合操作
+        其他下拉框在下次展开时，只有候选中含有变化球员的才重建选项
+        """
+        combo = self.player_combos[index]
+        name = combo.get()
+        previous = self.selections[index]
+        if name == (previous or PLAYER_PLACEHOLDER):
+            return
+        if name != PLAYER_PLACEHOLDER and not self.player_index.is_available(name):
+            # 不在名单中或已被其他位置选择：恢复原来的选择
+            combo.set(previous or PLAYER_PLACEHOLDER)
+            return
         
-        # 更新所有下拉框的可用选项
-        self.update_all_combos()
+        if previous is not None:
+            self.player_index.release(previous)
+            self.used_players.discard(previous)
+        if name == PLAYER_PLACEHOLDER:
+            self.selections[index] = None
+        else:
+            self.player_index.claim(name)
+            self.used_players.add(name)
+            self.selections[index] = name
     
-    def update_used_players(self):
-        """更新已选择的球员集合 - 展示集合操作"""
-        self.used_players = set()
-        for combo in self.player_combos:
-            selected = combo.get()
-            if selected != "请选择球员":
-                self.used_players.add(selected)
+    def _query(self, text, selected, placeholder):
+        """下拉框中的文字 -> 筛选条件（占位文字和已选中的名字不筛选）"""
+        return "" if text in (placeholder, selected) else text.strip()
+    
+    def refresh_combo(self, index):
+        """
+        下拉框展开前（或输入文字后）调用：筛选文字或本位置的选择变化过，
+        或其他位置的选择变化影响到本下拉框的候选时，才重新设置选项
+        """
+        combo = self.player_combos[index]
+        current = self.selections[index]
+        query = self._query(combo.get(), current, PLAYER_PLACEHOLDER)
+        players = self.player_index
+        cached = self._combo_keys[index]
+        if cached is not None:
+            version, cached_query, cached_current, shown = cached
+            if (cached_query, cached_current) == (query, current) and \
+                    not players.touches(version, query, shown, MAX_SUGGESTIONS):
+                self._combo_keys[index] = (players.version, query, current, shown)
+                return
+        shown = players.search(query, MAX_SUGGESTIONS, include=current)
+        combo['values'] = [PLAYER_PLACEHOLDER] + shown
+        self._combo_keys[index] = (players.version, query, current, shown)
+    
+    def on_player_typed(self, event, index):
+        """输入文字时按输入内容筛选候选（不改变当前选择，回车或离开输入框时才确认）"""
+        if event.keysym not in NAVIGATION_KEYS:
+            self.refresh_combo(index)
+    
+    def commit_typed(self, index):
+        """
+        确认输入的文字：与可用球员完全一致或只有一个匹配时选中该球员，
+        清空时取消选择，否则恢复原来的选择
+        """
+        combo = self.player_combos[index]
+        current = self.selections[index]
+        text = combo.get().strip()
+        if text in (PLAYER_PLACEHOLDER, current):
+            return
+        if not text:
+            combo.set(PLAYER_PLACEHOLDER)
+        elif not self.player_index.is_available(text):
+            matches = self.player_index.search(text, 2)
+            combo.set(matches[0] if len(matches) == 1 else current or PLAYER_PLACEHOLDER)
+        else:
+            combo.set(text)
+        self.on_player_selected(index)
     
-    def update_all_combos(self):
-        """更新所有下拉框的可用选项 - 展示列表推导式和集合操作"""
-        # 计算可用球员列表 - 使用列表推导式
-        available = [p for p in self.all_players if p not in self.used_players]
-        
-        # 更新每个下拉框
-        for i, combo in enumerate(self.player_combos):
-            current = combo.get()
-            # 更新选项列表
-            options = ["请选择球员"] + available
-            # 如果当前选择的球员不在可用列表中，保留它
-            if current != "请选择球员" and current in self.all_players:
-                if current not in options:
-                    options.append(current)
-            combo['values'] = options
+    def refresh_keeper_combo(self):
+        """守门员下拉框：按输入文字筛选候选"""
+        query = self._query(self.keeper_combo.get(), None, KEEPER_PLACEHOLDER)
+        if self._keeper_key != query:
+            self.keeper_combo['values'] = [KEEPER_PLACEHOLDER] + self.keeper_index.search(query, MAX_SUGGESTIONS)
+            self._keeper_key = query
+    
+    def commit_keeper(self):
+        """确认输入的守门员：只有一个匹配时补全，无匹配时恢复占位文字"""
+        text = self.keeper_combo.get().strip()
+        if text == KEEPER_PLACEHOLDER or text in self.keeper_index:
+            return
+        matches = self.keeper_index.search(text, 2) if text else []
+        self.keeper_combo.set(matches[0] if len(matches) == 1 else KEEPER_PLACEHOLDER)
     
     def start_game(self):
         """验证选择并开始游戏 - 展示异常处理"""
         try:
+            # 确认输入框中尚未确认的文字
+            for i in range(SQUAD_SIZE):
+                self.commit_typed(i)
+            self.commit_keeper()
+            
             # 收集选择的球员 - 使用列表推导式
             self.selected_players = [
-                combo.get() for combo in self.player_combos
+                name for name in self.selections if name is not None
             ]
             
             # 验证所有位置都已选择
-            if "请选择球员" in self.selected_players:
-                raise ValueError("请为所有10个位置选择球员！")
+            if len(self.selected_players) != SQUAD_SIZE:
+                raise ValueError(f"请为所有{SQUAD_SIZE}个位置选择球员！")
             
             # 检查是否有重复 - 使用集合操作
             if len(set(self.selected_players)) != len(self.selected_players):
@@ -174,19 +356,28 @@ class PlayerSelectionGUI:
             
             # 检查守门员
             self.selected_goalkeeper = self.keeper_combo.get()
-            if self.selected_goalkeeper == "请选择守门员":
+            if self.selected_goalkeeper not in self.keeper_index:
                 raise ValueError("请选择一名守门员！")
             
-            # 关闭GUI并返回
-            self.root.quit()
-            self.root.destroy()
+            # 结束选择并返回
+            self.done.set(True)
             
         except ValueError as e:
-            messagebox.showerror("选择错误", str(e))
+            messagebox.showerror("选择错误", str(e), parent=self.root)
+    
+    def cancel(self):
+        """关闭窗口：放弃选择"""
+        self.selected_players = []
+        self.selected_goalkeeper = None
+        self.done.set(True)
     
     def run(self):
-        """运行GUI界面"""
-        self.root.mainloop()
+        """运行GUI界面，直到完成选择或关闭窗口"""
+        self.root.wait_variable(self.done)
+        if self.owns_root:
+            self.root.destroy()
+        else:
+            self.frame.destroy()
         return self.selected_players, self.selected_goalkeeper
 
 
@@ -3,34 +3,56 @@
 展示：异常处理、lambda函数、组合数据类型、面向对象编程、
      模块与包、文件读写
 """
+import argparse
 import random
+import sys
 import time
-from typing import List, Tuple
-import tkinter as tk
-from tkinter import messagebox, simpledialog
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 
 # 模块导入 - 展示模块与包
-from game_gui import PlayerSelectionGUI
-from game_graphics import GameGraphics
+# 图形界面模块（tkinter/turtle）只在真正需要图形前端时才延迟导入，
+# 无界面的模拟和测试导入本模块时不会初始化 Tk
+from ai import NGramStrategy
+from engine import ShootoutEngine, ShotRecord, Strategy
+from pacing import DELAYS, PACING
+from players import ALL_GOALKEEPERS, ALL_PLAYERS
+from utils.timing import NULL_TIMER, PhaseTimer
 
-class PenaltyGame:
-    """点球游戏类 - 展示面向对象编程"""
+if TYPE_CHECKING:
+    import tkinter as tk
+    from game_graphics import GameGraphics
+    from roster import Roster
+
+class PenaltyGame(ShootoutEngine):
+    """点球游戏类 - 展示面向对象编程（继承无界面引擎，负责图形界面交互）"""
     
-    def __init__(self):
-        # 使用组合数据类型（列表）存储游戏数据
-        self.my_players: List[str] = []
-        self.my_goalkeeper = None
-        self.my_score = 0
-        self.opponent_score = 0
-        self.rounds = 5
+    def __init__(self, opponent_shooter: Optional[Strategy] = None,
+                 opponent_keeper: Optional[Strategy] = None,
+                 rng: Optional[random.Random] = None, seed: Optional[int] = None,
+                 timer: Optional[PhaseTimer] = None, outcome_model=None):
+        # outcome_model 为 skill_model.SkillModel 等进球判定模型，省略时方向不同即进球
+        super().__init__(rng=rng, seed=seed, outcome_model=outcome_model)
+        
+        # 电脑一方的策略，默认使用会学习玩家习惯的 n-gram 策略
+        self.opponent_shooter: Strategy = opponent_shooter or NGramStrategy("shooter", rng=self.rng)
+        self.opponent_keeper: Strategy = opponent_keeper or NGramStrategy("keeper", rng=self.rng)
+        
+        # 自动对战时我方也由策略出招（为 None 时等待玩家输入，见 enable_autopilot）
+        self.my_shooter: Optional[Strategy] = None
+        self.my_keeper: Optional[Strategy] = None
+        
+        # 可选的分阶段计时器，与 GameGraphics 共用同一个即可得到整场比赛的用时分布
+        self.timer = timer or NULL_TIMER
         
-        # 使用元组存储射门方向映射 - 展示组合数据类型（元组）
-        self.direction_map: Tuple[str, str, str] = ("L", "C", "R")
+        # 上一场比赛是否按规则打完（中途关闭窗口时为 False，不保存结果和回放）
+        self.finished = False
+        
+    def select_team(self, root: Optional["tk.Tk"] = None, roster: Optional["Roster"] = None) -> Tuple[List[str], str]:
+        """选择球员和守门员（roster 为外部名单，默认使用内置名单） - 展示异常处理"""
+        from game_gui import PlayerSelectionGUI
         
-    def select_team(self) -> Tuple[List[str], str]:
-        """选择球员和守门员 - 展示异常处理"""
         try:
-            gui = PlayerSelectionGUI()
+            gui = PlayerSelectionGUI(root, roster)
             players, goalkeeper = gui.run()
             
             if not players or len(players) != 5:
@@ -46,65 +68,54 @@ class PenaltyGame:
             print(f"选择过程出错: {e}")
             raise
     
-    def validate_direction(self, direction: str) -> str:
-        """验证射门方向 - 展示lambda函数和异常处理"""
-        try:
-            direction = direction.strip().upper() if direction else ""
-            
-            # 使用lambda函数验证方向 - 展示lambda函数
-            is_valid = lambda d: d in self.direction_map
-            if not is_valid(direction):
-                raise ValueError(f"无效方向: {direction}，必须是 L、C 或 R")
-            
-            return direction
-        except (AttributeError, TypeError) as e:
-            raise ValueError(f"方向验证失败: {e}")
+    def enable_autopilot(self, players: Sequence[str] = ALL_PLAYERS,
+                         goalkeepers: Sequence[str] = ALL_GOALKEEPERS) -> Tuple[List[str], str]:
+        """自动对战：从 players / goalkeepers 中随机选择我方阵容，我方的射门和扑救也交给 AI 策略"""
+        if len(players) < 5 or not goalkeepers:
+            raise ValueError("名单中至少需要5名球员和1名守门员")
+        # 我方使用独立的随机数生成器，电脑一方的随机序列与人工对战时相同（回放仍可校验）
+        rng = random.Random(None if self.seed is None else self.seed + 1)
+        self.my_players = rng.sample(list(players), 5)
+        self.my_goalkeeper = rng.choice(list(goalkeepers))
+        self.my_shooter = NGramStrategy("shooter", rng=rng)
+        self.my_keeper = NGramStrategy("keeper", rng=rng)
+        return self.my_players, self.my_goalkeeper
+    
+    def ask_direction(self, graphics: "GameGraphics", prompt: str) -> Optional[str]:
+        """在游戏窗口的输入面板上读取方向（按钮或 L/C/R 键），放弃时返回None"""
+        direction = graphics.ask_direction(prompt)
+        return None if direction is None else self.validate_direction(direction)
     
-    def player_shoot(self, player_name: str, graphics: GameGraphics) -> bool:
+    def player_shoot(self, player_name: str, graphics: "GameGraphics", round_num: int = 0) -> bool:
         """玩家射门 - 展示异常处理、lambda函数"""
-        root = tk.Tk()
-        root.withdraw()
+        import tkinter as tk
         
         try:
-            direction = None
-            while True:
-                try:
-                    direction = simpledialog.askstring(
-                        "射门方向",
-                        f"{player_name} 请选择射门方向:\nL - 左侧\nC - 中间\nR - 右侧",
-                        parent=root
-                    )
-                    
-                    if direction is None:
-                        root.destroy()
-                        return False
-                    
-                    direction = self.validate_direction(direction)
-                    break
-                    
-                except ValueError as e:
-                    messagebox.showerror("输入错误", str(e))
-            
-            root.destroy()
-            
-            # 对方守门员随机猜测方向
-            keeper_guess = random.choice(list(self.direction_map))
+            if self.my_shooter is not None:
+                direction = self.my_shooter(round_num, player_name)
+            else:
+                direction = self.ask_direction(graphics, f"{player_name} 请选择射门方向")
+                if direction is None:
+                    return False
             
-            # 判断是否进球 - 使用lambda函数
-            is_goal_func = lambda d, g: d != g
-            is_goal = is_goal_func(direction, keeper_guess)
+            with self.timer.phase("logic"):
+                # 对方守门员按策略猜测方向
+                keeper_guess = self.opponent_keeper(round_num, player_name)
+                
+                # 判断是否进球并计分
+                is_goal = self.record_shot(round_num, "me", player_name, direction, keeper_guess)
+                self.observe(self.my_shooter, self.opponent_keeper, direction, keeper_guess)
             
             # 显示射门动画
             graphics.show_message(
                 f"{player_name} 射向: {direction}\n对方守门员扑向: {keeper_guess}", 
-                2
+                DELAYS["shot_info"]
             )
             graphics.draw_goalkeeper(550, 0, "right")  # 显示对方守门员
-            time.sleep(0.5)
-            graphics.animate_shot("left", direction, is_goal)
+            graphics.wait(DELAYS["before_shot"])
+            graphics.animate_shot("left", direction, is_goal, keeper_guess)
             
             if is_goal:
-                self.my_score += 1
                 graphics.my_score = self.my_score
                 graphics.update_score()  # 更新比分
             
@@ -112,112 +123,108 @@ class PenaltyGame:
             
         except tk.TclError as e:
             print(f"GUI错误: {e}")
-            root.destroy()
             return False
         except Exception as e:
             print(f"射门过程中发生错误: {e}")
-            root.destroy()
             return False
     
-    def opponent_shoot(self, graphics: GameGraphics) -> bool:
+    def opponent_shoot(self, graphics: "GameGraphics", round_num: int = 0) -> bool:
         """对方射门 - 展示异常处理、lambda函数"""
-        # 对方随机选择方向
-        opponent_dir = random.choice(list(self.direction_map))
+        import tkinter as tk
         
-        root = tk.Tk()
-        root.withdraw()
-
-        keeper_dir = None
         try:
-            while True:
-                try:
-                    keeper_dir = simpledialog.askstring(
-                        "守门",
-                        f"你控制的守门员 {self.my_goalkeeper} 请选择扑救方向:\nL - 左侧\nC - 中间\nR - 右侧",
-                        parent=root
-                    )
-                    if keeper_dir is None:
-                        root.destroy()
-                        return False
-                    keeper_dir = self.validate_direction(keeper_dir)
-                    break
-                except ValueError as e:
-                    messagebox.showerror("输入错误", str(e))
+            opponent_name = self.opponent_for(round_num)
+            if self.my_keeper is not None:
+                keeper_dir = self.my_keeper(round_num, opponent_name)
+            else:
+                keeper_dir = self.ask_direction(
+                    graphics, f"你控制的守门员 {self.my_goalkeeper} 请选择扑救方向"
+                )
+                if keeper_dir is None:
+                    return False
             
-
-                    if keeper_dir is None:
-                        root.destroy()
-                        return False
-
-                    keeper_dir = self.validate_direction(keeper_dir)
-                    break
-                    
-                except ValueError as e:
-                    messagebox.showerror("输入错误", str(e))
-
-            root.destroy()
-                # 使用lambda函数判断是否进球 - 展示lambda函数
-            is_goal = (lambda d, g: d != g)(opponent_dir, keeper_dir)
+            with self.timer.phase("logic"):
+                # 对方按策略选择方向：放在玩家输入之后，跳过的射门不消耗电脑的随机数，
+                # 回放按记录的射门依次重现电脑的选择时才能与比赛中一致
+                opponent_dir = self.opponent_shooter(round_num, opponent_name)
+                is_goal = self.record_shot(round_num, "opponent", opponent_name, opponent_dir, keeper_dir)
+                self.observe(self.opponent_shooter, self.my_keeper, opponent_dir, keeper_dir)
             
             # 显示射门动画
             graphics.show_message(
                 f"对方射向: {opponent_dir}\n{self.my_goalkeeper} 扑向: {keeper_dir}", 
-                2
+                DELAYS["shot_info"]
             )
             graphics.draw_goalkeeper(-550, 0, "left")  # 显示我方守门员
-            time.sleep(0.5)
-            graphics.animate_shot("right", opponent_dir, is_goal)
+            graphics.wait(DELAYS["before_shot"])
+            graphics.animate_shot("right", opponent_dir, is_goal, keeper_dir)
             
             if is_goal:
-                self.opponent_score += 1
                 graphics.opponent_score = self.opponent_score
                 graphics.update_score()  # 更新比分
             
             return is_goal
         except tk.TclError as e:
             print(f"GUI错误: {e}")
-            root.destroy()
             return False
         except Exception as e:
             print(f"守门过程中发生错误: {e}")
-            root.destroy()
             return False
     
-    def play_game(self, graphics: GameGraphics) -> Tuple[int, int]:
+    def play_game(self, graphics: "GameGraphics") -> Tuple[int, int]:
         """进行点球大战 - 展示异常处理和组合数据类型"""
+        self.reset()
+        self.finished = False
         graphics.my_score = 0
         graphics.opponent_score = 0
+        graphics.clear_result()
         graphics.update_score()  # 初始化比分显示
         
         try:
-            for round_num in range(1, self.rounds + 1):
+            for round_num in range(1, self.round_limit + 1):
+                # 窗口被关闭时提前结束
+                if not graphics.is_open:
+                    break
+                self.timer.set_round(round_num)
                 graphics.update_round(round_num)
+                stage = "突然死亡 " if round_num > self.rounds else ""
                 
                 # 我方射门
-                graphics.show_message(f"第 {round_num} 轮 - 我方射门", 1.5)
-                player_name = self.my_players[round_num - 1]
-                graphics.show_message(f"{player_name} 准备射门", 1)
+                graphics.show_message(f"{stage}第 {round_num} 轮 - 我方射门", DELAYS["round_banner"])
+                player_name = self.shooter_for(round_num)
+                graphics.show_message(f"{player_name} 准备射门", DELAYS["ready"])
                 try:
-                    self.player_shoot(player_name, graphics)
+                    self.player_shoot(player_name, graphics, round_num)
                 except Exception as e:
                     print(f"射门出错: {e}")
                     continue
                 
-                time.sleep(1)
+                graphics.wait(DELAYS["after_shot"])
+                # 一方已不可能追上时本轮对方不再射门
+                if self.decided(round_num, opponent_kicked=False):
+                    self.finished = True
+                    break
                 
                 # 对方射门
-                graphics.show_message(f"第 {round_num} 轮 - 对方射门", 1.5)
-                graphics.show_message(f"对方球员准备射门", 1)
+                graphics.show_message(f"{stage}第 {round_num} 轮 - 对方射门", DELAYS["round_banner"])
+                graphics.show_message(f"对方球员准备射门", DELAYS["ready"])
                 try:
-                    self.opponent_shoot(graphics)
+                    self.opponent_shoot(graphics, round_num)
                 except Exception as e:
                     print(f"守门出错: {e}")
                     continue
                 
-                time.sleep(1)
+                graphics.wait(DELAYS["after_shot"])
+                if self.decided(round_num):
+                    self.finished = True
+                    break
+                if round_num == self.rounds:
+                    graphics.show_message("常规轮次战平，进入突然死亡！", DELAYS["sudden_death"])
             
-            # 显示最终结果
-            graphics.final_result(self.my_score, self.opponent_score)
+            # 显示最终结果（之后的用时不再计入最后一轮）
+            self.timer.set_round(0)
+            if graphics.is_open:
+                graphics.final_result(self.my_score, self.opponent_score)
             
             return self.my_score, self.opponent_score
             
@@ -225,66 +232,151 @@ class PenaltyGame:
             print(f"游戏过程中发生错误: {e}")
             raise
 
-def save_game_result(my_score: int, opponent_score: int, players: List[str], goalkeeper: str):
-    """保存游戏结果 - 展示文件读写"""
+def save_game_result(my_score: int, opponent_score: int, players: List[str], goalkeeper: str,
+                     shots: Sequence[ShotRecord] = ()):
+    """保存游戏结果（含逐次射门记录）到结果库 - 展示文件读写"""
+    from utils.results_store import get_store
+    
     try:
-        with open("score.txt", "a", encoding="utf-8") as f:
-            f.write(f"\n=== 点球大战结果 ===\n")
-            f.write(f"比分: 我方 {my_score} - {opponent_score} 对方\n")
-            f.write(f"球员: {', '.join(players)}\n")
-            f.write(f"守门员: {goalkeeper}\n")
-        print(f"\n结果已保存到 score.txt")
+        store = get_store()
+        store.add_game(my_score, opponent_score, players, goalkeeper, shots)
+        store.flush()
+        print(f"\n结果已保存到 {store.path}")
     except Exception as e:
         print(f"保存文件时出错: {e}")
 
-def main():
-    """主函数 - 展示异常处理、文件读写"""
+def save_replay(game: ShootoutEngine) -> Optional[str]:
+    """把刚结束的比赛保存为回放文件，返回文件路径 - 展示文件读写"""
+    from replay import Replay
+    
+    try:
+        path = Replay.from_engine(game).save()
+        print(f"回放已保存到 {path}")
+        return path
+    except Exception as e:
+        print(f"保存回放时出错: {e}")
+        return None
+
+def main(argv: Optional[List[str]] = None):
+    """
+    主函数 - 展示异常处理、文件读写
+    
+    --pace 选择节奏档位（normal/fast/instant），--auto 双方都由 AI 出招（用于演示和长时间运行测试，
+    不保存结果和回放），--profile 记录分阶段用时并导出跟踪文件（见 utils.timing），
+    --roster 使用外部 CSV/JSON 名单代替内置名单（见 roster），
+    --skill 按球员能力值、压力和疲劳判定进球（见 skill_model），名单中的能力值由此生效
+    """
+    parser = argparse.ArgumentParser(description="点球大战")
+    parser.add_argument("--pace", choices=PACING, default="normal", help="比赛节奏（默认 normal）")
+    parser.add_argument("--auto", action="store_true", help="自动对战：双方都由 AI 出招")
+    parser.add_argument("--games", type=int, default=1, help="自动对战的场数")
+    parser.add_argument("--seed", type=int, default=None, help="随机数种子")
+    parser.add_argument("--profile", metavar="PATH", help="导出分阶段用时（.json 或 .folded）")
+    parser.add_argument("--roster", metavar="PATH", help="CSV 或 JSON 名单文件")
+    parser.add_argument("--skill", action="store_true", help="按球员能力值判定进球")
+    args = parser.parse_args(argv)
+    if args.games < 1 or (args.games > 1 and not args.auto):
+        parser.error("--games 只能用于 --auto，且至少为 1")
+    if args.seed is not None and not -2 ** 63 <= args.seed < 2 ** 63:
+        # 回放文件按有符号 64 位整数保存种子
+        parser.error("--seed 必须在有符号 64 位整数范围内")
+    
+    roster = None
+    if args.roster:
+        from roster import RosterError, load_roster
+        try:
+            roster = load_roster(args.roster)
+        except (OSError, RosterError) as e:
+            print(f"读取名单失败: {e}")
+            return
+        # 名单中的能力值登记到共享的 Registry，引擎和能力模型按名字查到的就是这些球员
+        roster.register()
+    
+    # 图形前端：此时才导入 tkinter 和 turtle
+    import tkinter as tk
+    from game_graphics import GameGraphics
+    
     print("=== 点球大战游戏 ===")
     
     graphics = None
     game = None
+    root = None
     
     try:
         # 创建游戏实例
-        game = PenaltyGame()
+        outcome_model = None
+        if args.skill:
+            from skill_model import SkillModel
+            outcome_model = SkillModel()
+        game = PenaltyGame(seed=args.seed, timer=PhaseTimer() if args.profile else None,
+                           outcome_model=outcome_model)
         
-        # 选择球员和守门员
-        print("\n请在弹出的窗口中选择球员和守门员...")
-        try:
-            players, goalkeeper = game.select_team()
-            print(f"\n已选择球员: {players}")
-            print(f"已选择守门员: {goalkeeper}")
-        except Exception as e:
-            print(f"选择过程出错: {e}")
-            return
-        except KeyboardInterrupt:
-            print("\n用户中断选择")
-            return
+        # 整个程序只使用这一个 Tk 根窗口：球员选择、球场画布和方向输入都在其中
+        root = tk.Tk()
+        
+        if args.auto:
+            if roster is not None:
+                players, goalkeeper = game.enable_autopilot(roster.player_names(), roster.goalkeeper_names())
+            else:
+                players, goalkeeper = game.enable_autopilot()
+            print(f"\n自动对战: {players}，守门员 {goalkeeper}")
+        else:
+            # 选择球员和守门员
+            print("\n请在弹出的窗口中选择球员和守门员...")
+            try:
+                players, goalkeeper = game.select_team(root, roster)
+                print(f"\n已选择球员: {players}")
+                print(f"已选择守门员: {goalkeeper}")
+            except Exception as e:
+                print(f"选择过程出错: {e}")
+                return
+            except KeyboardInterrupt:
+                print("\n用户中断选择")
+                return
         
         # 初始化图形界面
         try:
-            graphics = GameGraphics()
-            time.sleep(1)
+            graphics = GameGraphics(root, timer=game.timer)
+            graphics.set_pacing(args.pace)
+            graphics.wait(DELAYS["startup"])
         except Exception as e:
             print(f"图形界面初始化失败: {e}")
             raise
         
-        # 显示初始画面和提示
-        graphics.show_message("点球大战开始！", 2)
-        graphics.draw_goalkeeper(550, 0, "right")  # 显示对方守门员
-        
         # 开始游戏
         try:
-            my_score, opp_score = game.play_game(graphics)
-            
-            # 保存结果到文件 - 展示文件读写
-            save_game_result(my_score, opp_score, players, goalkeeper)
+            for game_num in range(1, args.games + 1):
+                if not graphics.is_open:
+                    break
+                # 显示初始画面和提示
+                graphics.show_message("点球大战开始！", DELAYS["intro"])
+                graphics.draw_goalkeeper(550, 0, "right")  # 显示对方守门员
+                
+                start = time.perf_counter()
+                my_score, opp_score = game.play_game(graphics)
+                elapsed = time.perf_counter() - start
+                
+                if not game.finished:
+                    # 中途关闭窗口：比分和射门记录都不完整，不写入结果库和回放
+                    print(f"\n=== 比赛未完成 ===")
+                    print(f"比分: 我方 {my_score} - {opp_score} 对方，不保存结果和回放")
+                    break
+                
+                if not args.auto:
+                    # 保存结果到文件 - 展示文件读写
+                    with game.timer.phase("persist"):
+                        save_game_result(my_score, opp_score, players, goalkeeper, game.shots)
+                        save_replay(game)
+                
+                print(f"\n=== 第 {game_num} 场比赛结束 ===" if args.auto else f"\n=== 比赛结束 ===")
+                print(f"最终比分: 我方 {my_score} - {opp_score} 对方（用时 {elapsed:.1f} 秒）")
             
-            print(f"\n=== 比赛结束 ===")
-            print(f"最终比分: 我方 {my_score} - {opp_score} 对方")
+            if args.profile:
+                print(game.timer.report())
+                print(f"用时跟踪已导出到 {game.timer.save(args.profile)}")
             
-            # 保持窗口打开
-            if graphics:
+            # 保持窗口打开（自动对战结束后直接退出）
+            if graphics.is_open and not args.auto:
                 graphics.screen.mainloop()
             
         except KeyboardInterrupt:
@@ -301,10 +393,24 @@ def main():
     finally:
         # 清理资源 - 展示异常处理的finally块
         try:
-            if graphics:
-                pass  # graphics会在mainloop中保持
+            if graphics is not None:
+                graphics.close()
+            elif root is not None:
+                root.destroy()
+        except tk.TclError:
+            pass  # 窗口已被关闭
         except Exception as e:
             print(f"清理资源时出错: {e}")
 
 if __name__ == "__main__":
-    main()
+    # python main.py tournament ... 进入批量锦标赛模式，
+    # python main.py replay 回放文件 ... 重放或校验回放，否则进入图形界面游戏
+    # （python main.py --auto --pace fast 自动对战，其他选项见 python main.py --help）
+    if len(sys.argv) > 1 and sys.argv[1] == "tournament":
+        import tournament
+        tournament.main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "replay":
+        import replay
+        sys.exit(replay.main(sys.argv[2:]))
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,229 @@
+"""
+NumPy 向量化蒙特卡洛模拟：一次性抽取 N 场 × 5 轮的射门和扑救方向，
+用少量数组运算算出进球、最终比分和胜/平/负分布
+展示：组合数据类型、异常处理、模块与包
+
+规则与 PenaltyGame 相同：射门方向与扑救方向不同即为进球；
+一方已不可能追上时提前结束，常规轮次战平后进入突然死亡（见 engine.ShootoutEngine.decided）。
+突然死亡阶段与引擎一样按出场名单轮换射门：每轮的分布和进球矩阵超出给定轮次后，
+按 engine.round_row 循环使用最后 my_cycle / opponent_cycle 轮（通常为双方出场人数）。
+方向编码为 0/1/2，对应 engine.DIRECTIONS 中的 L/C/R。
+"""
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine import DIRECTIONS, MAX_ROUNDS, round_row
+
+# 均匀随机的方向分布
+UNIFORM: Tuple[float, float, float] = (1 / 3, 1 / 3, 1 / 3)
+
+# 每批最多模拟的场数，限制大规模模拟时的内存占用
+BATCH_SIZE = 1_000_000
+
+
+class StrategyMix(NamedTuple):
+    """一支球队的混合策略：射门方向分布和扑救方向分布"""
+    shot: Sequence[float] = UNIFORM
+    dive: Sequence[float] = UNIFORM
+
+
+class SimulationResult(NamedTuple):
+    """模拟结果 - 展示组合数据类型（命名元组）"""
+    games: int
+    # score_counts[i, j] 为我方 i 球、对方 j 球的场数
+    score_counts: np.ndarray
+    win: float
+    draw: float
+    loss: float
+    # 平均每场实际射门次数
+    kicks: float = 0.0
+
+    def score_distribution(self) -> Dict[Tuple[int, int], float]:
+        """返回 {(我方得分, 对方得分): 概率}"""
+        mine, theirs = np.nonzero(self.score_counts)
+        return {
+            (int(i), int(j)): float(self.score_counts[i, j] / self.games)
+            for i, j in zip(mine, theirs)
+        }
+
+
+def _check_rows(rows: int, rounds: int, what: str, shape: tuple):
+    if rows != 1 and rows < rounds:
+        raise ValueError(f"{what}必须只有一组或至少覆盖 {rounds} 轮，实际形状为 {shape}")
+
+
+def _as_cdf(probs: Sequence[float], rounds: int) -> np.ndarray:
+    """把方向分布转换为 每轮×2 的累计分布，支持每轮一个分布（形状 轮次×3，轮次不少于 rounds）"""
+    probs = np.asarray(probs, dtype=np.float64)
+    if probs.ndim == 1:
+        probs = probs[np.newaxis]
+    if probs.ndim != 2 or probs.shape[1] != len(DIRECTIONS):
+        raise ValueError(f"方向分布形状必须是 (3,) 或 (轮次, 3)，实际为 {probs.shape}")
+    _check_rows(len(probs), rounds, "方向分布", probs.shape)
+    if (probs < 0).any() or not np.allclose(probs.sum(axis=-1), 1.0):
+        raise ValueError("方向分布必须非负且概率之和为 1")
+    return np.cumsum(probs, axis=-1)[:, :-1]
+
+
+def _as_goal_matrix(matrix, rounds: int) -> Optional[np.ndarray]:
+    """把进球概率矩阵规整为 轮次×3×3（3×3 视为一轮）；为 None 时使用方向不同即进球的规则"""
+    if matrix is None:
+        return None
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.shape == (3, 3):
+        matrix = matrix[np.newaxis]
+    if matrix.ndim != 3 or matrix.shape[1:] != (3, 3):
+        raise ValueError(f"进球概率矩阵形状必须是 (3, 3) 或 (轮次, 3, 3)，实际为 {matrix.shape}")
+    _check_rows(len(matrix), rounds, "进球概率矩阵", matrix.shape)
+    if (matrix < 0).any() or (matrix > 1).any():
+        raise ValueError("进球概率必须在 0 到 1 之间")
+    return matrix
+
+
+def _rows(table: Optional[np.ndarray], first: int, last: int, cycle: int) -> Optional[np.ndarray]:
+    """取第 first~last 轮使用的行（超出给定轮次后按 cycle 循环，与引擎的名单轮换一致）"""
+    if table is None:
+        return None
+    return table[[round_row(round_num, len(table), cycle) for round_num in range(first, last + 1)]]
+
+
+def _goals(rng: np.random.Generator, shot: np.ndarray, dive: np.ndarray,
+           matrix: Optional[np.ndarray]) -> np.ndarray:
+    """计算每次射门是否进球：无矩阵时方向不同即进球，否则按 matrix[轮次, 射门, 扑救] 抽样"""
+    if matrix is None:
+        return shot != dive
+    probability = matrix[np.arange(shot.shape[1]), shot, dive]
+    return rng.random(shot.shape) < probability
+
+
+def _draw(rng: np.random.Generator, cdf: np.ndarray, games: int, rounds: int) -> np.ndarray:
+    """按累计分布抽取 games×rounds 个方向编码"""
+    u = rng.random((games, rounds, 1))
+    return (u >= cdf).sum(axis=-1, dtype=np.int8)
+
+
+def _stop(my_goals: np.ndarray, opp_goals: np.ndarray,
+          early_stop: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    按常规轮次的射门结果找出每场比赛结束的那一脚
+    返回 (我方得分, 对方得分, 射门次数, 是否仍战平需要突然死亡)
+    """
+    batch, rounds = my_goals.shape
+    my_cum = np.zeros((batch, rounds + 1), dtype=np.int16)
+    opp_cum = np.zeros((batch, rounds + 1), dtype=np.int16)
+    np.cumsum(my_goals, axis=1, out=my_cum[:, 1:])
+    np.cumsum(opp_goals, axis=1, out=opp_cum[:, 1:])
+    remaining = np.arange(rounds - 1, -1, -1)
+
+    # decided[:, 2i] 为第 i+1 轮我方射门后、decided[:, 2i+1] 为对方射门后比赛是否结束
+    decided = np.zeros((batch, 2 * rounds), dtype=bool)
+    after_opp = my_cum[:, 1:] - opp_cum[:, 1:]
+    decided[:, -1] = after_opp[:, -1] != 0
+    if early_stop:
+        after_me = my_cum[:, 1:] - opp_cum[:, :-1]
+        decided[:, 0::2] = (after_me > remaining + 1) | (-after_me > remaining)
+        decided[:, 1::2] |= np.abs(after_opp) > remaining
+
+    tied = ~decided.any(axis=1)
+    last = np.where(tied, 2 * rounds - 1, decided.argmax(axis=1))
+    rows = np.arange(batch)
+    my_score = my_cum[rows, last // 2 + 1].astype(np.int64)
+    opp_score = opp_cum[rows, (last + 1) // 2].astype(np.int64)
+    return my_score, opp_score, last + 1, tied
+
+
+def simulate(games: int, me: StrategyMix = StrategyMix(), opponent: StrategyMix = StrategyMix(),
+             rounds: int = 5, seed: Optional[int] = None,
+             rng: Optional[np.random.Generator] = None,
+             my_goal_matrix=None, opponent_goal_matrix=None,
+             early_stop: bool = True, sudden_death: bool = True,
+             max_rounds: int = MAX_ROUNDS,
+             my_cycle: int = 1, opponent_cycle: int = 1) -> SimulationResult:
+    """
+    模拟 games 场点球大战
+
+    me.shot 与 opponent.dive 决定我方射门，opponent.shot 与 me.dive 决定对方射门。
+    my_goal_matrix/opponent_goal_matrix 为双方射门的进球概率矩阵（3×3 或 轮次×3×3，
+    可由 skill_model.SkillModel.lineup_matrices 生成）；省略时方向不同即进球。
+    early_stop/sudden_death/max_rounds 与 ShootoutEngine 相同。每轮一组的分布和矩阵至少覆盖常规轮次，
+    之后的轮次循环使用最后 my_cycle（我方射门）/ opponent_cycle（对方射门）轮，取出场人数即与引擎一致。
+    """
+    if games <= 0:
+        raise ValueError("模拟场数必须为正数")
+    if max_rounds < rounds:
+        raise ValueError(f"轮次上限 {max_rounds} 不能小于常规轮次 {rounds}")
+    if my_cycle <= 0 or opponent_cycle <= 0:
+        raise ValueError("轮换周期必须为正数")
+    rng = rng if rng is not None else np.random.default_rng(seed)
+
+    my_shot, opp_dive = _as_cdf(me.shot, rounds), _as_cdf(opponent.dive, rounds)
+    opp_shot, my_dive = _as_cdf(opponent.shot, rounds), _as_cdf(me.dive, rounds)
+    my_matrix = _as_goal_matrix(my_goal_matrix, rounds)
+    opp_matrix = _as_goal_matrix(opponent_goal_matrix, rounds)
+
+    limit = max_rounds if sudden_death else rounds
+    # 我方射门（我方射门分布、对方扑救分布、我方矩阵）和对方射门各按本方名单轮换
+    mine_tables = (my_shot, opp_dive, my_matrix, my_cycle)
+    theirs_tables = (opp_shot, my_dive, opp_matrix, opponent_cycle)
+    kick_rows = lambda tables, first, last: tuple(_rows(table, first, last, tables[3]) for table in tables[:3])
+    regular_mine, regular_theirs = kick_rows(mine_tables, 1, rounds), kick_rows(theirs_tables, 1, rounds)
+    size = limit + 1
+    counts = np.zeros(size * size, dtype=np.int64)
+    total_kicks = 0
+    remaining = games
+    while remaining:
+        batch = min(remaining, BATCH_SIZE)
+        # 逐次判定进球，再按规则找出每场比赛结束时的比分
+        kick = lambda rows, n, count: _goals(rng, _draw(rng, rows[0], n, count), _draw(rng, rows[1], n, count),
+                                             rows[2])
+        my_goals = kick(regular_mine, batch, rounds)
+        opp_goals = kick(regular_theirs, batch, rounds)
+        my_score, opp_score, kicks, tied = _stop(my_goals, opp_goals, early_stop)
+
+        # 突然死亡：只对仍战平的比赛逐轮抽样，直到分出胜负或达到轮次上限；射门球员按名单轮换
+        pending = np.flatnonzero(tied) if sudden_death else np.empty(0, dtype=np.intp)
+        for round_num in range(rounds + 1, limit + 1):
+            if not pending.size:
+                break
+            n = pending.size
+            mine = kick(kick_rows(mine_tables, round_num, round_num), n, 1)[:, 0]
+            theirs = kick(kick_rows(theirs_tables, round_num, round_num), n, 1)[:, 0]
+            my_score[pending] += mine
+            opp_score[pending] += theirs
+            kicks[pending] += 2
+            pending = pending[mine == theirs]
+
+        counts += np.bincount(my_score * size + opp_score, minlength=size * size)
+        total_kicks += int(kicks.sum())
+        remaining -= batch
+
+    # 去掉从未出现的高比分行列
+    score_counts = counts.reshape(size, size)
+    top = int(max(np.nonzero(score_counts.any(axis=1))[0].max(),
+                  np.nonzero(score_counts.any(axis=0))[0].max())) + 1
+    score_counts = score_counts[:top, :top]
+    diff = np.subtract.outer(np.arange(top), np.arange(top))
+    return SimulationResult(
+        games=games,
+        score_counts=score_counts,
+        win=float(score_counts[diff > 0].sum() / games),
+        draw=float(score_counts[diff == 0].sum() / games),
+        loss=float(score_counts[diff < 0].sum() / games),
+        kicks=total_kicks / games,
+    )
+
+
+def win_probability_table(mixes: Dict[str, StrategyMix], games: int = 100_000,
+                          rounds: int = 5, seed: Optional[int] = None) -> Dict[Tuple[str, str], float]:
+    """
+    计算各策略组合之间的胜率表
+
+    返回 {(我方策略名, 对方策略名): 我方获胜概率}。
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        (mine, theirs): simulate(games, mixes[mine], mixes[theirs], rounds, rng=rng).win
+        for mine in mixes
+        for theirs in mixes
+    }
@@ -0,0 +1,40 @@
+"""
+比赛节奏：图形界面中所有提示、等待和动画的时长集中定义在这里，
+由节奏档位统一缩放（普通 / 快速 / 瞬时）
+展示：组合数据类型（字典）、模块与包
+
+GameGraphics.set_pacing 选择档位后，wait、show_message 和 animate 的时长都除以档位的倍数；
+瞬时档位的倍数为无穷大，不播放动画、不显示提示，只刷新结果。
+"""
+from typing import Dict
+
+# 各处停顿的基准时长（秒，普通档位）
+DELAYS: Dict[str, float] = {
+    "startup": 1.0,        # 窗口创建后
+    "intro": 2.0,          # "点球大战开始！"
+    "round_banner": 1.5,   # "第 N 轮 - 我方/对方射门"
+    "ready": 1.0,          # "某某 准备射门"
+    "shot_info": 2.0,      # 射门方向与扑救方向
+    "before_shot": 0.5,    # 守门员就位后、起脚前
+    "flight": 0.5,         # 球飞行动画
+    "result": 1.5,         # "进球！" / "被扑出！"
+    "after_shot": 1.0,     # 一脚结束后
+    "sudden_death": 2.0,   # "进入突然死亡！"
+    "replay_info": 1.0,    # 回放中的射门信息
+    "replay_gap": 0.5,     # 回放中两脚之间
+}
+
+# 节奏档位：时长除以的倍数；快速档位下一场约 5 轮的比赛只需数秒
+PACING: Dict[str, float] = {
+    "normal": 1.0,
+    "fast": 25.0,
+    "instant": float("inf"),
+}
+
+
+def pacing_speed(name: str) -> float:
+    """档位名 -> 倍数"""
+    try:
+        return PACING[name]
+    except KeyError:
+        raise ValueError(f"未知的节奏档位: {name}，可选 {', '.join(PACING)}")
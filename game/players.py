@@ -1,18 +1,167 @@
 import random
+from array import array
+
+# 完整球员名单和守门员名单，图形界面和批量模拟共用
+ALL_PLAYERS = (
+    "梅西", "C罗", "哈兰德",
+    "德布劳内", "莫德里奇", "姆巴佩", "莱万多夫斯基", "萨拉赫", "德容", "内马尔"
+)
+ALL_GOALKEEPERS = ("诺伊尔", "库尔图瓦", "阿利森")
+
+# 方向与射门方的小整数编码，ShotLog 中只存编码
+DIRECTION_CODES = {"L": 0, "C": 1, "R": 2}
+SIDE_CODES = {"me": 0, "opponent": 1}
+
 
 class Player:
-    def __init__(self, name="Player"):
+    # 使用 __slots__ 去掉每个实例的 __dict__，大量球员对象也很省内存
+    __slots__ = ("id", "name", "accuracy", "power", "composure", "score")
+
+    def __init__(self, name="Player", accuracy=0.8, power=0.7, composure=0.7):
+        self.id = -1  # 加入 Registry 时分配
         self.name = name
+        # 能力值均在 0~1 之间
+        self.accuracy = accuracy
+        self.power = power
+        self.composure = composure
         self.score = 0
 
     def choose_direction(self, direction):
         return direction.upper()
 
+    def __repr__(self):
+        return f"Player({self.name!r}, id={self.id})"
+
 
 class Goalkeeper:
-    def __init__(self, name="Goalkeeper"):
+    __slots__ = ("id", "name", "reach", "reflexes", "saves", "rng", "strategy")
+
+    def __init__(self, name="Goalkeeper", rng=None, reach=0.5, reflexes=0.5, strategy=None):
+        self.id = -1  # 加入 Registry 时分配
         self.name = name
+        # 能力值均在 0~1 之间
+        self.reach = reach
+        self.reflexes = reflexes
         self.saves = 0
+        # 传入带种子的 random.Random 可使扑救方向可复现
+        self.rng = rng or random.Random()
+        # 可选的扑救策略（如 ai.NGramStrategy），为 None 时均匀随机
+        self.strategy = strategy
+
+    def guess_direction(self, round_num=0, shooter=""):
+        if self.strategy is not None:
+            return self.strategy(round_num, shooter)
+        return self.rng.choice(["L", "C", "R"])
+
+    def observe(self, direction):
+        """把对方的射门方向告诉学习型扑救策略"""
+        learn = getattr(self.strategy, "observe", None)
+        if learn is not None:
+            learn(direction)
+
+    def __repr__(self):
+        return f"Goalkeeper({self.name!r}, id={self.id})"
+
+
+class Registry:
+    """球员/守门员登记表：整数编号与对象、名字之间的映射"""
+    __slots__ = ("people", "_by_name")
+
+    def __init__(self):
+        self.people = []  # 下标即编号
+        self._by_name = {}
+
+    def add(self, person):
+        """登记一名球员或守门员并分配编号；同名者返回已有对象"""
+        existing = self._by_name.get(person.name)
+        if existing is not None:
+            return existing
+        person.id = len(self.people)
+        self.people.append(person)
+        self._by_name[person.name] = person
+        return person
+
+    def get(self, name, kind=Player):
+        """按名字查找，未登记的名字以默认能力值自动登记"""
+        person = self._by_name.get(name)
+        return person if person is not None else self.add(kind(name))
+
+    def id_of(self, name, kind=Player):
+        return self.get(name, kind).id
+
+    def __getitem__(self, person_id):
+        return self.people[person_id]
+
+    def __len__(self):
+        return len(self.people)
+
+
+# 进程内共享的登记表，预先登记完整名单
+REGISTRY = Registry()
+for _name in ALL_PLAYERS:
+    REGISTRY.add(Player(_name))
+for _name in ALL_GOALKEEPERS:
+    REGISTRY.add(Goalkeeper(_name))
+
+
+class ShotLog:
+    """
+    射门事件日志：按列存储（struct-of-arrays），每列是一个紧凑的 array，
+    每次射门 18 字节；to_numpy 直接共享底层缓冲区，无需复制
+    """
+    __slots__ = ("game", "round", "side", "shooter", "keeper", "direction", "guess", "goal")
+
+    # 列名与 array 类型码 / NumPy dtype
+    COLUMNS = (
+        ("game", "I", "uint32"),
+        ("round", "H", "uint16"),
+        ("side", "b", "int8"),
+        ("shooter", "i", "int32"),
+        ("keeper", "i", "int32"),
+        ("direction", "b", "int8"),
+        ("guess", "b", "int8"),
+        ("goal", "b", "int8"),
+    )
+
+    def __init__(self):
+        for column, typecode, _ in self.COLUMNS:
+            setattr(self, column, array(typecode))
+
+    def append(self, game, round_num, side, shooter, keeper, direction, guess, goal):
+        """追加一次射门（全部为整数编码）"""
+        self.game.append(game)
+        self.round.append(round_num)
+        self.side.append(side)
+        self.shooter.append(shooter)
+        self.keeper.append(keeper)
+        self.direction.append(direction)
+        self.guess.append(guess)
+        self.goal.append(goal)
+
+    def row(self, index):
+        """第 index 次射门的各列编码"""
+        return tuple(getattr(self, column)[index] for column, _, _ in self.COLUMNS)
+
+    def clear(self):
+        for column, typecode, _ in self.COLUMNS:
+            setattr(self, column, array(typecode))
+
+    def __len__(self):
+        return len(self.goal)
+
+    def nbytes(self):
+        """日志占用的字节数"""
+        return sum(len(column) * column.itemsize
+                   for column in (getattr(self, name) for name, _, _ in self.COLUMNS))
+
+    def to_numpy(self):
+        """
+        返回 {列名: NumPy 数组}，数组直接引用 array 的缓冲区（零复制）
+        注意：数组存在期间底层 array 不能再追加（会抛出 BufferError）
+        """
+        import numpy as np
 
-    def guess_direction(self):
-        return random.choice(["L", "C", "R"])
+        return {
+            column: np.frombuffer(getattr(self, column), dtype=dtype)
+            for column, _, dtype in self.COLUMNS
+        }
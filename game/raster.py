@@ -0,0 +1,406 @@
+"""
+离屏渲染：不需要窗口和显示器，把比赛画面绘制到内存中的 PIL 图像，
+可把回放或模拟比赛批量导出为 PNG 帧序列或 GIF 动画
+展示：面向对象编程、文件读写、组合数据类型、模块与包
+
+RasterGraphics 提供与 GameGraphics 相同的绘制接口（draw_field、draw_goal、draw_goalkeeper、
+animate_shot、update_score、show_message、wait ...），但不运行事件循环：
+时间按帧计算，每次等待、提示和动画都按 fps 生成相应数量的帧并交给 sink。
+
+用法（在 game 目录下）：
+    python raster.py 回放文件... --out clips/ [--format gif|png] [--speed 4] [--fps 15]
+    python raster.py --simulate 1000 --seed 0 --out clips/ [--workers 8]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from engine import ShootoutEngine, random_strategy
+from pacing import DELAYS, pacing_speed
+from players import ALL_GOALKEEPERS, ALL_PLAYERS
+from replay import Replay
+from scene import (BALL_RADIUS, FIELD, FIELD_COLOR, FONT_SIZES, HEIGHT, KEEPER_POSES, MESSAGE_POS,
+                   NET_COLOR, RESULT_POS, ROUND_POS, SCORE_LINE_GAP, SCORE_POS, WIDTH, Polyline,
+                   dive_pose, goal_lines, keeper_x, place, shot_path, shot_target)
+from utils.timing import NULL_TIMER
+
+# 帧接收者：每生成一帧调用一次
+FrameSink = Callable[[Image.Image], None]
+
+# 导出默认值：4 倍速、每秒 15 帧、半尺寸画面
+EXPORT_SPEED = 4.0
+EXPORT_FPS = 15
+EXPORT_SCALE = 0.5
+# 导出的片段末尾停留在最终比分上的秒数（不受速度影响）
+FINAL_HOLD = 1.5
+
+# 可显示中文的字体（按顺序尝试），都找不到时使用 Pillow 内置字体
+FONT_CANDIDATES = (
+    "NotoSansCJK-Bold.ttc",
+    "NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/simhei.ttf",
+    "DejaVuSans-Bold.ttf",
+)
+
+
+@lru_cache(maxsize=32)
+def load_font(size: int, path: Optional[str] = None) -> ImageFont.ImageFont:
+    """加载指定大小的字体：优先 path，其次 FONT_CANDIDATES（按大小缓存，同一进程中只加载一次）"""
+    for candidate in ((path,) if path else ()) + FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1 的内置字体不能缩放
+        return ImageFont.load_default()
+
+
+def _px(x, y, scale):
+    """世界坐标（原点在中心，y 轴向上）-> 缩放 scale 倍后的像素坐标"""
+    return ((x + WIDTH / 2) * scale, (HEIGHT / 2 - y) * scale)
+
+
+def _draw_polylines(draw: ImageDraw.ImageDraw, polylines: Sequence[Polyline], scale: float):
+    for polyline in polylines:
+        draw.line([_px(x, y, scale) for x, y in polyline.points], fill=polyline.color,
+                  width=max(1, round(polyline.width * scale)), joint="curve")
+
+
+@lru_cache(maxsize=8)
+def field_image(scale: float) -> Image.Image:
+    """缩放 scale 倍的静态球场（按尺寸缓存，批量导出时每种尺寸只光栅化一次；使用者须复制后再修改）"""
+    size = (max(1, round(WIDTH * scale)), max(1, round(HEIGHT * scale)))
+    image = Image.new("RGB", size, FIELD_COLOR)
+    _draw_polylines(ImageDraw.Draw(image), FIELD, scale)
+    return image
+
+
+class RasterGraphics:
+    """离屏渲染器 - 展示面向对象编程（与 GameGraphics 接口相同）"""
+
+    def __init__(self, sink: Optional[FrameSink] = None, fps: int = EXPORT_FPS,
+                 scale: float = EXPORT_SCALE, font_path: Optional[str] = None, timer=None):
+        if fps <= 0 or scale <= 0:
+            raise ValueError("帧率和缩放比例必须为正数")
+        self.sink = sink
+        self.fps = fps
+        self.scale = scale
+        self.size = (max(1, round(WIDTH * scale)), max(1, round(HEIGHT * scale)))
+        self.speed = 1.0
+        self.timer = timer or NULL_TIMER
+        self._fonts = {size: load_font(max(1, round(size * scale)), font_path)
+                       for size in set(FONT_SIZES.values())}
+
+        # 与 GameGraphics 相同的画面状态；每帧由状态重新合成
+        self.my_score = 0
+        self.opponent_score = 0
+        self.current_round = 1
+        self.keeper_state = None
+        self.ball_position: Optional[Tuple[float, float]] = None
+        self.message: Optional[str] = None
+        self.result_text: Optional[str] = None
+
+        # 静态球场来自按尺寸缓存的图像，每帧从它复制
+        self._static = None
+        self._static_draw = None
+        self.frame_stats = {"frames": 0}
+        self.draw_field()
+
+    @property
+    def is_open(self):
+        """离屏渲染器始终可用（与 GameGraphics.is_open 对应）"""
+        return True
+
+    def set_pacing(self, name):
+        """选择节奏档位（pacing.PACING 中的 normal/fast/instant）"""
+        self.speed = pacing_speed(name)
+
+    def _px(self, x, y):
+        """世界坐标（原点在中心，y 轴向上）-> 像素坐标"""
+        return _px(x, y, self.scale)
+
+    def _polylines(self, draw: ImageDraw.ImageDraw, polylines: Sequence[Polyline]):
+        _draw_polylines(draw, polylines, self.scale)
+
+    # ---- 与 GameGraphics 相同的绘制接口 ----
+
+    def draw_field(self):
+        """绘制球场（静态图层只创建一次，复制自缓存的球场图像）"""
+        if self._static is None:
+            self._static = field_image(self.scale).copy()
+            self._static_draw = ImageDraw.Draw(self._static)
+
+    def draw_goal(self, x, y, side):
+        """在静态图层上绘制位于 side 侧的球门"""
+        self._polylines(self._static_draw, goal_lines(x, y, side))
+
+    def draw_goalkeeper(self, x, y, side, pose="stand"):
+        self.keeper_state = (x, y, side, pose)
+
+    def update_score(self):
+        """比分在每帧由状态合成，无需单独重绘"""
+
+    def update_round_display(self):
+        """轮次在每帧由状态合成，无需单独重绘"""
+
+    def update_round(self, round_num):
+        self.current_round = round_num
+
+    def wait(self, duration):
+        """等待 duration 秒：生成相应数量的帧（瞬时档位下生成一帧，对应窗口的一次刷新）"""
+        duration /= self.speed
+        self.emit(max(1, round(duration * self.fps)))
+
+    def show_message(self, message, duration=1.5, block=True):
+        """显示提示消息 duration 秒（离屏渲染总是按顺序生成帧，block 参数只为接口一致）"""
+        duration /= self.speed
+        if duration <= 0:
+            return None
+        self.message = message
+        self.emit(max(1, round(duration * self.fps)))
+        self.message = None
+        return None
+
+    def animate(self, duration, step, block=True):
+        """按帧推进动画：每帧以进度(0~1)调用 step"""
+        duration /= self.speed
+        if duration <= 0:
+            step(1.0)
+            return None
+        frames = max(1, round(duration * self.fps))
+        for i in range(1, frames + 1):
+            step(i / frames)
+            self.emit()
+        return None
+
+    def animate_shot(self, side, direction, is_goal, keeper_guess=None):
+        """射门动画：足球沿缓出插值轨迹飞向球门"""
+        start_x, goal_x, goal_side = shot_path(side)
+        target_y = shot_target(goal_side, direction)
+
+        if keeper_guess is not None:
+            self.draw_goalkeeper(goal_x, 0, goal_side, dive_pose(goal_side, keeper_guess))
+
+        def fly(progress):
+            eased = 1 - (1 - progress) ** 2
+            self.ball_position = (start_x + (goal_x - start_x) * eased, target_y * eased)
+
+        self.ball_position = (start_x, 0)
+        self.animate(DELAYS["flight"], fly)
+        self.ball_position = None
+        self.show_message("⚽ 进球！" if is_goal else "❌ 被扑出！", DELAYS["result"])
+
+    def final_result(self, my_score, opponent_score):
+        if my_score > opponent_score:
+            self.result_text = f"🎉 恭喜获胜！\n最终比分: {my_score} - {opponent_score}"
+        elif my_score < opponent_score:
+            self.result_text = f"😢 遗憾败北\n最终比分: {my_score} - {opponent_score}"
+        else:
+            self.result_text = f"🤝 平局！\n最终比分: {my_score} - {opponent_score}"
+
+    def clear_result(self):
+        self.result_text = None
+
+    def close(self):
+        """与 GameGraphics.close 对应，离屏渲染器无需释放资源"""
+
+    # ---- 帧合成 ----
+
+    def render(self) -> Image.Image:
+        """按当前状态合成一帧"""
+        frame = self._static.copy()
+        draw = ImageDraw.Draw(frame)
+        text = lambda x, y, value, size, color="white", anchor="ld": draw.multiline_text(
+            self._px(x, y), value, fill=color, font=self._fonts[size], anchor=anchor, align="center")
+
+        x, y = SCORE_POS
+        text(x, y, f"我方: {self.my_score}", FONT_SIZES["score"])
+        text(x, y - SCORE_LINE_GAP, f"对方: {self.opponent_score}", FONT_SIZES["score"])
+        text(*ROUND_POS, f"第 {self.current_round} 轮", FONT_SIZES["round"], anchor="md")
+
+        if self.keeper_state is not None:
+            x, y, side, pose = self.keeper_state
+            self._polylines(draw, place(KEEPER_POSES[pose], keeper_x(x, side), y))
+
+        if self.ball_position is not None:
+            bx, by = self._px(*self.ball_position)
+            r = BALL_RADIUS * self.scale
+            draw.ellipse((bx - r, by - r, bx + r, by + r), fill="white")
+
+        if self.message:
+            text(*MESSAGE_POS, self.message, FONT_SIZES["message"], "yellow", "md")
+        if self.result_text:
+            text(*RESULT_POS, self.result_text, FONT_SIZES["result"], "yellow", "md")
+        return frame
+
+    def frame_array(self):
+        """当前画面的 NumPy 数组（高×宽×3，uint8）"""
+        import numpy as np
+        return np.asarray(self.render())
+
+    def emit(self, count: int = 1):
+        """生成 count 帧交给 sink（画面不变时只合成一次）"""
+        if self.sink is None or count <= 0:
+            return
+        with self.timer.phase("canvas"):
+            frame = self.render()
+        for _ in range(count):
+            self.sink(frame)
+        self.frame_stats["frames"] += count
+
+    def play_replay(self, replay: Replay, speed: float = 1.0, hold: float = FINAL_HOLD):
+        """
+        按回放记录生成整场比赛的帧（与 GameGraphics.play_replay 的画面顺序相同），
+        结尾在最终比分上停留 hold 秒；返回本次生成的帧数
+        """
+        self.speed = speed
+        frames_before = self.frame_stats["frames"]
+        self.my_score = self.opponent_score = 0
+        self.clear_result()
+        for shot in replay.shots:
+            self.update_round(shot.round_num)
+            if shot.side == "me":
+                self.show_message(f"{shot.shooter} 射向: {shot.direction}\n"
+                                  f"对方守门员扑向: {shot.keeper_guess}", DELAYS["replay_info"])
+                self.animate_shot("left", shot.direction, shot.is_goal, shot.keeper_guess)
+                self.my_score += shot.is_goal
+            else:
+                self.show_message(f"对方射向: {shot.direction}\n"
+                                  f"{replay.my_goalkeeper} 扑向: {shot.keeper_guess}", DELAYS["replay_info"])
+                self.animate_shot("right", shot.direction, shot.is_goal, shot.keeper_guess)
+                self.opponent_score += shot.is_goal
+            self.wait(DELAYS["replay_gap"])
+        self.final_result(self.my_score, self.opponent_score)
+        self.emit(max(1, round(hold * self.fps)))
+        self.speed = 1.0
+        return self.frame_stats["frames"] - frames_before
+
+
+def _gif_palette() -> Image.Image:
+    """GIF 使用的固定调色板：场景颜色及其与草坪色之间的过渡色（文字抗锯齿边缘）"""
+    field = ImageColor.getrgb(FIELD_COLOR)
+    colors = [field]
+    for color in ("white", "yellow", NET_COLOR):
+        rgb = ImageColor.getrgb(color)
+        colors.extend(tuple(round(f + (c - f) * i / 8) for f, c in zip(field, rgb)) for i in range(1, 9))
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([channel for color in colors for channel in color])
+    return palette
+
+
+def export_replay(replay: Replay, path: str, speed: float = EXPORT_SPEED, fps: int = EXPORT_FPS,
+                  scale: float = EXPORT_SCALE, font_path: Optional[str] = None) -> int:
+    """
+    把一场回放导出为 GIF（path 以 .gif 结尾）或 PNG 帧序列（path 为目录，frame_00000.png ...），
+    返回帧数
+    """
+    if path.lower().endswith(".gif"):
+        frames: List[Image.Image] = []
+        palette = _gif_palette()
+        last = [None, None]
+
+        def sink(frame):
+            # 相同的帧只转换一次；所有帧共用固定调色板，比逐帧计算调色板快得多，内存也只有 RGB 的三分之一
+            if frame is not last[0]:
+                last[:] = [frame, frame.quantize(palette=palette, dither=Image.Dither.NONE)]
+            frames.append(last[1])
+
+        RasterGraphics(sink, fps, scale, font_path).play_replay(replay, speed)
+        frames[0].save(path, save_all=True, append_images=frames[1:],
+                       duration=round(1000 / fps), loop=0)
+        return len(frames)
+
+    os.makedirs(path, exist_ok=True)
+    count = [0]
+
+    def sink(frame):
+        frame.save(os.path.join(path, f"frame_{count[0]:05d}.png"), compress_level=1)
+        count[0] += 1
+
+    RasterGraphics(sink, fps, scale, font_path).play_replay(replay, speed)
+    return count[0]
+
+
+def simulated_replay(seed: int) -> Replay:
+    """用种子派生的阵容和随机策略无界面进行一场比赛，返回其回放"""
+    rng = random.Random(seed)
+    engine = ShootoutEngine(rng.sample(ALL_PLAYERS, 5), rng.choice(ALL_GOALKEEPERS),
+                            opponent_players=rng.sample(ALL_PLAYERS, 5),
+                            opponent_goalkeeper=rng.choice(ALL_GOALKEEPERS), seed=seed)
+    shooter = random_strategy(engine.rng)
+    engine.play(shooter, shooter, shooter, shooter)
+    return Replay.from_engine(engine)
+
+
+def _export_task(task: Tuple[str, str, str, float, int, float, Optional[str]]) -> Tuple[str, int]:
+    """在工作进程中导出一个片段：source 为回放文件路径或 "seed:种子" """
+    source, out_dir, fmt, speed, fps, scale, font_path = task
+    if source.startswith("seed:"):
+        replay, name = simulated_replay(int(source[5:])), f"sim-{source[5:]}"
+    else:
+        replay, name = Replay.load(source), os.path.splitext(os.path.basename(source))[0]
+    target = os.path.join(out_dir, name + (".gif" if fmt == "gif" else ""))
+    return target, export_replay(replay, target, speed, fps, scale, font_path)
+
+
+def export_many(sources: Sequence[str], out_dir: str, fmt: str = "gif", speed: float = EXPORT_SPEED,
+                fps: int = EXPORT_FPS, scale: float = EXPORT_SCALE, font_path: Optional[str] = None,
+                workers: int = 1):
+    """批量导出（workers > 1 时多进程），逐个产出 (输出路径, 帧数)"""
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(source, out_dir, fmt, speed, fps, scale, font_path) for source in sources]
+    if workers <= 1:
+        yield from map(_export_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_export_task, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="点球大战离屏渲染：批量导出 PNG 帧序列或 GIF")
+    parser.add_argument("replays", nargs="*", help="回放文件")
+    parser.add_argument("--simulate", type=int, default=0, help="另外模拟并导出的比赛场数")
+    parser.add_argument("--seed", type=int, default=0, help="模拟比赛的起始种子")
+    parser.add_argument("--out", default="clips", help="输出目录（默认 clips）")
+    parser.add_argument("--format", choices=("gif", "png"), default="gif")
+    parser.add_argument("--speed", type=float, default=EXPORT_SPEED, help=f"播放倍数（默认 {EXPORT_SPEED:g}）")
+    parser.add_argument("--fps", type=int, default=EXPORT_FPS)
+    parser.add_argument("--scale", type=float, default=EXPORT_SCALE, help="画面缩放比例")
+    parser.add_argument("--font", default=None, help="可显示中文的字体文件")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    sources = list(args.replays) + [f"seed:{args.seed + i}" for i in range(args.simulate)]
+    if not sources:
+        parser.error("请指定回放文件或 --simulate 场数")
+    start = time.perf_counter()
+    total = 0
+    try:
+        for path, frames in export_many(sources, args.out, args.format, args.speed, args.fps,
+                                        args.scale, args.font, args.workers):
+            total += frames
+            print(f"{path}: {frames} 帧")
+    except (OSError, ValueError) as e:
+        print(f"导出失败: {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"共导出 {len(sources)} 个片段、{total:,} 帧，用时 {elapsed:.2f} 秒"
+          f"（{total / elapsed:,.0f} 帧/秒）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+比赛回放：把一场点球大战（出场名单、逐次射门、随机数种子）保存为紧凑的二进制文件，
+可在 GameGraphics 中以 1 倍、4 倍或瞬时速度重放，也可以不渲染只做校验
+展示：文件读写、组合数据类型、异常处理、模块与包
+
+文件格式（小端）：
+    文件头      magic "PKRP" | 版本 | 规则标志 | 种子 | 常规轮次 | 轮次上限 | 双方比分
+    名单        守门员与出场球员名（长度前缀的 UTF-8 字符串）
+    射门记录    条数 | 每次射门 3 字节：轮次(uint16) + 打包字节(射门方/方向/扑救方向/是否进球)
+射门球员由轮次和出场名单推出，不重复保存。
+
+用法（在 game 目录下）：
+    python replay.py 回放文件 [--speed 1|4|instant] [--verify]
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+from typing import TYPE_CHECKING, BinaryIO, Callable, List, NamedTuple, Optional, Tuple
+
+from engine import DIRECTIONS, SIDES, ShootoutEngine, ShotRecord
+
+if TYPE_CHECKING:
+    from main import PenaltyGame
+
+MAGIC = b"PKRP"
+VERSION = 2
+# 版本 2 起种子按有符号 64 位整数保存（--seed 可以为负数）；版本 1 的无符号文件头仍可读取
+HEADERS = {1: struct.Struct("<4sBBQHHHH"), 2: struct.Struct("<4sBBqHHHH")}
+HEADER = HEADERS[VERSION]
+SHOT = struct.Struct("<HB")
+COUNT = struct.Struct("<I")
+
+# 规则标志位
+HAS_SEED, EARLY_STOP, SUDDEN_DEATH, SKILL_MODEL = 1, 2, 4, 8
+
+# 默认保存目录（相对 game 目录）
+REPLAY_DIR = "replays"
+
+# 回放速度：倍数，INSTANT 表示不播放动画直接显示结果
+SPEEDS = {"1": 1.0, "4": 4.0, "instant": float("inf")}
+INSTANT = SPEEDS["instant"]
+
+
+class ReplayError(ValueError):
+    """回放文件损坏或与规则重新计算的结果不一致"""
+
+
+class Replay(NamedTuple):
+    """一场比赛的完整回放数据 - 展示组合数据类型（命名元组）"""
+    seed: Optional[int]
+    my_players: Tuple[str, ...]
+    my_goalkeeper: Optional[str]
+    opponent_players: Tuple[str, ...]
+    opponent_goalkeeper: Optional[str]
+    rounds: int
+    max_rounds: int
+    early_stop: bool
+    sudden_death: bool
+    my_score: int
+    opponent_score: int
+    shots: Tuple[ShotRecord, ...]
+    # 比赛是否按 skill_model.SkillModel 判定进球（校验时需要用同样的模型重算）
+    skill_model: bool = False
+
+    @classmethod
+    def from_engine(cls, engine: ShootoutEngine) -> "Replay":
+        """从刚结束比赛的引擎中提取回放"""
+        return cls(
+            seed=engine.seed,
+            my_players=tuple(engine.my_players),
+            my_goalkeeper=engine.my_goalkeeper,
+            opponent_players=tuple(engine.opponent_players),
+            opponent_goalkeeper=engine.opponent_goalkeeper,
+            rounds=engine.rounds,
+            max_rounds=engine.max_rounds,
+            early_stop=engine.early_stop,
+            sudden_death=engine.sudden_death,
+            my_score=engine.my_score,
+            opponent_score=engine.opponent_score,
+            shots=tuple(engine.shots),
+            skill_model=engine.outcome_model is not None,
+        )
+
+    def to_bytes(self) -> bytes:
+        """编码为二进制回放数据"""
+        flags = (HAS_SEED if self.seed is not None else 0) | \
+            (EARLY_STOP if self.early_stop else 0) | (SUDDEN_DEATH if self.sudden_death else 0) | \
+            (SKILL_MODEL if self.skill_model else 0)
+        try:
+            parts = [HEADER.pack(MAGIC, VERSION, flags, self.seed or 0, self.rounds, self.max_rounds,
+                                 self.my_score, self.opponent_score)]
+        except struct.error as e:
+            raise ReplayError(f"无法保存回放（种子需在有符号 64 位整数范围内）: {e}")
+        parts.append(_pack_name(self.my_goalkeeper or ""))
+        parts.append(_pack_name(self.opponent_goalkeeper or ""))
+        for lineup in (self.my_players, self.opponent_players):
+            parts.append(bytes([len(lineup)]))
+            parts.extend(_pack_name(name) for name in lineup)
+        parts.append(COUNT.pack(len(self.shots)))
+        parts.extend(
+            SHOT.pack(shot.round_num,
+                      SIDES.index(shot.side) << 5 | DIRECTIONS.index(shot.direction) << 3 |
+                      DIRECTIONS.index(shot.keeper_guess) << 1 | shot.is_goal)
+            for shot in self.shots
+        )
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        """从二进制回放数据解码"""
+        try:
+            magic, version = struct.unpack_from("<4sB", data)
+            if magic != MAGIC:
+                raise ReplayError("不是点球大战回放文件")
+            header = HEADERS.get(version)
+            if header is None:
+                raise ReplayError(f"不支持的回放版本: {version}")
+            _, _, flags, seed, rounds, max_rounds, my_score, opponent_score = header.unpack_from(data)
+            offset = header.size
+            my_goalkeeper, offset = _unpack_name(data, offset)
+            opponent_goalkeeper, offset = _unpack_name(data, offset)
+            lineups = []
+            for _ in range(2):
+                size, offset = data[offset], offset + 1
+                lineup = []
+                for _ in range(size):
+                    name, offset = _unpack_name(data, offset)
+                    lineup.append(name)
+                lineups.append(tuple(lineup))
+            my_players, opponent_players = lineups
+            (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+            shots = []
+            for round_num, packed in SHOT.iter_unpack(data[offset:offset + count * SHOT.size]):
+                side = SIDES[packed >> 5 & 1]
+                lineup = my_players if side == "me" else opponent_players
+                shots.append(ShotRecord(round_num, side, lineup[(round_num - 1) % len(lineup)],
+                                        DIRECTIONS[packed >> 3 & 3], DIRECTIONS[packed >> 1 & 3],
+                                        bool(packed & 1)))
+            if len(shots) != count:
+                raise ReplayError("回放文件不完整")
+        except (struct.error, IndexError, UnicodeDecodeError, ZeroDivisionError) as e:
+            raise ReplayError(f"回放文件已损坏: {e}")
+        return cls(seed if flags & HAS_SEED else None, my_players, my_goalkeeper or None,
+                   opponent_players, opponent_goalkeeper or None, rounds, max_rounds,
+                   bool(flags & EARLY_STOP), bool(flags & SUDDEN_DEATH),
+                   my_score, opponent_score, tuple(shots), bool(flags & SKILL_MODEL))
+
+    def save(self, path: Optional[str] = None) -> str:
+        """写入回放文件，未指定路径时按时间命名保存到 REPLAY_DIR，返回文件路径"""
+        if path is None:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(REPLAY_DIR, time.strftime("%Y%m%d-%H%M%S") + ".pkr")
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.read(f)
+
+    @classmethod
+    def read(cls, stream: BinaryIO) -> "Replay":
+        return cls.from_bytes(stream.read())
+
+
+def _pack_name(name: str) -> bytes:
+    encoded = name.encode("utf-8")
+    if len(encoded) > 255:
+        raise ReplayError(f"名字过长: {name}")
+    return bytes([len(encoded)]) + encoded
+
+
+def _unpack_name(data: bytes, offset: int) -> Tuple[str, int]:
+    length = data[offset]
+    end = offset + 1 + length
+    if end > len(data):
+        raise ReplayError("回放文件不完整")
+    return data[offset + 1:end].decode("utf-8"), end
+
+
+def verify(replay: Replay, make_game: Optional[Callable[..., "PenaltyGame"]] = None) -> List[str]:
+    """
+    不渲染，按规则重新进行整场比赛来校验回放，返回不一致之处（空列表表示校验通过）
+
+    用回放中的种子重建 PenaltyGame（make_game 可替换为使用其他电脑策略的工厂），
+    电脑一方的选择、每次射门的结果、比分和比赛结束的时机都必须与记录一致。
+    """
+    if make_game is None:
+        from main import PenaltyGame as make_game
+    problems = []
+    if replay.skill_model:
+        # 能力值来自进程内的 Registry：使用外部名单的比赛需先登记同一份名单
+        from skill_model import SkillModel
+        game = make_game(seed=replay.seed, outcome_model=SkillModel())
+    else:
+        game = make_game(seed=replay.seed)
+    game.my_players = list(replay.my_players)
+    game.my_goalkeeper = replay.my_goalkeeper
+    game.opponent_players = list(replay.opponent_players)
+    game.opponent_goalkeeper = replay.opponent_goalkeeper
+    game.rounds, game.max_rounds = replay.rounds, replay.max_rounds
+    game.early_stop, game.sudden_death = replay.early_stop, replay.sudden_death
+    game.reset()
+
+    for index, shot in enumerate(replay.shots, 1):
+        where = f"第 {index} 次射门（第 {shot.round_num} 轮 {shot.shooter}）"
+        if shot.side == "me":
+            computer, chosen = game.opponent_keeper, shot.keeper_guess
+            shooter_strategy, keeper_strategy = None, game.opponent_keeper
+        else:
+            computer, chosen = game.opponent_shooter, shot.direction
+            shooter_strategy, keeper_strategy = game.opponent_shooter, None
+        # 没有种子时无法重现电脑的选择，只校验进球判定、比分和规则
+        if replay.seed is not None:
+            choice = computer(shot.round_num, shot.shooter)
+            if choice != chosen:
+                problems.append(f"{where}: 电脑应选择 {choice}，记录为 {chosen}")
+        is_goal = game.record_shot(shot.round_num, shot.side, shot.shooter,
+                                   shot.direction, shot.keeper_guess, record=False)
+        game.observe(shooter_strategy, keeper_strategy, shot.direction, shot.keeper_guess)
+        if is_goal != shot.is_goal:
+            problems.append(f"{where}: 进球判定应为 {is_goal}")
+        if index < len(replay.shots) and game.decided(shot.round_num, shot.side == "opponent"):
+            problems.append(f"{where}: 比赛此时已经结束，之后不应再有射门")
+
+    if (game.my_score, game.opponent_score) != (replay.my_score, replay.opponent_score):
+        problems.append(f"比分应为 {game.my_score}-{game.opponent_score}，"
+                        f"记录为 {replay.my_score}-{replay.opponent_score}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令行入口：校验或在窗口中重放回放文件"""
+    parser = argparse.ArgumentParser(description="点球大战回放")
+    parser.add_argument("path", help="回放文件")
+    parser.add_argument("--speed", choices=SPEEDS, default="1", help="播放速度（默认 1 倍）")
+    parser.add_argument("--verify", action="store_true", help="不渲染，只校验回放")
+    args = parser.parse_args(argv)
+
+    try:
+        replay = Replay.load(args.path)
+    except (OSError, ReplayError) as e:
+        print(f"读取回放失败: {e}")
+        return 1
+    print(f"回放: 我方 {replay.my_score} - {replay.opponent_score} 对方，"
+          f"共 {len(replay.shots)} 次射门，种子 {replay.seed}")
+
+    if args.verify:
+        if replay.seed is None:
+            print("回放没有记录随机数种子，不校验电脑一方的选择")
+        problems = verify(replay)
+        for problem in problems:
+            print(f"  {problem}")
+        print("校验通过" if not problems else f"发现 {len(problems)} 处问题")
+        return 1 if problems else 0
+
+    from game_graphics import GameGraphics
+
+    graphics = GameGraphics()
+    start = time.perf_counter()
+    graphics.play_replay(replay, SPEEDS[args.speed])
+    print(f"回放用时 {time.perf_counter() - start:.2f} 秒")
+    if graphics.is_open:
+        graphics.screen.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
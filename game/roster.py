@@ -0,0 +1,325 @@
+"""
+外部名单：从 CSV/JSON 文件读取球员和守门员（含能力值），解析一次后保存为紧凑的二进制缓存，
+源文件未变化时下次启动直接读取缓存，数千人的联赛名单也只需几毫秒
+展示：文件读写、组合数据类型、异常处理、模块与包
+
+源文件的列（JSON 为同名键的对象数组，或 {"players": [...]}）：
+    id, name, position, team, accuracy, power, composure, reach, reflexes
+只有 name 必填；id 默认为名字，position 为 GK（或 G / 守门员）的是守门员，能力值默认与
+players.Player / players.Goalkeeper 相同。
+
+缓存文件（与源文件同目录，文件名加 .cache 后缀，小端）：
+    文件头      magic "PKRO" | 版本 | 源文件大小 | 源文件 mtime_ns | 源文件 SHA-256 | 人数
+    字符串列    编号、名字、位置表、球队表（各为 个数 + 字节长度 + 以 \\0 连接的 UTF-8）
+    编码列      每人的位置编码和球队编码（uint16）
+    能力值列    accuracy / power / composure / reach / reflexes（float64）
+位置和球队以编码保存，按位置、按球队的索引直接由编码列分组得到。
+源文件大小和 mtime 不变时不读源文件；mtime 变了但内容哈希相同时沿用缓存并更新文件头。
+
+用法（在 game 目录下）：
+    python roster.py 名单.csv [--no-cache]
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from players import REGISTRY, Goalkeeper, Player, Registry
+
+MAGIC = b"PKRO"
+VERSION = 2
+HEADER = struct.Struct("<4sBQQ32sI")
+# 字符串列的个数和字节长度（单独记录个数，只含一个空字符串的列才能与空列区分）
+STRINGS = struct.Struct("<II")
+CACHE_SUFFIX = ".cache"
+
+# 能力值列与缺省值（与 Player / Goalkeeper 的默认参数一致）
+ATTRIBUTES = (("accuracy", 0.8), ("power", 0.7), ("composure", 0.7), ("reach", 0.5), ("reflexes", 0.5))
+# 表示守门员的位置写法，统一保存为 GK
+GOALKEEPER_POSITIONS = {"GK", "G", "GOALKEEPER", "守门员", "门将"}
+GK = "GK"
+
+
+class RosterError(ValueError):
+    """名单文件格式错误或内容不合法"""
+
+
+class RosterEntry(NamedTuple):
+    """名单中的一名球员或守门员 - 展示组合数据类型（命名元组）"""
+    id: str
+    name: str
+    position: str
+    team: str
+    accuracy: float
+    power: float
+    composure: float
+    reach: float
+    reflexes: float
+
+    @property
+    def is_goalkeeper(self) -> bool:
+        return self.position == GK
+
+
+class Roster:
+    """
+    按列存储的名单：字符串列为列表，位置和球队为编码数组，能力值为 float64 数组；
+    按编号、名字的字典索引在创建时建立，按位置、球队的分组在第一次查询时建立
+    """
+    __slots__ = ("ids", "names", "position_names", "team_names", "position_codes", "team_codes",
+                 "attributes", "_by_id", "_by_name", "_groups")
+
+    def __init__(self, ids: List[str], names: List[str], position_names: List[str], team_names: List[str],
+                 position_codes: array, team_codes: array, attributes: Dict[str, array]):
+        self.ids = ids
+        self.names = names
+        self.position_names = position_names
+        self.team_names = team_names
+        self.position_codes = position_codes
+        self.team_codes = team_codes
+        self.attributes = attributes
+        self._by_id = {player_id: row for row, player_id in enumerate(ids)}
+        self._by_name = {name: row for row, name in enumerate(names)}
+        if len(self._by_name) != len(names):
+            raise RosterError("名单中有重复的名字")
+        if len(self._by_id) != len(ids):
+            raise RosterError("名单中有重复的编号")
+        self._groups: Dict[str, List[List[int]]] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "Roster":
+        """由字典记录（CSV 行或 JSON 对象）建立名单，检查必填项和能力值范围"""
+        ids, names, position_codes, team_codes = [], [], array("H"), array("H")
+        positions: Dict[str, int] = {}
+        teams: Dict[str, int] = {}
+        attributes = {attribute: array("d") for attribute, _ in ATTRIBUTES}
+        for number, record in enumerate(records, 1):
+            if not isinstance(record, dict):
+                raise RosterError(f"第 {number} 条记录不是对象")
+            name = str(record.get("name") or "").strip()
+            if not name:
+                raise RosterError(f"第 {number} 条记录缺少名字")
+            position = str(record.get("position") or "").strip().upper()
+            position = GK if position in GOALKEEPER_POSITIONS else position
+            team = str(record.get("team") or "").strip()
+            ids.append(str(record.get("id") or "").strip() or name)
+            names.append(name)
+            position_codes.append(positions.setdefault(position, len(positions)))
+            team_codes.append(teams.setdefault(team, len(teams)))
+            for attribute, default in ATTRIBUTES:
+                raw = record.get(attribute)
+                try:
+                    value = default if raw in (None, "") else float(raw)
+                except (TypeError, ValueError):
+                    raise RosterError(f"{name} 的 {attribute} 不是数字: {raw!r}")
+                if not 0 <= value <= 1:
+                    raise RosterError(f"{name} 的 {attribute} 必须在 0~1 之间")
+                attributes[attribute].append(value)
+        return cls(ids, names, list(positions), list(teams), position_codes, team_codes, attributes)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return name in self._by_name
+
+    def entry(self, row: int) -> RosterEntry:
+        return RosterEntry(self.ids[row], self.names[row], self.position_names[self.position_codes[row]],
+                           self.team_names[self.team_codes[row]],
+                           *(self.attributes[attribute][row] for attribute, _ in ATTRIBUTES))
+
+    def by_id(self, player_id: str) -> Optional[RosterEntry]:
+        row = self._by_id.get(player_id)
+        return None if row is None else self.entry(row)
+
+    def by_name(self, name: str) -> Optional[RosterEntry]:
+        row = self._by_name.get(name)
+        return None if row is None else self.entry(row)
+
+    def _rows(self, column: str, value: str) -> List[int]:
+        """某一编码列取值为 value 的行（按名单顺序）"""
+        labels, codes = ((self.position_names, self.position_codes) if column == "position"
+                         else (self.team_names, self.team_codes))
+        groups = self._groups.get(column)
+        if groups is None:
+            groups = self._groups[column] = [[] for _ in labels]
+            for row, code in enumerate(codes):
+                groups[code].append(row)
+        try:
+            return groups[labels.index(value)]
+        except ValueError:
+            return []
+
+    def at_position(self, position: str) -> List[str]:
+        """某个位置的全部名字"""
+        position = position.upper()
+        position = GK if position in GOALKEEPER_POSITIONS else position
+        return [self.names[row] for row in self._rows("position", position)]
+
+    def in_team(self, team: str) -> List[str]:
+        """某支球队的全部名字（含守门员）"""
+        return [self.names[row] for row in self._rows("team", team)]
+
+    @property
+    def teams(self) -> List[str]:
+        return list(self.team_names)
+
+    def goalkeeper_names(self) -> List[str]:
+        return self.at_position(GK)
+
+    def player_names(self) -> List[str]:
+        """除守门员以外的全部球员"""
+        keeper = self.position_names.index(GK) if GK in self.position_names else -1
+        return [name for name, code in zip(self.names, self.position_codes) if code != keeper]
+
+    def register(self, registry: Registry = REGISTRY) -> Registry:
+        """把名单登记到 Registry（已登记的同名者更新能力值），供引擎和能力模型使用"""
+        for row, name in enumerate(self.names):
+            entry = self.entry(row)
+            person = registry.add(Goalkeeper(name) if entry.is_goalkeeper else Player(name))
+            for attribute in person.__slots__:
+                if attribute in self.attributes:
+                    setattr(person, attribute, getattr(entry, attribute))
+        return registry
+
+    # ---- 二进制缓存 ----
+
+    def to_bytes(self, size: int = 0, mtime_ns: int = 0, digest: bytes = b"") -> bytes:
+        """编码为缓存数据；size / mtime_ns / digest 描述生成缓存的源文件"""
+        parts = [HEADER.pack(MAGIC, VERSION, size, mtime_ns, digest, len(self))]
+        parts.extend(_pack_strings(column) for column in (self.ids, self.names, self.position_names, self.team_names))
+        columns = [self.position_codes, self.team_codes] + [self.attributes[attribute] for attribute, _ in ATTRIBUTES]
+        parts.extend(_little_endian(column).tobytes() for column in columns)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Tuple["Roster", Tuple[int, int, bytes]]:
+        """从缓存数据解码，同时返回源文件的 (大小, mtime_ns, 哈希)"""
+        try:
+            magic, version, size, mtime_ns, digest, count = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                raise RosterError("不是当前版本的名单缓存")
+            offset = HEADER.size
+            strings = []
+            for _ in range(4):
+                column, offset = _unpack_strings(data, offset)
+                strings.append(column)
+            columns = []
+            for typecode in ("H", "H") + ("d",) * len(ATTRIBUTES):
+                column = array(typecode)
+                end = offset + count * column.itemsize
+                column.frombytes(data[offset:end])
+                columns.append(_little_endian(column))
+                offset = end
+            if offset != len(data) or any(len(column) != count for column in strings[:2]):
+                raise RosterError("名单缓存不完整")
+            # 编码列中的每个编码都必须指向位置表 / 球队表中的一项
+            for codes, labels in ((columns[0], strings[2]), (columns[1], strings[3])):
+                if codes and max(codes) >= len(labels):
+                    raise RosterError("名单缓存的编码超出取值表")
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            raise RosterError(f"名单缓存已损坏: {e}")
+        attributes = {attribute: column for (attribute, _), column in zip(ATTRIBUTES, columns[2:])}
+        return cls(*strings, columns[0], columns[1], attributes), (size, mtime_ns, digest)
+
+
+def _pack_strings(strings: Sequence[str]) -> bytes:
+    blob = "\0".join(strings).encode("utf-8")
+    return STRINGS.pack(len(strings), len(blob)) + blob
+
+
+def _unpack_strings(data: bytes, offset: int) -> Tuple[List[str], int]:
+    count, length = STRINGS.unpack_from(data, offset)
+    start = offset + STRINGS.size
+    if start + length > len(data):
+        raise RosterError("名单缓存不完整")
+    strings = data[start:start + length].decode("utf-8").split("\0") if count else []
+    if len(strings) != count:
+        raise RosterError("名单缓存的字符串列个数不符")
+    return strings, start + length
+
+
+def _little_endian(column: array) -> array:
+    """缓存固定为小端；大端机器上读写时交换字节序"""
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def parse_roster(data: bytes, path: str) -> Roster:
+    """按扩展名把源文件内容解析为名单（.json 为 JSON，其他按 CSV）"""
+    try:
+        text = data.decode("utf-8-sig")
+        if path.lower().endswith(".json"):
+            records = json.loads(text)
+            if isinstance(records, dict):
+                records = records.get("players")
+            if not isinstance(records, list):
+                raise RosterError("JSON 名单必须是对象数组或 {\"players\": [...]}")
+        else:
+            records = csv.DictReader(text.splitlines())
+        return Roster.from_records(records)
+    except (UnicodeDecodeError, json.JSONDecodeError, csv.Error) as e:
+        raise RosterError(f"无法解析名单 {path}: {e}")
+
+
+def cache_path(path: str) -> str:
+    return path + CACHE_SUFFIX
+
+
+def load_roster(path: str, use_cache: bool = True) -> Roster:
+    """
+    读取名单文件 - 展示文件读写和异常处理
+    缓存与源文件的大小和 mtime 一致时直接使用缓存；否则读源文件，内容哈希一致时仍使用缓存，
+    不一致时重新解析并写入缓存。缓存损坏或无法写入时不影响读取
+    """
+    stat = os.stat(path)
+    cached, source = None, None
+    if use_cache:
+        try:
+            with open(cache_path(path), "rb") as f:
+                cached, source = Roster.from_bytes(f.read())
+        except (OSError, RosterError):
+            cached = None
+        if cached is not None and source[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached
+
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).digest()
+    roster = cached if cached is not None and source[2] == digest else parse_roster(data, path)
+    if use_cache:
+        try:
+            with open(cache_path(path), "wb") as f:
+                f.write(roster.to_bytes(stat.st_size, stat.st_mtime_ns, digest))
+        except OSError:
+            pass
+    return roster
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="读取名单文件并生成缓存")
+    parser.add_argument("path", help="CSV 或 JSON 名单文件")
+    parser.add_argument("--no-cache", action="store_true", help="不读写缓存")
+    args = parser.parse_args(argv)
+    try:
+        start = time.perf_counter()
+        roster = load_roster(args.path, use_cache=not args.no_cache)
+        elapsed = time.perf_counter() - start
+    except (OSError, RosterError) as e:
+        print(f"读取名单失败: {e}")
+        return 1
+    print(f"{args.path}: {len(roster)} 人（守门员 {len(roster.goalkeeper_names())} 人，"
+          f"球队 {len(roster.teams)} 支），用时 {elapsed * 1000:.1f} 毫秒")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
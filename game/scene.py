@@ -0,0 +1,152 @@
+"""
+球场场景数据：画面尺寸、球门、守门员姿势、文字位置和射门落点都以数据描述
+展示：组合数据类型（元组、字典、命名元组）、lambda函数、模块与包
+
+坐标均为世界坐标（原点在画面中心，y 轴向上，单位为 1200×700 画面上的像素）。
+几何图形是世界坐标中的折线，左右两侧共用同一份数据，另一侧通过镜像变换得到。
+不依赖 tkinter，窗口渲染（game_graphics）和离屏渲染（raster）共用这些数据。
+"""
+import math
+from typing import Iterable, NamedTuple, Tuple
+
+Point = Tuple[float, float]
+
+# 画面大小（像素）
+WIDTH, HEIGHT = 1200, 700
+
+# 颜色
+FIELD_COLOR = "#2d8659"   # 绿色草坪
+NET_COLOR = "#cccccc"
+
+# 球门尺寸与位置：两个球门分别在 x = ±GOAL_X
+GOAL_X = 550
+GOAL_WIDTH = 120
+GOAL_HEIGHT = 80
+GOAL_DEPTH = 40
+NET_LINES = 5
+
+# 守门员站在球门前 KEEPER_OFFSET 处；足球从中线另一侧 BALL_START_X 处射出
+KEEPER_OFFSET = 60
+BALL_START_X = 400
+BALL_RADIUS = 5
+# 射门落点与球门中心的高度差
+SHOT_OFFSET = 30
+
+# 文字位置与字号：比分（两行）、轮次、提示消息、最终结果
+SCORE_POS: Point = (-550, 330)
+SCORE_LINE_GAP = 30
+ROUND_POS: Point = (0, 300)
+MESSAGE_POS: Point = (0, -280)
+RESULT_POS: Point = (0, 0)
+FONT_SIZES = {"score": 20, "round": 20, "message": 18, "result": 24}
+
+# 球门所在侧的 x 方向，以及从射门方看的方向（L/C/R）对应的高度方向
+SIDE_SIGN = {"left": -1, "right": 1}
+OPPOSITE = {"left": "right", "right": "left"}
+DIRECTION_SIGN = {"L": -1, "C": 0, "R": 1}
+
+
+class Polyline(NamedTuple):
+    """世界坐标中的一条折线（闭合图形的首尾点相同）"""
+    points: Tuple[Point, ...]
+    color: str = "white"
+    width: float = 1
+
+
+def mirror(polyline: Polyline) -> Polyline:
+    """关于中线（x = 0）镜像"""
+    return polyline._replace(points=tuple((-x, y) for x, y in polyline.points))
+
+
+def translate(polyline: Polyline, dx: float, dy: float) -> Polyline:
+    return polyline._replace(points=tuple((x + dx, y + dy) for x, y in polyline.points))
+
+
+def place(polylines: Iterable[Polyline], x: float, y: float, side: str = "right") -> Tuple[Polyline, ...]:
+    """把按右侧定义的图形放到 (x, y)，side 为 "left" 时先镜像"""
+    flip = mirror if side == "left" else (lambda polyline: polyline)
+    return tuple(translate(flip(polyline), x, y) for polyline in polylines)
+
+
+def _circle(cx, cy, r, n=12) -> Tuple[Point, ...]:
+    """用正多边形近似圆（首尾相同的闭合折线）"""
+    points = tuple(
+        (cx + r * math.cos(2 * math.pi * i / n), cy + r * math.sin(2 * math.pi * i / n))
+        for i in range(n)
+    )
+    return points + points[:1]
+
+
+# 右侧球门（相对球门口中心，向左延伸）：门框 + 球网横线；左侧球门由镜像得到
+GOAL_SHAPE = (
+    Polyline(((0, -GOAL_HEIGHT / 2), (0, GOAL_HEIGHT / 2), (-GOAL_DEPTH, GOAL_HEIGHT / 2),
+              (-GOAL_DEPTH, -GOAL_HEIGHT / 2), (0, -GOAL_HEIGHT / 2)), "white", 4),
+) + tuple(
+    Polyline(((0, y), (-GOAL_DEPTH, y)), NET_COLOR, 1)
+    for y in (-GOAL_HEIGHT / 2 + (i + 1) * GOAL_HEIGHT / 6 for i in range(NET_LINES))
+)
+
+
+def goal_lines(x: float, y: float, side: str) -> Tuple[Polyline, ...]:
+    """球门口中心在 (x, y)、位于 side 侧的球门折线"""
+    return place(GOAL_SHAPE, x, y, side)
+
+
+# 静态球场：中线和两个球门
+FIELD = (Polyline(((0, HEIGHT / 2), (0, -HEIGHT / 2)), "white", 3),) + \
+    goal_lines(-GOAL_X, 0, "left") + goal_lines(GOAL_X, 0, "right")
+
+
+def _stick_figure(dy, arm_dy) -> Tuple[Polyline, ...]:
+    """
+    守门员小人（相对守门员位置的折线，y 轴向上）
+    dy 整体上下平移（扑救时身体移动），arm_dy 为手臂末端相对肩部的高度
+    """
+    segment = lambda a, b: Polyline((a, b), "yellow", 3)
+    return (
+        Polyline(_circle(0, 8 + dy, 8), "yellow", 3),       # 头部
+        segment((0, -8 + dy), (0, -25 + dy)),               # 身体
+        segment((0, -15 + dy), (-10, -15 + arm_dy + dy)),   # 左臂
+        segment((0, -15 + dy), (10, -15 + arm_dy + dy)),    # 右臂
+        segment((0, -25 + dy), (-5, -35 + dy)),             # 左腿
+        segment((0, -25 + dy), (5, -35 + dy)),              # 右腿
+    )
+
+
+# 守门员姿势：站立、向上扑、向下扑
+KEEPER_POSES = {
+    "stand": _stick_figure(0, -5),
+    "dive_up": _stick_figure(25, 15),
+    "dive_down": _stick_figure(-20, -15),
+}
+
+
+def goal_x(side: str) -> float:
+    """side 侧球门口的 x 坐标"""
+    return SIDE_SIGN[side] * GOAL_X
+
+
+def keeper_x(x: float, side: str) -> float:
+    """球门口在 x、位于 side 侧时守门员的 x 坐标（站在球门前）"""
+    return x - SIDE_SIGN[side] * KEEPER_OFFSET
+
+
+def shot_target(goal_side: str, direction: str) -> float:
+    """
+    射向 goal_side 侧球门、方向为 direction 时落点的高度
+    方向以射门方的视角为准，两侧球门互为镜像，因此同一方向在两侧的高度相反
+    """
+    return DIRECTION_SIGN.get(direction, 0) * SHOT_OFFSET * SIDE_SIGN[goal_side]
+
+
+def dive_pose(goal_side: str, guess: str) -> str:
+    """守门员扑向 guess 时的姿势"""
+    dive_y = shot_target(goal_side, guess)
+    return "stand" if dive_y == 0 else ("dive_up" if dive_y > 0 else "dive_down")
+
+
+def shot_path(side: str) -> Tuple[float, float, str]:
+    """从 side 侧射门：返回 (起点 x, 球门口 x, 球门所在侧)"""
+    target = OPPOSITE[side]
+    return -SIDE_SIGN[target] * BALL_START_X, goal_x(target), target
+
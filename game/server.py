@@ -0,0 +1,294 @@
+"""
+联网双人点球大战：asyncio 游戏服务器
+展示：面向对象编程、异常处理、组合数据类型（字典）、模块与包
+
+客户端通过 TCP 连接（本机或局域网），每行一个 JSON 消息。规则判定全部在服务器端的
+ShootoutEngine 中完成，客户端只发送 L/C/R 选择，一个进程可以同时进行成千上万场比赛。
+
+协议（客户端 -> 服务器）：
+    {"op": "join", "name": 名字, "players": [5 名球员], "goalkeeper": 守门员}  名单可省略
+    {"op": "move", "kick": 射门序号, "direction": "L"|"C"|"R"}
+协议（服务器 -> 客户端）：
+    {"op": "waiting"}                                   等待匹配对手
+    {"op": "start", "match": 编号, "side": "home"|"away", "opponent": 对手名字}
+    {"op": "turn", "kick": 序号, "round": 轮次, "role": "shoot"|"keep", "shooter": 射门球员}
+    {"op": "result", "kick": 序号, "round": 轮次, "side": 射门方, "shooter": 球员,
+     "direction": 方向, "guess": 扑救方向, "goal": 是否进球, "score": [主队, 客队]}
+    {"op": "end", "score": [主队, 客队], "winner": "home"|"away"|null, "forfeit": 是否因对手掉线}
+    {"op": "error", "message": 说明}
+
+用法（在 game 目录下）：python server.py [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+from typing import Dict, List, Optional, Tuple
+
+from engine import DIRECTIONS, ShootoutEngine
+from players import ALL_GOALKEEPERS, ALL_PLAYERS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 玩家超过该秒数未出招时由服务器随机代选
+MOVE_TIMEOUT = 30.0
+# 单条消息的最大长度（字节）
+MAX_LINE = 4096
+# 监听队列长度：大量玩家同时连接时避免因队列溢出而触发 TCP 重传（约 1 秒）
+BACKLOG = 4096
+
+# 双方在引擎中的身份：主队对应 "me"，客队对应 "opponent"
+SIDE_NAMES = {"me": "home", "opponent": "away"}
+
+
+def encode(**message) -> bytes:
+    """把一条消息编码为一行 JSON"""
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class ProtocolError(ValueError):
+    """客户端发送了无法解析或不符合协议的消息"""
+
+
+class PlayerLeft(ConnectionError):
+    """玩家连接断开（记录是哪一方，用于判负）"""
+
+    def __init__(self, connection: "Connection", reason: str):
+        super().__init__(reason)
+        self.connection = connection
+
+
+class Connection:
+    """一个已连接的玩家 - 展示面向对象编程"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.name = "玩家"
+        self.players: List[str] = list(ALL_PLAYERS[:5])
+        self.goalkeeper: str = ALL_GOALKEEPERS[0]
+        # 比赛结束（或连接作废）时置位，处理该连接的协程随后关闭连接
+        self.finished = asyncio.Event()
+        self._outbox: List[bytes] = []
+
+    @property
+    def alive(self) -> bool:
+        return not (self.reader.at_eof() or self.writer.is_closing())
+
+    def queue(self, data: bytes):
+        """把已编码的消息放入待发送缓冲，由 flush 一次写出（减少系统调用）"""
+        self._outbox.append(data)
+
+    async def flush(self):
+        if not self._outbox:
+            return
+        data, self._outbox = b"".join(self._outbox), []
+        try:
+            self.writer.write(data)
+            await self.writer.drain()
+        except (ConnectionError, RuntimeError) as e:
+            raise PlayerLeft(self, f"发送失败: {e}")
+
+    async def send(self, **message):
+        self.queue(encode(**message))
+        await self.flush()
+
+    async def receive(self) -> Dict:
+        """读取一条消息；连接断开或单行超长时抛出 PlayerLeft"""
+        try:
+            line = await self.reader.readline()
+        except (ConnectionError, ValueError) as e:
+            raise PlayerLeft(self, f"读取失败: {e}")
+        if not line:
+            raise PlayerLeft(self, "连接已断开")
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ProtocolError(f"无法解析的消息: {e}")
+        if not isinstance(message, dict):
+            raise ProtocolError("消息必须是 JSON 对象")
+        return message
+
+    async def join(self):
+        """读取 join 消息，设置名字和可选的出场名单"""
+        message = await self.receive()
+        if message.get("op") != "join":
+            raise ProtocolError("第一条消息必须是 join")
+        self.name = str(message.get("name") or self.name)[:32]
+        players = message.get("players")
+        if players is not None:
+            if not isinstance(players, list) or len(players) != 5 or len(set(players)) != 5:
+                raise ProtocolError("必须选择5名不同的球员")
+            self.players = [str(name) for name in players]
+        self.goalkeeper = str(message.get("goalkeeper") or self.goalkeeper)
+
+    async def read_move(self, kick: int) -> str:
+        """等待第 kick 脚的有效方向；无效输入回复 error 后继续等待"""
+        while True:
+            try:
+                message = await self.receive()
+            except ProtocolError as e:
+                await self.send(op="error", message=str(e))
+                continue
+            # 忽略过期的出招（例如超时后才到达的上一脚选择）
+            if message.get("op") != "move" or message.get("kick") != kick:
+                continue
+            direction = str(message.get("direction", "")).strip().upper()
+            if direction in DIRECTIONS:
+                return direction
+            await self.send(op="error", message=f"无效方向: {direction}，必须是 L、C 或 R")
+
+    def close(self):
+        self.finished.set()
+        if not self.writer.is_closing():
+            self.writer.close()
+
+
+class GameServer:
+    """点球大战服务器：按到达顺序两两配对，每场比赛一个协程 - 展示面向对象编程"""
+
+    def __init__(self, rounds: int = 5, move_timeout: float = MOVE_TIMEOUT,
+                 rng: Optional[random.Random] = None):
+        self.rounds = rounds
+        self.move_timeout = move_timeout
+        self.rng = rng or random.Random()
+        self._waiting: Optional[Connection] = None
+        self._match_ids = itertools.count(1)
+        # 运行统计：进行中/已完成的比赛数和已结算的射门数
+        self.stats = {"active": 0, "finished": 0, "kicks": 0, "forfeits": 0}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """每个连接一个协程：完成握手后进入匹配，比赛结束后关闭连接"""
+        connection = Connection(reader, writer)
+        try:
+            await connection.join()
+            opponent, self._waiting = self._waiting, None
+            if opponent is not None and not opponent.alive:
+                # 排队的玩家已经离开，唤醒其协程关闭连接
+                opponent.close()
+                opponent = None
+            if opponent is None:
+                # 没有对手在等待：排队，由下一位到达的玩家所在的协程主持比赛
+                self._waiting = connection
+                await connection.send(op="waiting")
+                await connection.finished.wait()
+            else:
+                await self.run_match(opponent, connection)
+        except ProtocolError as e:
+            try:
+                await connection.send(op="error", message=str(e))
+            except PlayerLeft:
+                pass
+        except PlayerLeft:
+            pass
+        finally:
+            if self._waiting is connection:
+                self._waiting = None
+            connection.close()
+
+    async def _moves(self, shooter: Connection, keeper: Connection, kick: int,
+                     round_num: int, name: str) -> Tuple[str, str]:
+        """
+        同时通知射门方和守门方，再同时读取双方方向（共用一个超时）；
+        只有超时仍未出招的一方由服务器随机代选，先到的选择不受另一方快慢影响
+        """
+        # 上一脚的结果和这一脚的 turn 合并为一次写出
+        shooter.queue(encode(op="turn", kick=kick, round=round_num, role="shoot", shooter=name))
+        keeper.queue(encode(op="turn", kick=kick, round=round_num, role="keep", shooter=name))
+        await shooter.flush()
+        await keeper.flush()
+
+        reads = {role: asyncio.ensure_future(connection.read_move(kick))
+                 for role, connection in (("shoot", shooter), ("keep", keeper))}
+        # 任何一方掉线（PlayerLeft）时立即返回，不必等到超时
+        done, pending = await asyncio.wait(reads.values(), timeout=self.move_timeout,
+                                           return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        # task.result() 会重新抛出读取中的 PlayerLeft
+        moves = {role: task.result() for role, task in reads.items() if task in done}
+        choice = lambda role: moves.get(role) or self.rng.choice(DIRECTIONS)
+        return choice("shoot"), choice("keep")
+
+    async def run_match(self, home: Connection, away: Connection):
+        """进行一场比赛：规则由引擎判定，每脚结果同时广播给双方"""
+        match_id = next(self._match_ids)
+        engine = ShootoutEngine(home.players, home.goalkeeper, self.rounds,
+                                opponent_name=away.name, opponent_players=away.players,
+                                opponent_goalkeeper=away.goalkeeper, rng=self.rng)
+        engine.reset()
+        both = (home, away)
+        self.stats["active"] += 1
+        try:
+            await home.send(op="start", match=match_id, side="home", opponent=away.name)
+            await away.send(op="start", match=match_id, side="away", opponent=home.name)
+            kick = 0
+            for round_num in range(1, engine.round_limit + 1):
+                for side, shooter, keeper in (("me", home, away), ("opponent", away, home)):
+                    kick += 1
+                    name = engine.shooter_for(round_num) if side == "me" else engine.opponent_for(round_num)
+                    direction, guess = await self._moves(shooter, keeper, kick, round_num, name)
+                    is_goal = engine.record_shot(round_num, side, name, direction, guess, record=False)
+                    self.stats["kicks"] += 1
+                    # 结果只编码一次，暂存到双方的发送缓冲，随下一条消息一起发出
+                    result = encode(op="result", kick=kick, round=round_num, side=SIDE_NAMES[side],
+                                    shooter=name, direction=direction, guess=guess, goal=is_goal,
+                                    score=[engine.my_score, engine.opponent_score])
+                    home.queue(result)
+                    away.queue(result)
+                    if engine.decided(round_num, opponent_kicked=side == "opponent"):
+                        await self._finish(engine, both)
+                        return
+            await self._finish(engine, both)
+        except PlayerLeft as e:
+            # 一方掉线：判另一方获胜
+            self.stats["forfeits"] += 1
+            winner = away if e.connection is home else home
+            try:
+                await winner.send(op="end", score=[engine.my_score, engine.opponent_score],
+                                  winner="home" if winner is home else "away", forfeit=True)
+            except PlayerLeft:
+                pass
+        finally:
+            self.stats["active"] -= 1
+            self.stats["finished"] += 1
+            for connection in both:
+                connection.close()
+
+    async def _finish(self, engine: ShootoutEngine, both: Tuple[Connection, Connection]):
+        mine, theirs = engine.my_score, engine.opponent_score
+        winner = "home" if mine > theirs else ("away" if mine < theirs else None)
+        end = encode(op="end", score=[mine, theirs], winner=winner, forfeit=False)
+        for connection in both:
+            connection.queue(end)
+            await connection.flush()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """开始监听；port 为 0 时由系统分配端口（见 server.sockets[0].getsockname()）"""
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE, backlog=BACKLOG)
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    server = GameServer()
+    listener = await server.start(host, port)
+    print(f"点球大战服务器已启动: {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="联网点球大战服务器")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="监听地址（局域网可用 0.0.0.0）")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n服务器已停止")
+
+
+if __name__ == "__main__":
+    main()
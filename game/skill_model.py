@@ -0,0 +1,102 @@
+"""
+球员能力与疲劳模型：按射门球员、守门员、射门方向、扑救方向和轮次给出进球概率
+展示：面向对象编程、组合数据类型（元组、字典）
+
+每对 (射门球员, 守门员) 的 3×3 进球概率矩阵按轮次预先算好并缓存，
+引擎热循环中每次射门只需一次查表和一次随机数比较。
+"""
+from typing import Dict, List, Sequence, Tuple
+
+from players import REGISTRY, Goalkeeper, Registry
+
+# 一个轮次的 3×3 矩阵按行展开：下标为 射门方向编码 * 3 + 扑救方向编码
+Matrix = Tuple[float, ...]
+# 一对球员的全部轮次矩阵
+PairTable = Tuple[Matrix, ...]
+
+# 未指定守门员时使用的平均能力守门员
+DEFAULT_KEEPER = Goalkeeper("")
+
+
+class SkillModel:
+    """能力/压力/疲劳进球概率模型 - 展示面向对象编程"""
+
+    def __init__(self, registry: Registry = REGISTRY, pressure: float = 0.04,
+                 fatigue: float = 0.03, horizon: int = 10):
+        self.registry = registry
+        # 每轮增加的心理压力、守门员每轮下降的扑救范围
+        self.pressure = pressure
+        self.fatigue = fatigue
+        # 预先计算的轮次数，超过后沿用最后一轮的矩阵
+        self.horizon = horizon
+        self._cache: Dict[Tuple[int, int], PairTable] = {}
+
+    def goal_probability(self, shooter, keeper, direction: int, guess: int, round_num: int) -> float:
+        """
+        单次射门的进球概率
+        - 射正率：accuracy，随轮次增加的压力由 composure 抵消一部分
+        - 扑对方向：扑救率取决于 reach（受疲劳影响）与射门力量 power 的对抗，中路更容易扑
+        - 扑错方向：相邻方向时守门员仍有凭 reflexes 碰到球的机会
+        """
+        stage = round_num - 1
+        pressure = min(1.0, self.pressure * stage) * (1 - shooter.composure)
+        on_target = shooter.accuracy * (1 - pressure)
+
+        reach = keeper.reach * max(0.0, 1 - self.fatigue * stage)
+        if direction == guess:
+            save = reach * (1 - 0.5 * shooter.power)
+            if direction == 1:
+                save = min(1.0, save * 1.5)
+        elif abs(direction - guess) == 1:
+            save = 0.15 * keeper.reflexes * (1 - shooter.power)
+        else:
+            save = 0.0
+        return on_target * (1 - save)
+
+    def matrix(self, shooter, keeper, round_num: int) -> Matrix:
+        """某一轮的 3×3 进球概率矩阵（按行展开）"""
+        return tuple(
+            self.goal_probability(shooter, keeper, direction, guess, round_num)
+            for direction in range(3)
+            for guess in range(3)
+        )
+
+    def table(self, shooter_id: int, keeper_id: int) -> PairTable:
+        """一对 (射门球员, 守门员) 全部轮次的矩阵，结果缓存"""
+        key = (shooter_id, keeper_id)
+        table = self._cache.get(key)
+        if table is None:
+            shooter = self.registry[shooter_id]
+            keeper = self.registry[keeper_id] if keeper_id >= 0 else DEFAULT_KEEPER
+            table = tuple(self.matrix(shooter, keeper, round_num)
+                          for round_num in range(1, self.horizon + 1))
+            self._cache[key] = table
+        return table
+
+    def lineup_tables(self, shooter_ids: Sequence[int], keeper_id: int) -> List[PairTable]:
+        """整套出场名单面对同一守门员的矩阵表，按出场顺序排列"""
+        return [self.table(shooter_id, keeper_id) for shooter_id in shooter_ids]
+
+    def lineup_matrices(self, shooter_ids: Sequence[int], keeper_id: int,
+                        rounds: int = 5) -> List[List[List[float]]]:
+        """
+        按轮次排列的 轮次×3×3 进球概率（第 r 轮由名单中对应球员射门），可直接交给 montecarlo / exact
+
+        至少给出 rounds 轮，并一直覆盖到各球员的矩阵都不再随轮次变化（horizon）之后的一整轮名单：
+        此后第 r 轮与第 r - 名单人数 轮相同，以名单人数作为 cycle 传入即与引擎的突然死亡一致。
+        """
+        tables = self.lineup_tables(shooter_ids, keeper_id)
+        return [
+            [list(tables[(round_num - 1) % len(tables)][min(round_num, self.horizon) - 1][d * 3:d * 3 + 3])
+             for d in range(3)]
+            for round_num in range(1, max(rounds, self.horizon + len(tables) - 1) + 1)
+        ]
+
+    def lookup(self, shooter_id: int, keeper_id: int, direction: int, guess: int,
+               round_num: int) -> float:
+        """查表得到进球概率"""
+        return self.table(shooter_id, keeper_id)[min(round_num, self.horizon) - 1][direction * 3 + guess]
+
+    def clear_cache(self):
+        """球员能力值变化后需要清空缓存"""
+        self._cache.clear()
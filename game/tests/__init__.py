@@ -0,0 +1,3 @@
+"""
+测试包：在 game 目录下以 python -m pytest tests 运行
+"""
@@ -0,0 +1,141 @@
+"""引擎规则：提前结束、突然死亡、轮次上限与策略回调"""
+import random
+import unittest
+
+from engine import MAX_ROUNDS, ShootoutEngine, fixed_strategy, random_strategy, sequence_strategy
+from players import ALL_GOALKEEPERS, ALL_PLAYERS
+
+LINEUP = ALL_PLAYERS[:5]
+OPPONENTS = ALL_PLAYERS[5:]
+
+
+def make_engine(**kwargs):
+    return ShootoutEngine(LINEUP, ALL_GOALKEEPERS[0], opponent_players=OPPONENTS,
+                          opponent_goalkeeper=ALL_GOALKEEPERS[1], **kwargs)
+
+
+class Recorder:
+    """记录收到的 (轮次, 射门球员) 与 observe 到的方向的学习型策略"""
+
+    def __init__(self, direction):
+        self.direction = direction
+        self.calls = []
+        self.seen = []
+
+    def __call__(self, round_num, shooter):
+        self.calls.append((round_num, shooter))
+        return self.direction
+
+    def observe(self, direction):
+        self.seen.append(direction)
+
+
+class EngineRulesTest(unittest.TestCase):
+    def test_early_stop_when_trailing_side_cannot_catch_up(self):
+        # 我方每球必进、对方每球必失：第 3 轮对方射失后 3:0，剩余 2 轮追不上
+        engine = make_engine()
+        score = engine.play(fixed_strategy("L"), fixed_strategy("R"),
+                            fixed_strategy("L"), fixed_strategy("L"))
+        self.assertEqual(score, (3, 0))
+        self.assertEqual(engine.kicks, 6)
+        self.assertEqual(len(engine.shots), 6)
+
+    def test_early_stop_after_my_kick(self):
+        # 对方每球必失，我方第 3 轮射失：第 4 轮我方进球后 3:0，对方剩余 2 脚追不上，不再射第 4 轮
+        engine = make_engine()
+        score = engine.play(sequence_strategy("LLRL"), fixed_strategy("R"),
+                            fixed_strategy("L"), fixed_strategy("L"))
+        self.assertEqual(score, (3, 0))
+        self.assertEqual(engine.kicks, 7)
+        self.assertEqual(engine.shots[-1].side, "me")
+
+    def test_without_early_stop_all_regular_kicks_are_taken(self):
+        engine = make_engine(early_stop=False)
+        score = engine.play(fixed_strategy("L"), fixed_strategy("R"),
+                            fixed_strategy("L"), fixed_strategy("L"))
+        self.assertEqual(score, (5, 0))
+        self.assertEqual(engine.kicks, 10)
+
+    def test_sudden_death_rotates_the_lineup(self):
+        # 常规轮次双方全进，第 7 轮我方守门员才扑对方向
+        engine = make_engine()
+        score = engine.play(fixed_strategy("L"), fixed_strategy("R"),
+                            fixed_strategy("L"), sequence_strategy("RRRRRRL"))
+        self.assertEqual(score, (7, 6))
+        self.assertEqual(engine.kicks, 14)
+        shots = engine.shots
+        self.assertEqual([shot.shooter for shot in shots if shot.side == "me"],
+                         list(LINEUP) + list(LINEUP[:2]))
+        self.assertEqual([shot.shooter for shot in shots if shot.side == "opponent"],
+                         list(OPPONENTS) + list(OPPONENTS[:2]))
+        self.assertFalse(shots[-1].is_goal)
+
+    def test_round_cap_ends_in_a_draw(self):
+        always = fixed_strategy("L"), fixed_strategy("R"), fixed_strategy("L"), fixed_strategy("R")
+        engine = make_engine(max_rounds=8)
+        self.assertEqual(engine.play(*always), (8, 8))
+        self.assertEqual(engine.kicks, 16)
+
+        engine = make_engine()
+        self.assertEqual(engine.play(*always), (MAX_ROUNDS, MAX_ROUNDS))
+        self.assertEqual(engine.kicks, 2 * MAX_ROUNDS)
+
+    def test_no_sudden_death_stops_after_regular_rounds(self):
+        engine = make_engine(sudden_death=False)
+        self.assertEqual(engine.play(fixed_strategy("L"), fixed_strategy("R"),
+                                     fixed_strategy("L"), fixed_strategy("R")), (5, 5))
+        self.assertEqual(engine.kicks, 10)
+
+    def test_max_rounds_below_regular_rounds_is_rejected(self):
+        with self.assertRaises(ValueError):
+            make_engine(rounds=5, max_rounds=4)
+
+    def test_strategy_callbacks_and_observe(self):
+        my_shooter, opponent_keeper = Recorder("L"), Recorder("R")
+        opponent_shooter, my_keeper = Recorder("L"), Recorder("L")
+        engine = make_engine()
+        engine.play(my_shooter, opponent_keeper, opponent_shooter, my_keeper)
+        # 我方射门：射门方与守门员都收到 (轮次, 我方球员)
+        expected = [(round_num, LINEUP[round_num - 1]) for round_num in (1, 2, 3)]
+        self.assertEqual(my_shooter.calls, expected)
+        self.assertEqual(opponent_keeper.calls, expected)
+        self.assertEqual(my_keeper.calls,
+                         [(round_num, OPPONENTS[round_num - 1]) for round_num in (1, 2, 3)])
+        # 守门员看到射门方向，射门方看到扑救方向
+        self.assertEqual(opponent_keeper.seen, ["L"] * 3)
+        self.assertEqual(my_shooter.seen, ["R"] * 3)
+        self.assertEqual(my_keeper.seen, ["L"] * 3)
+        self.assertEqual(opponent_shooter.seen, ["L"] * 3)
+
+    def test_validate_rejects_bad_directions(self):
+        engine = make_engine()
+        bad = fixed_strategy("X")
+        with self.assertRaises(ValueError):
+            engine.play(bad, fixed_strategy("L"), fixed_strategy("L"), fixed_strategy("L"),
+                        validate=True)
+        # 合法但大小写不规范的方向会被规范化
+        score = engine.play(fixed_strategy(" l "), fixed_strategy("R"), fixed_strategy("L"),
+                            fixed_strategy("L"), validate=True)
+        self.assertEqual(score, (3, 0))
+
+    def test_play_agrees_with_decided(self):
+        # 热循环内联的结束判断与 decided() 一致：按记录逐脚重放，只在最后一脚判定结束
+        rng = random.Random(7)
+        for options in ({}, {"early_stop": False}, {"sudden_death": False}, {"max_rounds": 6}):
+            engine = make_engine(**options)
+            replay = make_engine(**options)
+            for _ in range(300):
+                engine.play(*(random_strategy(rng) for _ in range(4)))
+                shots = engine.shots
+                replay.reset()
+                for index, shot in enumerate(shots):
+                    replay.record_shot(shot.round_num, shot.side, shot.shooter,
+                                       shot.direction, shot.keeper_guess)
+                    over = replay.decided(shot.round_num, shot.side == "opponent")
+                    self.assertEqual(over, index == len(shots) - 1, (options, shots))
+                self.assertEqual((replay.my_score, replay.opponent_score),
+                                 (engine.my_score, engine.opponent_score))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""精确解与蒙特卡洛模拟互相校验（含按名单轮换的突然死亡）"""
+import unittest
+from unittest import mock
+
+import exact
+from montecarlo import StrategyMix, simulate
+from players import Goalkeeper, Player, Registry
+from skill_model import SkillModel
+
+GAMES = 200_000
+# 20 万场时比分概率的标准误差不超过约 0.0011
+TOLERANCE = 0.006
+
+
+def skill_lineups():
+    """
+    两套强弱分明的名单：我方前三人很弱、后两人几乎必进，对方相反。
+    常规轮次后战平的比赛很多，突然死亡由谁轮到射门决定，只用最后一名射手会得到完全不同的胜率
+    """
+    registry = Registry()
+    add = lambda prefix, accuracies: [registry.add(Player(f"{prefix}{i}", accuracy=a, power=0.9, composure=0.9)).id
+                                      for i, a in enumerate(accuracies)]
+    mine, theirs = add("A", [0.3, 0.3, 0.3, 0.99, 0.99]), add("B", [0.99, 0.99, 0.3, 0.3, 0.3])
+    my_keeper = registry.add(Goalkeeper("K1", reach=0.6)).id
+    their_keeper = registry.add(Goalkeeper("K2", reach=0.6)).id
+    model = SkillModel(registry)
+    return {
+        "my_goal_matrix": model.lineup_matrices(mine, their_keeper),
+        "opponent_goal_matrix": model.lineup_matrices(theirs, my_keeper),
+        "my_cycle": len(mine),
+        "opponent_cycle": len(theirs),
+    }
+
+
+class ExactTest(unittest.TestCase):
+    def assertAgrees(self, solution, simulation):
+        self.assertAlmostEqual(solution.win, simulation.win, delta=TOLERANCE)
+        self.assertAlmostEqual(solution.draw, simulation.draw, delta=TOLERANCE)
+        self.assertAlmostEqual(solution.kicks, simulation.kicks, delta=0.05)
+        self.assertLess(exact.max_deviation(simulation, solution), TOLERANCE)
+
+    def test_uniform_matches_simulation(self):
+        self.assertAgrees(exact.solve(), simulate(GAMES, seed=0))
+
+    def test_biased_strategies_without_early_stop(self):
+        me = StrategyMix(shot=(0.5, 0.3, 0.2), dive=(0.2, 0.2, 0.6))
+        kwargs = dict(early_stop=False, max_rounds=8,
+                      my_goal_matrix=[[0.9, 0.8, 0.7], [0.8, 0.6, 0.8], [0.7, 0.8, 0.9]])
+        self.assertAgrees(exact.solve(me, **kwargs), simulate(GAMES, me, seed=1, **kwargs))
+
+    def test_skill_lineups_rotate_in_sudden_death(self):
+        kwargs = skill_lineups()
+        regulation = exact.solve(sudden_death=False, **kwargs)
+        self.assertGreater(regulation.draw, 0.2)
+
+        solution = exact.solve(**kwargs)
+        self.assertAgrees(solution, simulate(GAMES, seed=2, **kwargs))
+        # 只用最后一名射手进行突然死亡时结果明显不同，说明轮换确实被覆盖到
+        last_shooter = exact.solve(my_goal_matrix=kwargs["my_goal_matrix"][:5],
+                                   opponent_goal_matrix=kwargs["opponent_goal_matrix"][:5])
+        self.assertGreater(abs(last_shooter.win - solution.win), 0.1)
+
+    def test_closed_form_matches_round_by_round(self):
+        kwargs = skill_lineups()
+        closed = exact.solve(**kwargs)
+        exact._solve.cache_clear()
+        self.addCleanup(exact._solve.cache_clear)
+        # EPSILON 为 0 时不使用闭式解，逐轮推进到轮次上限
+        with mock.patch.object(exact, "EPSILON", 0.0):
+            stepped = exact.solve(**kwargs)
+        self.assertAlmostEqual(closed.win, stepped.win, places=12)
+        self.assertAlmostEqual(closed.kicks, stepped.kicks, places=9)
+        self.assertLess(exact.max_deviation(stepped, closed), 1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""球员选择界面：可用性索引与下拉框候选的增量刷新"""
+import random
+import unittest
+
+from game_gui import AvailabilityIndex
+
+
+class AvailabilityIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.names = [f"P{i:03d}" for i in range(300)]
+        self.index = AvailabilityIndex(self.names)
+
+    def test_unrelated_change_does_not_touch_suggestions(self):
+        index = self.index
+        shown = index.search("P00", 5)
+        version = index.version
+        # 不在候选中、也不会挤进候选的球员被选走，不影响候选
+        index.claim("P250")
+        self.assertFalse(index.touches(version, "P00", shown, 5))
+        # 候选中的球员被选走必须重建
+        index.claim("P003")
+        self.assertTrue(index.touches(version, "P00", shown, 5))
+
+    def test_released_player_inside_truncated_window(self):
+        index = self.index
+        index.claim("P001")
+        shown, version = index.search("", 3), index.version
+        self.assertEqual(shown, ["P000", "P002", "P003"])
+        index.release("P001")
+        self.assertTrue(index.touches(version, "", shown, 3))
+        version = index.version
+        index.claim("P200")
+        index.release("P200")
+        # 截断位置之后的球员变化不影响前 3 名候选
+        self.assertFalse(index.touches(version, "", index.search("", 3), 3))
+
+    def test_touches_is_never_wrong(self):
+        # 随机选择/取消选择：touches 为 False 时候选必须与重新搜索的结果一致
+        rng = random.Random(5)
+        index = self.index
+        queries = ["", "P0", "1", "99", "P2"]
+        cache = {query: (index.version, index.search(query, 20)) for query in queries}
+        for _ in range(2000):
+            name = rng.choice(self.names)
+            (index.claim if index.is_available(name) else index.release)(name)
+            for query in queries:
+                version, shown = cache[query]
+                if not index.touches(version, query, shown, 20):
+                    self.assertEqual(index.search(query, 20), shown)
+                    cache[query] = (index.version, shown)
+                else:
+                    cache[query] = (index.version, index.search(query, 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""回放：二进制编码往返与按规则重算校验"""
+import unittest
+
+import replay
+from main import PenaltyGame
+from replay import Replay, ReplayError, verify
+
+
+def finished_game(seed, **kwargs):
+    """双方都由 AI 出招，不经过界面打完一场比赛"""
+    game = PenaltyGame(seed=seed, **kwargs)
+    game.enable_autopilot()
+    game.play(game.my_shooter, game.opponent_keeper, game.opponent_shooter, game.my_keeper)
+    return game
+
+
+class ReplayTest(unittest.TestCase):
+    def test_round_trip_and_verify(self):
+        # 负数种子（--seed -1 等）与有符号 64 位整数的两端都能保存
+        for seed in (12345, -12345, 2 ** 63 - 1, -2 ** 63):
+            recorded = Replay.from_engine(finished_game(seed))
+            decoded = Replay.from_bytes(recorded.to_bytes())
+            self.assertEqual(decoded, recorded)
+            self.assertEqual(decoded.seed, seed)
+            self.assertEqual(verify(decoded), [])
+        # 没有种子的回放只校验进球判定与规则
+        unseeded = recorded._replace(seed=None)
+        decoded = Replay.from_bytes(unseeded.to_bytes())
+        self.assertIsNone(decoded.seed)
+        self.assertEqual(verify(decoded), [])
+
+    def test_verify_reports_tampered_shot(self):
+        recorded = Replay.from_engine(finished_game(-7))
+        first = recorded.shots[0]
+        shots = (first._replace(is_goal=not first.is_goal),) + recorded.shots[1:]
+        self.assertTrue(verify(recorded._replace(shots=shots)))
+
+    def test_reads_version_1_files(self):
+        # 版本 1 按无符号整数保存种子，超出有符号范围的种子也能读回
+        recorded = Replay.from_engine(finished_game(5))
+        data = recorded.to_bytes()
+        fields = list(replay.HEADER.unpack_from(data))
+        fields[1], fields[3] = 1, 2 ** 63 + 5
+        old = replay.HEADERS[1].pack(*fields) + data[replay.HEADER.size:]
+        self.assertEqual(Replay.from_bytes(old), recorded._replace(seed=2 ** 63 + 5))
+
+    def test_seed_out_of_range_is_rejected(self):
+        recorded = Replay.from_engine(finished_game(1))._replace(seed=2 ** 63)
+        with self.assertRaises(ReplayError):
+            recorded.to_bytes()
+
+    def test_corrupt_data(self):
+        data = Replay.from_engine(finished_game(3)).to_bytes()
+        for broken in (b"XXXX" + data[4:], data[:4] + bytes([99]) + data[5:], data[:-1], data[:3]):
+            with self.assertRaises(ReplayError):
+                Replay.from_bytes(broken)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""结果库：比赛编号分配与按路径共享"""
+import os
+import tempfile
+import unittest
+
+from engine import ShotRecord
+from utils import results_store
+from utils.results_store import ResultStore, get_store
+
+
+class ResultStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "results.db")
+
+    def open(self, path=None):
+        store = ResultStore(path or self.path)
+        self.addCleanup(store.close)
+        return store
+
+    def test_two_writers_get_distinct_ids(self):
+        # 两个连接（相当于两个进程）交替缓冲和写入同一个结果库
+        first, second = self.open(), self.open()
+        shots = [ShotRecord(1, "me", "梅西", "L", "R", True)]
+        first.add_game(1, 0, ["梅西"], "诺伊尔", shots)
+        second.add_game(0, 1, ["C罗"], "阿利松", [ShotRecord(1, "me", "C罗", "C", "C", False)])
+        first_ids, second_ids = first.flush(), second.flush()
+        self.assertEqual(len(set(first_ids + second_ids)), 2)
+
+        rows = first.conn.execute("SELECT game_id, shooter FROM shots ORDER BY game_id").fetchall()
+        self.assertEqual(rows, [(first_ids[0], "梅西"), (second_ids[0], "C罗")])
+
+    def test_get_store_is_shared_per_path(self):
+        other = os.path.join(self.dir.name, "other.db")
+        for path in (self.path, other):
+            self.addCleanup(results_store._stores.pop, os.path.abspath(path), None)
+        store = get_store(self.path)
+        self.addCleanup(store.close)
+        self.assertIs(get_store(self.path), store)
+        other_store = get_store(other)
+        self.addCleanup(other_store.close)
+        self.assertIsNot(other_store, store)
+        self.assertEqual(other_store.path, other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""名单解析与二进制缓存"""
+import os
+import tempfile
+import unittest
+
+import roster
+from roster import Roster, RosterError, load_roster
+
+
+class RosterCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_reload_from_cache_without_position_and_team(self):
+        # 没有 position / team 列时位置表和球队表都只有一个空字符串
+        path = self.write("plain.csv", "name,accuracy\nA,0.9\nB,\n")
+        first = load_roster(path)
+        self.assertTrue(os.path.exists(roster.cache_path(path)))
+        cached = load_roster(path)
+        self.assertEqual(cached.position_names, [""])
+        self.assertEqual(cached.team_names, [""])
+        self.assertEqual(cached.by_name("A"), first.by_name("A"))
+        self.assertEqual(cached.by_name("B").accuracy, 0.8)
+        self.assertEqual(cached.player_names(), ["A", "B"])
+
+    def test_round_trip_keeps_every_column(self):
+        path = self.write("league.csv", "id,name,position,team,reach\n"
+                                        "1,A,FW,X,\n2,B,GK,Y,0.9\n3,C,MF,,\n")
+        first = load_roster(path)
+        cached = load_roster(path)
+        self.assertEqual([cached.entry(row) for row in range(len(cached))],
+                         [first.entry(row) for row in range(len(first))])
+        self.assertEqual(cached.goalkeeper_names(), ["B"])
+        self.assertEqual(cached.in_team(""), ["C"])
+
+    def test_changed_source_is_parsed_again(self):
+        path = self.write("changing.csv", "name\nA\n")
+        load_roster(path)
+        self.write("changing.csv", "name\nA\nBB\n")
+        self.assertEqual(load_roster(path).names, ["A", "BB"])
+
+    def test_codes_outside_tables_are_rejected(self):
+        data = bytearray(Roster.from_records([{"name": "A"}]).to_bytes())
+        # 最后一个能力值列之前依次是球队编码和位置编码（各 2 字节）
+        offset = len(data) - 5 * 8 * 1 - 2
+        data[offset:offset + 2] = (7).to_bytes(2, "little")
+        with self.assertRaises(RosterError):
+            Roster.from_bytes(bytes(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,275 @@
+"""
+锦标赛批量模式：把大量模拟点球大战分发到多进程 ProcessPoolExecutor 中执行
+展示：模块与包、组合数据类型、异常处理
+
+每个任务块使用由 (种子, 对阵编号, 块编号) 派生的独立随机数生成器，
+任务块的划分与进程数无关，因此无论使用多少进程，结果都逐位一致。
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from engine import DIRECTIONS, SIDES, ShootoutEngine, ShotRecord, random_strategy
+from players import ALL_GOALKEEPERS, ALL_PLAYERS, Goalkeeper, ShotLog
+from utils.results_store import ResultStore
+
+# 每个任务块包含的比赛场数；与进程数无关，保证随机流划分固定
+BLOCK_SIZE = 2000
+
+# 工作进程内共享的能力模型（按需创建，概率表在同一进程的任务块之间复用）
+_skill_model = None
+
+
+class Team(NamedTuple):
+    """参赛球队：队名、出场名单和守门员"""
+    name: str
+    lineup: Tuple[str, ...]
+    goalkeeper: str
+
+
+class MatchResult(NamedTuple):
+    """单场比赛结果 - 展示组合数据类型（命名元组）"""
+    fixture: int
+    game: int
+    home: str
+    away: str
+    home_score: int
+    away_score: int
+    # 逐次射门记录（只在 run_tournament(record=True) 时填写；射门方 me 为主队）
+    shots: Tuple[ShotRecord, ...] = ()
+
+
+def build_teams(players: Sequence[str] = ALL_PLAYERS,
+                goalkeepers: Sequence[str] = ALL_GOALKEEPERS,
+                lineup_size: int = 5) -> List[Team]:
+    """把球员按出场人数分组，与每名守门员组合成球队"""
+    if len(players) < lineup_size:
+        raise ValueError(f"球员人数不足 {lineup_size} 人")
+    lineups = [
+        tuple(players[start:start + lineup_size])
+        for start in range(0, len(players) - lineup_size + 1, lineup_size)
+    ]
+    return [
+        Team(f"{keeper}-{index + 1}", lineup, keeper)
+        for keeper in goalkeepers
+        for index, lineup in enumerate(lineups)
+    ]
+
+
+def roster_teams(roster, lineup_size: int = 5) -> List[Team]:
+    """
+    按外部名单（roster.Roster）中的球队组队：每队取前 lineup_size 名球员和第一名守门员，
+    人数不足的球队不参赛
+    """
+    teams = []
+    for name in roster.teams:
+        members = roster.in_team(name)
+        keepers = [member for member in members if roster.by_name(member).is_goalkeeper]
+        lineup = tuple(member for member in members if member not in keepers)[:lineup_size]
+        if keepers and len(lineup) == lineup_size:
+            teams.append(Team(name or "无球队", lineup, keepers[0]))
+    if len(teams) < 2:
+        raise ValueError(f"名单中至少需要两支有 {lineup_size} 名球员和守门员的球队")
+    return teams
+
+
+def round_robin(teams: Sequence[Team]) -> List[Tuple[Team, Team]]:
+    """单循环赛程：每两支球队之间一组对阵"""
+    return list(combinations(teams, 2))
+
+
+def block_rng(seed: int, fixture: int, block: int) -> random.Random:
+    """为任务块派生独立的随机数生成器（字符串种子跨进程稳定）"""
+    return random.Random(f"{seed}:{fixture}:{block}")
+
+
+Task = Tuple[int, int, int, int, Team, Team, bool, bool]
+
+
+def _init_worker(roster_path: Optional[str]):
+    """工作进程初始化：登记外部名单，使能力模型读到与主进程相同的能力值"""
+    if roster_path:
+        from roster import load_roster
+        load_roster(roster_path).register()
+
+
+def _outcome_model(skill: bool):
+    global _skill_model
+    if not skill:
+        return None
+    if _skill_model is None:
+        from skill_model import SkillModel
+        _skill_model = SkillModel()
+    return _skill_model
+
+
+def _play_block(task: Task) -> Tuple[List[Tuple[int, int]], Optional[ShotLog]]:
+    """
+    在工作进程中进行一个任务块的比赛，返回各场比分；
+    record 为 True 时同时返回整个任务块共用的紧凑射门日志（记录射门不消耗随机数，比分不变）；
+    skill 为 True 时按能力模型判定进球
+    """
+    seed, fixture, block, games, home, away, record, skill = task
+    rng = block_rng(seed, fixture, block)
+    log = ShotLog() if record else None
+    engine = ShootoutEngine(home.lineup, home.goalkeeper, opponent_name=away.name,
+                            opponent_players=away.lineup, rng=rng,
+                            opponent_goalkeeper=away.goalkeeper, shot_log=log,
+                            outcome_model=_outcome_model(skill))
+    shooter = random_strategy(rng)
+    home_keeper = Goalkeeper(home.goalkeeper, rng)
+    away_keeper = Goalkeeper(away.goalkeeper, rng)
+    home_guess = lambda round_num, name: home_keeper.guess_direction()
+    away_guess = lambda round_num, name: away_keeper.guess_direction()
+    play = engine.play
+    scores = [play(shooter, away_guess, shooter, home_guess, record=record) for _ in range(games)]
+    return scores, log
+
+
+def _tasks(fixtures: Sequence[Tuple[Team, Team]], games_per_fixture: int,
+           seed: int, record: bool = False, skill: bool = False) -> Iterator[Task]:
+    """把每组对阵拆分为固定大小的任务块"""
+    for fixture, (home, away) in enumerate(fixtures):
+        for block, start in enumerate(range(0, games_per_fixture, BLOCK_SIZE)):
+            games = min(BLOCK_SIZE, games_per_fixture - start)
+            yield seed, fixture, block, games, home, away, record, skill
+
+
+def run_tournament(fixtures: Sequence[Tuple[Team, Team]], games_per_fixture: int,
+                   seed: int = 0, workers: Optional[int] = None,
+                   record: bool = False, skill: bool = False,
+                   roster_path: Optional[str] = None) -> Iterator[MatchResult]:
+    """
+    并行进行所有对阵，按 (对阵, 场次) 顺序产出合并后的结果流
+
+    workers 为 1 时在当前进程中执行；结果与进程数无关。
+    record 为 True 时每场结果附带逐次射门记录（写入结果库时使用）。
+    skill 为 True 时按 skill_model.SkillModel 判定进球；roster_path 为外部名单，
+    工作进程启动时登记其中的能力值（当前进程需由调用者自行登记）。
+    """
+    if games_per_fixture <= 0:
+        raise ValueError("每组对阵的场数必须为正数")
+    workers = workers or os.cpu_count() or 1
+    tasks = list(_tasks(fixtures, games_per_fixture, seed, record, skill))
+
+    if workers == 1:
+        blocks = map(_play_block, tasks)
+        yield from _merge(tasks, blocks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(roster_path,)) as executor:
+        # map 保持提交顺序，各进程的结果在这里合并为一个有序的流
+        chunksize = max(1, len(tasks) // (workers * 4))
+        yield from _merge(tasks, executor.map(_play_block, tasks, chunksize=chunksize))
+
+
+def _block_shots(log: Optional[ShotLog], games: int, home: Team, away: Team) -> List[Tuple[ShotRecord, ...]]:
+    """
+    把任务块的射门日志按场拆开并解码；射门球员由轮次和出场名单推出
+    （工作进程中的 Registry 编号与主进程不同，不能用编号查名字）
+    """
+    if log is None:
+        return [()] * games
+    per_game: List[List[ShotRecord]] = [[] for _ in range(games)]
+    for game, round_num, side, _, _, direction, guess, goal in zip(
+            log.game, log.round, log.side, log.shooter, log.keeper, log.direction, log.guess, log.goal):
+        lineup = home.lineup if side == 0 else away.lineup
+        # 引擎每场比赛开始时编号加一，任务块的第一场为 1
+        per_game[game - 1].append(ShotRecord(round_num, SIDES[side], lineup[(round_num - 1) % len(lineup)],
+                                             DIRECTIONS[direction], DIRECTIONS[guess], bool(goal)))
+    return [tuple(shots) for shots in per_game]
+
+
+def _merge(tasks, blocks) -> Iterator[MatchResult]:
+    """把任务块的比分（和射门记录）展开为逐场结果"""
+    for (seed, fixture, block, games, home, away, record, skill), (scores, log) in zip(tasks, blocks):
+        first = block * BLOCK_SIZE
+        shots = _block_shots(log, games, home, away)
+        for offset, (home_score, away_score) in enumerate(scores):
+            yield MatchResult(fixture, first + offset, home.name, away.name, home_score, away_score,
+                              shots[offset])
+
+
+def persist(results: Iterator[MatchResult], teams: Sequence[Team], store: ResultStore,
+            seed: Optional[int] = None) -> Iterator[MatchResult]:
+    """把结果流写入结果库（批量缓冲），同时原样向下游传递"""
+    by_name = {team.name: team for team in teams}
+    for result in results:
+        home, away = by_name[result.home], by_name[result.away]
+        store.add_game(result.home_score, result.away_score, home.lineup, home.goalkeeper,
+                       result.shots, opponent_players=away.lineup, opponent_goalkeeper=away.goalkeeper,
+                       seed=seed, source="tournament", team=home.name, opponent_team=away.name)
+        yield result
+
+
+def standings(results: Iterator[MatchResult]) -> Dict[str, Dict[str, int]]:
+    """汇总积分榜：胜 3 分、平 1 分 - 展示字典操作"""
+    table: Dict[str, Dict[str, int]] = {}
+    for result in results:
+        for team, scored, conceded in ((result.home, result.home_score, result.away_score),
+                                       (result.away, result.away_score, result.home_score)):
+            row = table.setdefault(team, {"played": 0, "win": 0, "draw": 0, "loss": 0,
+                                          "goals": 0, "points": 0})
+            row["played"] += 1
+            row["goals"] += scored
+            if scored > conceded:
+                row["win"] += 1
+                row["points"] += 3
+            elif scored == conceded:
+                row["draw"] += 1
+                row["points"] += 1
+            else:
+                row["loss"] += 1
+    return table
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """锦标赛命令行入口"""
+    parser = argparse.ArgumentParser(description="点球大战批量锦标赛")
+    parser.add_argument("--games", type=int, default=10000, help="每组对阵的比赛场数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认使用全部CPU核心")
+    parser.add_argument("--save", metavar="PATH", default=None, help="把每场结果写入该结果库")
+    parser.add_argument("--roster", metavar="PATH", default=None, help="按 CSV 或 JSON 名单中的球队组队")
+    parser.add_argument("--skill", action="store_true", help="按球员能力值判定进球（使用名单中的能力值）")
+    args = parser.parse_args(argv)
+
+    if args.roster:
+        from roster import RosterError, load_roster
+        try:
+            roster = load_roster(args.roster)
+            teams = roster_teams(roster)
+        except (OSError, RosterError) as e:
+            print(f"读取名单失败: {e}")
+            return
+        roster.register()
+    else:
+        teams = build_teams()
+    fixtures = round_robin(teams)
+    print(f"=== 点球大战锦标赛: {len(fixtures)} 组对阵, 每组 {args.games} 场 ===")
+
+    start = time.perf_counter()
+    results = run_tournament(fixtures, args.games, args.seed, args.workers, record=bool(args.save),
+                             skill=args.skill, roster_path=args.roster)
+    if args.save:
+        with ResultStore(args.save) as store:
+            table = standings(persist(results, teams, store, args.seed))
+    else:
+        table = standings(results)
+    elapsed = time.perf_counter() - start
+
+    ranking = sorted(table.items(), key=lambda item: (-item[1]["points"], -item[1]["goals"]))
+    for rank, (team, row) in enumerate(ranking, 1):
+        print(f"{rank:>2}. {team:<12} 积分 {row['points']:>8}  "
+              f"胜 {row['win']:>7} 平 {row['draw']:>7} 负 {row['loss']:>7}  进球 {row['goals']:>8}")
+
+    total = len(fixtures) * args.games
+    print(f"\n共 {total} 场, 用时 {elapsed:.2f} 秒 ({total / elapsed:,.0f} 场/秒)")
+
+
+if __name__ == "__main__":
+    main()
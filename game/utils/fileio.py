@@ -1,3 +1,6 @@
+from .results_store import get_store
+
+
 def save_result(player_score, keeper_saves):
-    with open("score.txt", "a", encoding="utf-8") as f:
-        f.write(f"玩家得分: {player_score}, 守门员扑救成功: {keeper_saves}\n")
+    # 写入结构化结果库（批量缓冲，进程退出时落盘），不再逐次追加 score.txt
+    get_store().add_game(player_score, None, [], None, source="fileio", keeper_saves=keeper_saves)
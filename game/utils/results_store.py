@@ -0,0 +1,190 @@
+"""
+结构化比赛结果存储：SQLite（WAL 模式）+ 批量缓冲写入 + 单一长连接
+展示：文件读写、异常处理、组合数据类型、面向对象编程
+
+取代向 score.txt 逐场追加自由文本的做法。每场比赛记录比分、双方出场名单和守门员，
+每次射门记录为一条事件；旧的 score.txt 可通过 import_legacy 一次性导入。
+"""
+import atexit
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_PATH = "results.db"
+LEGACY_PATH = "score.txt"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    my_score INTEGER NOT NULL,
+    opponent_score INTEGER,
+    keeper_saves INTEGER,
+    my_goalkeeper TEXT,
+    opponent_goalkeeper TEXT,
+    my_players TEXT NOT NULL,
+    opponent_players TEXT NOT NULL,
+    seed INTEGER,
+    source TEXT NOT NULL,
+    home_team TEXT,
+    away_team TEXT
+);
+CREATE TABLE IF NOT EXISTS shots (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    round INTEGER NOT NULL,
+    side TEXT NOT NULL,
+    shooter TEXT NOT NULL,
+    keeper TEXT,
+    direction TEXT NOT NULL,
+    keeper_guess TEXT NOT NULL,
+    is_goal INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# 旧版 score.txt 的两种格式
+LEGACY_BLOCK = re.compile(
+    r"=== 点球大战结果 ===\s*\n"
+    r"比分: 我方 (\d+) - (\d+) 对方\s*\n"
+    r"球员: ([^\n]*)\n"
+    r"守门员: ([^\n]*)"
+)
+LEGACY_LINE = re.compile(r"玩家得分: (\d+), 守门员扑救成功: (\d+)")
+
+
+class ResultStore:
+    """比赛结果库 - 展示面向对象编程和文件读写"""
+
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = 5000):
+        self.path = path
+        self.batch_size = batch_size
+
+        # 整个生命周期只打开一次连接
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # 旧版结果库没有队名列：补上（旧记录的队名为空，统计时以守门员区分）
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(games)")}
+        for column in ("home_team", "away_team"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE games ADD COLUMN {column} TEXT")
+
+        # 待写入的缓冲区：每场比赛一行及其射门行（不含比赛编号）- 展示组合数据类型（列表）
+        self._games: List[Tuple[tuple, List[tuple]]] = []
+
+    def add_game(self, my_score: int, opponent_score: Optional[int],
+                 players: Sequence[str], goalkeeper: Optional[str],
+                 shots: Iterable[tuple] = (),
+                 opponent_players: Sequence[str] = (),
+                 opponent_goalkeeper: Optional[str] = None,
+                 seed: Optional[int] = None, source: str = "game",
+                 keeper_saves: Optional[int] = None,
+                 played_at: Optional[float] = None,
+                 team: Optional[str] = None, opponent_team: Optional[str] = None):
+        """
+        缓冲一场比赛；比赛编号在 flush 写入时由 SQLite 分配，
+        多个进程同时写入同一个结果库也不会重复
+
+        shots 为 (轮次, 射门方, 射门球员, 射门方向, 扑救方向, 是否进球) 元组，
+        与 engine.ShotRecord 字段顺序一致。
+        team / opponent_team 为双方队名（如锦标赛中的球队），省略时以各自的守门员作为队名。
+        """
+        game = (
+            played_at if played_at is not None else time.time(),
+            my_score, opponent_score, keeper_saves, goalkeeper, opponent_goalkeeper,
+            json.dumps(list(players), ensure_ascii=False),
+            json.dumps(list(opponent_players), ensure_ascii=False),
+            seed, source,
+            team if team is not None else goalkeeper,
+            opponent_team if opponent_team is not None else opponent_goalkeeper,
+        )
+        # 我方射门面对的是对方守门员，反之亦然
+        shot_rows = [(round_num, side, shooter, opponent_goalkeeper if side == "me" else goalkeeper,
+                      direction, guess, int(is_goal))
+                     for round_num, side, shooter, direction, guess, is_goal in shots]
+        self._games.append((game, shot_rows))
+
+        if len(self._games) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> List[int]:
+        """在一个事务中批量写入缓冲区，返回 SQLite 为缓冲的比赛分配的编号（按加入顺序）"""
+        if not self._games:
+            return []
+        game_ids = []
+        shots = []
+        with self.conn:
+            for game, shot_rows in self._games:
+                # 编号留空由 SQLite 分配（INTEGER PRIMARY KEY），射门行随后带上真实编号
+                game_id = self.conn.execute(
+                    "INSERT INTO games VALUES (NULL,?,?,?,?,?,?,?,?,?,?,?,?)", game).lastrowid
+                game_ids.append(game_id)
+                shots.extend((game_id,) + row for row in shot_rows)
+            self.conn.executemany("INSERT INTO shots VALUES (?,?,?,?,?,?,?,?)", shots)
+        self._games = []
+        return game_ids
+
+    def import_legacy(self, path: str = LEGACY_PATH) -> int:
+        """一次性导入旧版 score.txt，返回导入的比赛场数；已导入过则返回 0"""
+        key = f"legacy_import:{os.path.abspath(path)}"
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return 0
+
+        played_at = os.path.getmtime(path)
+        imported = 0
+        for match in LEGACY_BLOCK.finditer(text):
+            my_score, opponent_score, players, goalkeeper = match.groups()
+            self.add_game(int(my_score), int(opponent_score),
+                          [p.strip() for p in players.split(",") if p.strip()],
+                          goalkeeper.strip(), source="legacy", played_at=played_at)
+            imported += 1
+        for match in LEGACY_LINE.finditer(text):
+            player_score, keeper_saves = match.groups()
+            self.add_game(int(player_score), None, [], None, source="legacy",
+                          keeper_saves=int(keeper_saves), played_at=played_at)
+            imported += 1
+
+        self.flush()
+        with self.conn:
+            self.conn.execute("INSERT INTO meta VALUES (?, ?)", (key, str(imported)))
+        return imported
+
+    def close(self):
+        """写入剩余缓冲并关闭连接"""
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# 进程内共享的结果库，按文件的绝对路径区分
+_stores: Dict[str, ResultStore] = {}
+
+
+def get_store(path: str = DEFAULT_PATH) -> ResultStore:
+    """返回 path 对应的进程内共享结果库（每个文件首次调用时打开并导入同目录的旧版 score.txt）"""
+    key = os.path.abspath(path)
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = ResultStore(path)
+        atexit.register(store.close)
+        store.import_legacy(os.path.join(os.path.dirname(key), LEGACY_PATH))
+    return store
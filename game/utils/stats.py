@@ -0,0 +1,183 @@
+"""
+历史战绩统计查询：在结果库上维护增量聚合表和索引
+展示：文件读写、组合数据类型（字典）、面向对象编程
+
+聚合表由 SQLite 触发器在每次写入比赛/射门时增量更新，
+查询只需按主键或索引查找，不再随历史记录增长而重新扫描全部数据。
+"""
+import sys
+from typing import Dict, Optional
+
+from .results_store import DEFAULT_PATH, ResultStore
+
+# 我方比赛中对方没有具名守门员时使用的队名
+UNNAMED_OPPONENT = "对方"
+
+# 交锋记录以队名区分；旧记录没有队名时退回到守门员名
+# （锦标赛中多支球队共用同一名守门员，只按守门员区分会把不同球队合并）
+TEAM = "COALESCE({row}home_team, {row}my_goalkeeper)"
+OPPONENT = "COALESCE({row}away_team, {row}opponent_goalkeeper, '%s')" % UNNAMED_OPPONENT
+# 触发器中引用新插入的行，回填时引用 games 表的列
+HOME, AWAY = TEAM.format(row="NEW."), OPPONENT.format(row="NEW.")
+HOME_COLUMN, AWAY_COLUMN = TEAM.format(row=""), OPPONENT.format(row="")
+# 聚合表的版本：交锋记录的键改变时递增，已安装的旧版本会重建
+AGGREGATES_VERSION = "2"
+
+AGGREGATE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS shot_stats (
+    shooter TEXT NOT NULL,
+    keeper TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    goals INTEGER NOT NULL,
+    PRIMARY KEY (shooter, keeper, direction)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS shot_stats_keeper ON shot_stats (keeper, direction);
+CREATE INDEX IF NOT EXISTS shot_stats_direction ON shot_stats (direction);
+
+CREATE TABLE IF NOT EXISTS head_to_head (
+    team TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    played INTEGER NOT NULL,
+    win INTEGER NOT NULL,
+    draw INTEGER NOT NULL,
+    loss INTEGER NOT NULL,
+    PRIMARY KEY (team, opponent)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS shots_aggregate AFTER INSERT ON shots BEGIN
+    INSERT INTO shot_stats VALUES
+        (NEW.shooter, COALESCE(NEW.keeper, ''), NEW.direction, 1, NEW.is_goal)
+    ON CONFLICT (shooter, keeper, direction) DO UPDATE SET
+        attempts = attempts + 1, goals = goals + excluded.goals;
+END;
+
+CREATE TRIGGER IF NOT EXISTS games_aggregate AFTER INSERT ON games
+WHEN NEW.opponent_score IS NOT NULL AND {HOME} IS NOT NULL BEGIN
+    INSERT INTO head_to_head VALUES (
+        {HOME}, {AWAY}, 1,
+        NEW.my_score > NEW.opponent_score, NEW.my_score = NEW.opponent_score,
+        NEW.my_score < NEW.opponent_score)
+    ON CONFLICT (team, opponent) DO UPDATE SET
+        played = played + 1, win = win + excluded.win,
+        draw = draw + excluded.draw, loss = loss + excluded.loss;
+    INSERT INTO head_to_head VALUES (
+        {AWAY}, {HOME}, 1,
+        NEW.my_score < NEW.opponent_score, NEW.my_score = NEW.opponent_score,
+        NEW.my_score > NEW.opponent_score)
+    ON CONFLICT (team, opponent) DO UPDATE SET
+        played = played + 1, win = win + excluded.win,
+        draw = draw + excluded.draw, loss = loss + excluded.loss;
+END;
+"""
+
+# 首次安装聚合表时，用已有记录回填一次
+BACKFILL_SHOTS = """
+INSERT INTO shot_stats
+    SELECT shooter, COALESCE(keeper, ''), direction, COUNT(*), SUM(is_goal)
+    FROM shots GROUP BY 1, 2, 3;
+"""
+BACKFILL_HEAD_TO_HEAD = f"""
+INSERT INTO head_to_head
+    SELECT team, opponent, COUNT(*), SUM(diff > 0), SUM(diff = 0), SUM(diff < 0) FROM (
+        SELECT {HOME_COLUMN} AS team, {AWAY_COLUMN} AS opponent, my_score - opponent_score AS diff
+        FROM games WHERE opponent_score IS NOT NULL AND {HOME_COLUMN} IS NOT NULL
+        UNION ALL
+        SELECT {AWAY_COLUMN}, {HOME_COLUMN}, opponent_score - my_score
+        FROM games WHERE opponent_score IS NOT NULL AND {HOME_COLUMN} IS NOT NULL
+    ) GROUP BY team, opponent;
+"""
+
+
+def install_aggregates(store: ResultStore):
+    """在结果库中创建聚合表和触发器（幂等），首次安装时回填历史数据"""
+    conn = store.conn
+    store.flush()
+    installed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'shots_aggregate'"
+    ).fetchone()
+    version = conn.execute("SELECT value FROM meta WHERE key = 'aggregates_version'").fetchone()
+    if installed and version and version[0] == AGGREGATES_VERSION:
+        return
+    # executescript 会先提交当前事务，因此在同一个显式事务中完成建表与回填；
+    # 旧版本只重建交锋记录（射门统计的键没有变化）
+    if installed:
+        script = "DROP TRIGGER games_aggregate; DELETE FROM head_to_head;" + AGGREGATE_SCHEMA + BACKFILL_HEAD_TO_HEAD
+    else:
+        script = AGGREGATE_SCHEMA + BACKFILL_SHOTS + BACKFILL_HEAD_TO_HEAD
+    conn.executescript(
+        "BEGIN;" + script +
+        f"INSERT OR REPLACE INTO meta VALUES ('aggregates_version', '{AGGREGATES_VERSION}');COMMIT;")
+
+
+class ResultStats:
+    """战绩查询接口 - 展示面向对象编程和组合数据类型（字典）"""
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+        install_aggregates(store)
+
+    def _query(self, sql: str, params: tuple) -> tuple:
+        # 先写入缓冲中的比赛，保证查询结果包含最新数据
+        self.store.flush()
+        return self.store.conn.execute(sql, params).fetchone()
+
+    @staticmethod
+    def _filters(**columns: Optional[str]) -> tuple:
+        """把非空条件拼接为 WHERE 子句 - 展示字典推导"""
+        used = {name: value for name, value in columns.items() if value is not None}
+        where = " AND ".join(f"{name} = ?" for name in used) or "1"
+        return where, tuple(used.values())
+
+    def conversion_rate(self, player: str, keeper: Optional[str] = None,
+                        direction: Optional[str] = None) -> Optional[float]:
+        """球员的射门转化率，可按守门员和射门方向筛选；没有记录时返回None"""
+        where, params = self._filters(shooter=player, keeper=keeper, direction=direction)
+        attempts, goals = self._query(
+            f"SELECT SUM(attempts), SUM(goals) FROM shot_stats WHERE {where}", params)
+        return goals / attempts if attempts else None
+
+    def save_rate(self, keeper: str, direction: Optional[str] = None) -> Optional[float]:
+        """守门员的扑救成功率，可按对方射门方向筛选"""
+        where, params = self._filters(keeper=keeper, direction=direction)
+        attempts, goals = self._query(
+            f"SELECT SUM(attempts), SUM(goals) FROM shot_stats WHERE {where}", params)
+        return 1 - goals / attempts if attempts else None
+
+    def direction_success(self) -> Dict[str, float]:
+        """各射门方向的进球率"""
+        self.store.flush()
+        rows = self.store.conn.execute(
+            "SELECT direction, SUM(goals) * 1.0 / SUM(attempts) FROM shot_stats GROUP BY direction")
+        return {direction: rate for direction, rate in rows}
+
+    def head_to_head(self, team: str, opponent: str) -> Dict[str, int]:
+        """两队之间的交锋记录（以队名区分，未记录队名的比赛以守门员区分）"""
+        row = self._query(
+            "SELECT played, win, draw, loss FROM head_to_head WHERE team = ? AND opponent = ?",
+            (team, opponent))
+        return dict(zip(("played", "win", "draw", "loss"), row or (0, 0, 0, 0)))
+
+    def player_table(self) -> Dict[str, float]:
+        """所有球员的转化率，按转化率从高到低排列"""
+        self.store.flush()
+        rows = self.store.conn.execute(
+            "SELECT shooter, SUM(goals) * 1.0 / SUM(attempts) AS rate "
+            "FROM shot_stats GROUP BY shooter ORDER BY rate DESC")
+        return dict(rows.fetchall())
+
+
+def main(path: str = DEFAULT_PATH):
+    """打印战绩概览：python -m utils.stats [结果库路径]"""
+    with ResultStore(path) as store:
+        stats = ResultStats(store)
+        print("=== 球员转化率 ===")
+        for player, rate in stats.player_table().items():
+            print(f"{player:<10} {rate:.1%}")
+        print("\n=== 各方向进球率 ===")
+        for direction, rate in stats.direction_success().items():
+            print(f"{direction}: {rate:.1%}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
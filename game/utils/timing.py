@@ -0,0 +1,157 @@
+"""
+分阶段计时：记录一场比赛中每一轮花在等待输入、动画、画布刷新、等待和保存结果上的时间
+展示：面向对象编程、组合数据类型（字典、列表）、文件读写
+
+计时是可选的：默认使用 NULL_TIMER，各处的 `with timer.phase(...)` 几乎没有开销。
+阶段可以嵌套（例如等待期间帧循环刷新画布），汇总时每个阶段只统计自身时间
+（扣除嵌套在其中的子阶段），因此各阶段之和等于被计时的总时长。
+
+导出格式：
+    .json    Chrome 跟踪事件格式，可在 chrome://tracing、Perfetto 或 speedscope 中查看火焰图，
+             汇总数据放在 otherData 中
+    .folded  折叠调用栈（"阶段;子阶段 微秒数"），可直接交给 flamegraph.pl
+"""
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, NamedTuple
+
+# 已知阶段：等待玩家输入、射门/扑救动画、画布刷新、提示与等待、规则判定、保存结果
+PHASES = ("input", "animation", "canvas", "sleep", "logic", "persist")
+
+PHASE_NAMES = {
+    "input": "等待输入",
+    "animation": "动画",
+    "canvas": "画布刷新",
+    "sleep": "提示与等待",
+    "logic": "规则判定",
+    "persist": "保存结果",
+}
+
+
+class PhaseEvent(NamedTuple):
+    """一次阶段计时（秒，start 相对计时器创建时刻）"""
+    phase: str
+    round_num: int
+    start: float
+    duration: float
+    # 扣除嵌套子阶段后的自身时间
+    self_time: float
+    # 外层阶段，形如 "sleep;canvas"，不含自身
+    stack: str
+
+
+class NullTimer:
+    """不计时的计时器：与 PhaseTimer 接口相同，用作默认值"""
+    enabled = False
+    _context = nullcontext()
+
+    def phase(self, name: str):
+        return self._context
+
+    def set_round(self, round_num: int):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class PhaseTimer:
+    """分阶段计时器 - 展示面向对象编程"""
+    enabled = True
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._origin = clock()
+        self.round_num = 0
+        self.events: List[PhaseEvent] = []
+        # 进行中的阶段：[名字, 开始时刻, 子阶段累计时长]
+        self._stack: List[list] = []
+
+    def set_round(self, round_num: int):
+        """之后的计时归入第 round_num 轮（0 表示比赛开始前/结束后）"""
+        self.round_num = round_num
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """计时一个阶段：with timer.phase("canvas"): ..."""
+        frame = [name, self._clock(), 0.0]
+        stack = ";".join(entry[0] for entry in self._stack)
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            duration = self._clock() - frame[1]
+            if self._stack:
+                self._stack[-1][2] += duration
+            self.events.append(PhaseEvent(name, self.round_num, frame[1] - self._origin,
+                                          duration, duration - frame[2], stack))
+
+    def totals(self) -> Dict[str, float]:
+        """各阶段的自身时间合计（秒）"""
+        totals: Dict[str, float] = {}
+        for event in self.events:
+            totals[event.phase] = totals.get(event.phase, 0.0) + event.self_time
+        return totals
+
+    def rounds(self) -> Dict[int, Dict[str, float]]:
+        """{轮次: {阶段: 自身时间}}"""
+        rounds: Dict[int, Dict[str, float]] = {}
+        for event in self.events:
+            phases = rounds.setdefault(event.round_num, {})
+            phases[event.phase] = phases.get(event.phase, 0.0) + event.self_time
+        return dict(sorted(rounds.items()))
+
+    def summary(self) -> Dict:
+        """可序列化的汇总：总计、每轮明细和计时的总时长"""
+        totals = self.totals()
+        return {
+            "total": sum(totals.values()),
+            "phases": totals,
+            "rounds": {str(round_num): phases for round_num, phases in self.rounds().items()},
+        }
+
+    def report(self) -> str:
+        """按阶段汇总的文字报告，每轮一行"""
+        totals = self.totals()
+        total = sum(totals.values()) or 1.0
+        phases = [phase for phase in PHASES if phase in totals] + \
+            sorted(phase for phase in totals if phase not in PHASES)
+        lines = ["=== 分阶段用时 ==="]
+        for phase in phases:
+            lines.append(f"{PHASE_NAMES.get(phase, phase):<8} {totals[phase]:8.3f} 秒 "
+                         f"{totals[phase] / total:6.1%}")
+        lines.append("轮次  " + "  ".join(f"{PHASE_NAMES.get(phase, phase):>6}" for phase in phases))
+        for round_num, round_phases in self.rounds().items():
+            lines.append(f"{round_num:>4}  " + "  ".join(
+                f"{round_phases.get(phase, 0.0):8.3f}" for phase in phases))
+        return "\n".join(lines)
+
+    def to_trace(self) -> Dict:
+        """Chrome 跟踪事件格式（完整事件 "X"，时间单位微秒）"""
+        events = [
+            {"name": event.phase, "cat": "game", "ph": "X", "pid": 1, "tid": 1,
+             "ts": round(event.start * 1e6, 1), "dur": round(event.duration * 1e6, 1),
+             "args": {"round": event.round_num}}
+            for event in sorted(self.events, key=lambda event: (event.start, -event.duration))
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": self.summary()}
+
+    def to_folded(self) -> str:
+        """折叠调用栈格式：每个调用栈一行，值为自身时间（微秒）"""
+        stacks: Dict[str, float] = {}
+        for event in self.events:
+            key = f"{event.stack};{event.phase}" if event.stack else event.phase
+            stacks[key] = stacks.get(key, 0.0) + event.self_time
+        return "".join(f"{key} {round(value * 1e6)}\n" for key, value in sorted(stacks.items()))
+
+    def save(self, path: str) -> str:
+        """按扩展名导出：.folded 为折叠调用栈，其他为 Chrome 跟踪 JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".folded"):
+                f.write(self.to_folded())
+            else:
+                json.dump(self.to_trace(), f, ensure_ascii=False)
+        return path
+